@@ -0,0 +1,138 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from agents.relatorio import template_relatorio
+from config.properties import (
+    RELATORIOS_LOTE_CONCORRENCIA,
+    RELATORIOS_LOTE_ORCAMENTO_TOKENS,
+    RELATORIOS_TOKENS_SAIDA_ESTIMADOS,
+)
+from service.azure_llm import estimar_tokens
+from service.cache_llm import completar_com_cache_em_fluxo, obter_do_cache
+from service.metricas import incrementar
+
+# Compartilhado por todas as sessões: limita as gerações simultâneas no
+# deployment, não importa quantos alunos pediram relatórios em lote
+_executor = ThreadPoolExecutor(
+    max_workers=RELATORIOS_LOTE_CONCORRENCIA, thread_name_prefix="relatorios-lote"
+)
+
+PENDENTE = "pendente"
+GERANDO = "gerando"
+PRONTO = "pronto"
+ERRO = "erro"
+SEM_ORCAMENTO = "sem_orcamento"
+CANCELADO = "cancelado"
+
+
+class LoteRelatorios:
+    """
+    Gera em segundo plano os relatórios de preparação de várias vagas para um
+    mesmo candidato.
+
+    Os relatórios entram na fila compartilhada (no máximo
+    RELATORIOS_LOTE_CONCORRENCIA gerando ao mesmo tempo) e cada um reserva,
+    antes de começar, os tokens estimados do prompt e da resposta. Quando a
+    reserva não cabe no orçamento, o relatório fica em SEM_ORCAMENTO e pode
+    ser gerado sob demanda. Relatórios já em cache não consomem orçamento.
+
+    O texto de cada relatório vai sendo acumulado em `estado(id)["texto"]`
+    enquanto o modelo gera, para a interface exibir o que já chegou.
+
+    Args:
+        orcamento_tokens: tokens (entrada + saída estimados) disponíveis para o lote
+    """
+
+    def __init__(self, orcamento_tokens: int = RELATORIOS_LOTE_ORCAMENTO_TOKENS):
+        self.orcamento_tokens = orcamento_tokens
+        self.tokens_reservados = 0
+        self._lock = threading.Lock()
+        self._cancelado = threading.Event()
+        self._estados: dict[str, dict] = {}
+        self._futuros = []
+
+    def enviar(self, id_relatorio: str, descricao_vaga: str, perfil_candidato: str):
+        with self._lock:
+            if id_relatorio in self._estados:
+                return
+            self._estados[id_relatorio] = {"status": PENDENTE, "texto": ""}
+        self._futuros.append(
+            _executor.submit(
+                self._gerar, id_relatorio, descricao_vaga, perfil_candidato
+            )
+        )
+
+    def estado(self, id_relatorio: str) -> Optional[dict]:
+        """Cópia de {"status", "texto"} do relatório, ou None se não foi enviado."""
+        with self._lock:
+            estado = self._estados.get(id_relatorio)
+            return dict(estado) if estado is not None else None
+
+    def cancelar(self):
+        """Descarta os relatórios na fila e interrompe os que estão gerando."""
+        self._cancelado.set()
+        for futuro in self._futuros:
+            futuro.cancel()
+        with self._lock:
+            for estado in self._estados.values():
+                if estado["status"] in (PENDENTE, GERANDO):
+                    estado["status"] = CANCELADO
+
+    def _atualizar(self, id_relatorio, **campos):
+        with self._lock:
+            self._estados[id_relatorio].update(campos)
+
+    def _reservar(self, tokens):
+        with self._lock:
+            if self.tokens_reservados + tokens > self.orcamento_tokens:
+                return False
+            self.tokens_reservados += tokens
+            return True
+
+    def _gerar(self, id_relatorio, descricao_vaga, perfil_candidato):
+        if self._cancelado.is_set():
+            return
+        template = template_relatorio()
+        entradas = {
+            "descricao_vaga": descricao_vaga,
+            "perfil_candidato": perfil_candidato,
+        }
+
+        texto = obter_do_cache(template, **entradas)
+        if texto is not None:
+            incrementar("relatorios_lote", status="cache")
+            self._atualizar(id_relatorio, status=PRONTO, texto=texto)
+            return
+
+        reserva = (
+            estimar_tokens(template.format(**entradas))
+            + RELATORIOS_TOKENS_SAIDA_ESTIMADOS
+        )
+        if not self._reservar(reserva):
+            incrementar("relatorios_lote", status=SEM_ORCAMENTO)
+            self._atualizar(id_relatorio, status=SEM_ORCAMENTO)
+            return
+
+        self._atualizar(id_relatorio, status=GERANDO)
+        pedacos = []
+        fluxo = completar_com_cache_em_fluxo(template, **entradas)
+        try:
+            for pedaco in fluxo:
+                if self._cancelado.is_set():
+                    return
+                pedacos.append(pedaco)
+                self._atualizar(id_relatorio, texto="".join(pedacos))
+            self._atualizar(id_relatorio, status=PRONTO)
+            incrementar("relatorios_lote", status=PRONTO)
+        except Exception as e:
+            print(f"[lote_relatorios] Erro ao gerar {id_relatorio}: {e}")
+            incrementar("relatorios_lote", status=ERRO)
+            self._atualizar(id_relatorio, status=ERRO)
+        finally:
+            # Fecha o fluxo interrompido (sem gravar no cache) e troca a
+            # reserva pelo tamanho real da resposta
+            fluxo.close()
+            saida = estimar_tokens("".join(pedacos))
+            with self._lock:
+                self.tokens_reservados += saida - RELATORIOS_TOKENS_SAIDA_ESTIMADOS
@@ -1,11 +1,8 @@
-from service.azure_llm import llm
+from typing import Iterator
 
+from service.cache_llm import completar_com_cache, completar_com_cache_em_fluxo
 
-def gerar_relatorio_preparacao_vaga(
-    vaga: str, perfil_candidato: str, instrucoes_sistema: str = None
-) -> str:
-    if not instrucoes_sistema:
-        instrucoes_sistema = """
+INSTRUCOES_RELATORIO = """
         Você é um assistente especializado em preparação para entrevistas de emprego.
         
         Analise a descrição da vaga e o perfil do candidato, e forneça um relatório de preparação em formato markdown que inclua:
@@ -16,24 +13,53 @@ def gerar_relatorio_preparacao_vaga(
         
         Formate sua resposta de modo organizado e direto, sem introduções longas.
         """
+
+
+def template_relatorio(instrucoes_sistema: str = None) -> str:
+    """Prompt do relatório com os campos {descricao_vaga} e {perfil_candidato}."""
+    instrucoes = instrucoes_sistema or INSTRUCOES_RELATORIO
+    # Chaves nas instruções não são campos do template
+    instrucoes = instrucoes.replace("{", "{{").replace("}", "}}")
+    return (
+        instrucoes
+        + "\nDescrição da vaga:\n{descricao_vaga}\nPerfil do candidato:\n{perfil_candidato}"
+    )
+
+
+def gerar_relatorio_preparacao_vaga(
+    descricao_vaga: str, perfil_candidato: str, instrucoes_sistema: str = None
+) -> str:
     try:
-        # Construir prompt concatenando instruções do sistema e conteúdo do usuário
-        prompt = (
-            instrucoes_sistema
-            + f"\nDescrição da vaga:\n{vaga}\nPerfil do candidato:\n{perfil_candidato}"
+        # Relatórios iguais (mesmo modelo, prompt, vaga e perfil) saem do cache
+        # em disco, sem custo de tokens
+        return completar_com_cache(
+            template_relatorio(instrucoes_sistema),
+            descricao_vaga=descricao_vaga,
+            perfil_candidato=perfil_candidato,
         )
-        # Chamando o modelo LLM para gerar o relatório via complete
-        resposta = llm.complete(prompt)
-        # Extrair conteúdo da resposta
-        if hasattr(resposta, "text"):
-            return resposta.text
-        elif hasattr(resposta, "content"):
-            return resposta.content
-        else:
-            return str(resposta)
     except Exception as e:
         import traceback
 
         error_msg = f"Erro ao gerar relatório: {str(e)}\n{traceback.format_exc()}"
         print(error_msg)
         return f"Erro ao gerar o relatório: {str(e)}. Por favor, tente novamente mais tarde."
+
+
+def gerar_relatorio_preparacao_vaga_em_fluxo(
+    descricao_vaga: str, perfil_candidato: str, instrucoes_sistema: str = None
+) -> Iterator[str]:
+    """
+    Mesmo relatório de `gerar_relatorio_preparacao_vaga`, entregue em pedaços
+    à medida que o modelo gera, para ser exibido com `st.write_stream`.
+    """
+    try:
+        yield from completar_com_cache_em_fluxo(
+            template_relatorio(instrucoes_sistema),
+            descricao_vaga=descricao_vaga,
+            perfil_candidato=perfil_candidato,
+        )
+    except Exception as e:
+        import traceback
+
+        print(f"Erro ao gerar relatório: {str(e)}\n{traceback.format_exc()}")
+        yield f"\n\nErro ao gerar o relatório: {str(e)}. Por favor, tente novamente mais tarde."
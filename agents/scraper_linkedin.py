@@ -1,9 +1,107 @@
-from crewai_tools import ScrapeWebsiteTool
+import hashlib
+import os
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from config.properties import (
+    CACHE_DIR,
+    LINKEDIN_CACHE_TAMANHO_MAXIMO_MB,
+    LINKEDIN_CACHE_TTL_HORAS,
+    LINKEDIN_CONEXOES_POR_HOST,
+)
+from service.cache import CacheDisco
+from service.metricas import incrementar
+
+# Mesmos headers e prazo do ScrapeWebsiteTool do crewai_tools, que era usado
+# antes, para que o texto extraído continue igual.
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.google.com/",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+TIMEOUT_SEGUNDOS = 15
+
+_sessao = requests.Session()
+_sessao.headers.update(HEADERS)
+_adaptador = HTTPAdapter(
+    pool_connections=LINKEDIN_CONEXOES_POR_HOST,
+    pool_maxsize=LINKEDIN_CONEXOES_POR_HOST,
+)
+_sessao.mount("https://", _adaptador)
+_sessao.mount("http://", _adaptador)
+
+# Os perfis expiram pelo TTL; o hash do último conteúdo visto fica guardado
+# sem prazo (só sai pelo LRU) para saber se o perfil mudou entre as buscas.
+cache_perfis = CacheDisco(
+    os.path.join(CACHE_DIR, "linkedin.sqlite3"),
+    tamanho_maximo_bytes=int(LINKEDIN_CACHE_TAMANHO_MAXIMO_MB * 1024**2),
+)
+
+
+def normalizar_url_linkedin(url: str) -> str:
+    """
+    Normaliza a URL do perfil para uso como chave: https, host em minúsculas
+    sem "www." ou subdomínio de idioma, sem query, fragmento ou barra final.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    partes = urlsplit(url)
+    host = partes.netloc.lower()
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+    caminho = re.sub(r"/+", "/", partes.path).rstrip("/")
+    if host == "linkedin.com":
+        caminho = caminho.lower()
+    return urlunsplit(("https", host, caminho, "", ""))
+
+
+def obter_perfil_linkedin(url: str) -> dict:
+    """
+    Retorna o texto do perfil, usando o cache em disco quando possível.
+
+    Returns:
+        Dicionário com "texto", "hash" (sha256 do texto) e "alterado", que é
+        False quando o conteúdo é igual ao da última busca do mesmo perfil,
+        para que quem consome possa reaproveitar o que já processou.
+    """
+    chave = normalizar_url_linkedin(url)
+    perfil = cache_perfis.obter(f"perfil:{chave}")
+    if perfil is not None:
+        incrementar("linkedin_cache", resultado="acerto")
+        return {**perfil, "alterado": False}
+    incrementar("linkedin_cache", resultado="falha")
+
+    resposta = _sessao.get(url, timeout=TIMEOUT_SEGUNDOS)
+    resposta.encoding = resposta.apparent_encoding
+    texto = _extrair_texto(resposta.text)
+    hash_texto = hashlib.sha256(texto.encode("utf-8")).hexdigest()
+    hash_anterior = cache_perfis.obter(f"hash:{chave}")
+
+    # Páginas de erro ou de bloqueio não vão para o cache
+    if resposta.ok:
+        cache_perfis.gravar(
+            f"perfil:{chave}",
+            {"texto": texto, "hash": hash_texto},
+            ttl_segundos=LINKEDIN_CACHE_TTL_HORAS * 3600,
+        )
+        cache_perfis.gravar(f"hash:{chave}", hash_texto)
+    return {"texto": texto, "hash": hash_texto, "alterado": hash_texto != hash_anterior}
 
 
 def get_linkedin_profile(url: str) -> str:
-    scraper = ScrapeWebsiteTool(website_url=url)
-    text = scraper.run(
-        url=url,
-    )
-    return text
+    return obter_perfil_linkedin(url)["texto"]
+
+
+def _extrair_texto(html):
+    texto = BeautifulSoup(html, "html.parser").get_text(" ")
+    texto = re.sub("[ \t]+", " ", texto)
+    texto = re.sub("\\s+\n\\s+", "\n", texto)
+    return texto
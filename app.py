@@ -1,18 +1,35 @@
 import streamlit as st
+import hashlib
 import re
 import json
 import time
 import io
 import asyncio
-from datetime import datetime
-from service.azure_vision import extrair_texto_pdf
-from agents.scraper_linkedin import get_linkedin_profile
-from agents.relatorio import gerar_relatorio_preparacao_vaga
+from service.indice_vetorial import indexar_perfil
+from service.ingestao_perfil import coletar_perfil, hash_perfil
+from agents.relatorio import gerar_relatorio_preparacao_vaga_em_fluxo
+from config.taxonomia import AREAS_INTERESSE, SETORES_INTERESSE
 from fix_relatorio import gerar_e_exibir_relatorio
 
 MAX_FILE_SIZE_MB = 2
 
 
+def vagas_proximas_do_perfil(dados):
+    """Vagas parecidas com o perfil, refeitas só quando ele muda, não a cada rerun."""
+    from tools.procurar_vagas import vagas_compativeis
+
+    perfil_hash = dados.get("perfil_hash") or hash_perfil(dados)
+    if st.session_state.get("vagas_proximas_hash") != perfil_hash:
+        try:
+            vagas = vagas_compativeis(dados)
+        except Exception as e:
+            st.warning(f"Não foi possível buscar as vagas já coletadas: {e}")
+            return []
+        st.session_state.vagas_proximas = vagas
+        st.session_state.vagas_proximas_hash = perfil_hash
+    return st.session_state.vagas_proximas
+
+
 def pagina_busca_vagas():
     try:
         asyncio.get_event_loop()
@@ -33,12 +50,26 @@ def pagina_busca_vagas():
     with st.expander("Dados do candidato"):
         st.json(dados)
 
+    # Vagas já coletadas por buscas anteriores, encontradas pelo índice
+    # semântico sem esperar o agente
+    vagas_proximas = vagas_proximas_do_perfil(dados)
+    if vagas_proximas:
+        st.subheader("⚡ Vagas já coletadas parecidas com o seu perfil")
+        for vaga in vagas_proximas:
+            with st.expander(f"{vaga.title} — {vaga.company}"):
+                st.markdown(vaga.markdown())
+
     if st.button("Buscar vagas compatíveis"):
         with st.spinner("Buscando vagas... Isso pode demorar alguns minutos."):
             from llama_index.core.agent.workflow import ReActAgent
-            from tools.procurar_vagas import tool_procurar_vagas
+            from tools.procurar_vagas import (
+                INSTRUCOES_RANKING,
+                criar_tool_procurar_vagas,
+                interpretar_ranking,
+            )
             from service.azure_llm import llm
 
+            tool_procurar_vagas, vagas_encontradas = criar_tool_procurar_vagas()
             agent = ReActAgent(
                 llm=llm,
                 system_prompt="Você é um assistente de busca de vagas de emprego. Encontre vagas de emprego adequadas.",
@@ -63,7 +94,8 @@ def pagina_busca_vagas():
             Perfil LinkedIn:
             {dados['linkedin_dados']}...
             
-            Encontre vagas adequadas para este perfil e formate-as de modo organizado.
+            Encontre vagas adequadas para este perfil.
+            {INSTRUCOES_RANKING}
             """
 
             try:
@@ -106,71 +138,24 @@ def pagina_busca_vagas():
                     if not isinstance(resposta_text, str):
                         resposta_text = str(resposta_text)
 
-                    # Verificar se a resposta tem conteúdo útil
-                    if not resposta_text or len(resposta_text.strip()) < 50:
-                        st.warning(
-                            "A resposta não contém vagas suficientes. Tentando buscar novamente..."
-                        )
-                        # Armazenar no log para debug
-                        print(f"Resposta muito curta recebida: {resposta_text}")
-
                     st.markdown("### Vagas recomendadas:")
                     st.markdown(
                         "Clique em uma vaga para gerar o relatório de preparação."
                     )
 
-                    # Melhoria: usar um separador mais robusto para dividir as vagas
-                    # Filtrar entradas vazias ou que sejam apenas espaços em branco
-                    vagas_list = [
-                        vaga
-                        for vaga in resposta_text.strip().split("---")
-                        if vaga.strip()
-                    ]
-                    if not vagas_list:
-                        # Tentar um método alternativo de divisão se o primeiro não funcionar
-                        vagas_list = [
-                            vaga
-                            for vaga in resposta_text.strip().split("## ")
-                            if vaga.strip()
-                        ]
-                        # Adicionar o prefixo "## " de volta às vagas exceto à primeira
-                        if len(vagas_list) > 1:
-                            vagas_list = [vagas_list[0]] + [
-                                f"## {vaga}" for vaga in vagas_list[1:]
-                            ]
-
-                    # Se ainda não houver vagas válidas, tentar uma divisão simples por linhas em branco
-                    if not vagas_list:
-                        import re
-
-                        # Dividir por 2 ou mais linhas em branco consecutivas
-                        vagas_list = [
-                            vaga
-                            for vaga in re.split(r"\n{2,}", resposta_text)
-                            if vaga.strip()
-                        ]
+                    # O agente só devolve os ids ordenados e um comentário; os
+                    # dados das vagas vêm direto da ferramenta de busca
+                    vagas_list = interpretar_ranking(resposta_text, vagas_encontradas)
 
                     # Armazenar vagas válidas na sessão para acesso posterior
                     st.session_state.vagas_validas = vagas_list
 
                     for i, vaga in enumerate(vagas_list):
-                        if not vaga.strip():  # Skip empty strings
-                            continue
-
-                        # Usar um título mais informativo se possível
-                        titulo = f"Vaga {i + 1}"
-                        try:
-                            # Tentar extrair o título da vaga do markdown
-                            linhas = vaga.split("\n")
-                            for linha in linhas[:3]:  # Olhar apenas as primeiras linhas
-                                if linha.strip().startswith("#") or "**" in linha:
-                                    titulo = f"Vaga {i + 1}: {linha.strip('#').strip().replace('*', '')}"
-                                    break
-                        except:
-                            pass
+                        titulo = f"Vaga {i + 1}: {vaga.title} — {vaga.company}"
+                        texto_vaga = f"## {vaga.title}\n{vaga.markdown()}"
 
                         with st.expander(titulo):
-                            st.markdown(vaga)
+                            st.markdown(vaga.markdown())
 
                             # Gerar uma chave simples para o botão baseada no índice
                             button_key = f"btn_report_{i}"
@@ -202,7 +187,7 @@ def pagina_busca_vagas():
                                         """
 
                                     # Verificar se a vaga não está vazia
-                                    if not vaga or len(vaga.strip()) < 10:
+                                    if len(texto_vaga.strip()) < 10:
                                         st.error(
                                             "Esta vaga não contém informações suficientes para gerar um relatório."
                                         )
@@ -213,30 +198,38 @@ def pagina_busca_vagas():
                                         st.session_state.relatorio_atual = {}
 
                                     # Gerar chave única baseada no conteúdo da vaga
-                                    vaga_key = f"vaga_{i}_{abs(hash(vaga)) % 10000}"
-
-                                    # Verificar se já foi gerado um relatório para essa vaga
-                                    if vaga_key in st.session_state.relatorio_atual:
-                                        relatorio = st.session_state.relatorio_atual[
-                                            vaga_key
-                                        ]
-                                    else:
-                                        # Gerar um novo relatório
-                                        relatorio = gerar_relatorio_preparacao_vaga(
-                                            descricao_vaga=vaga,
-                                            perfil_candidato=perfil,
-                                        )
-                                        # Salvar na sessão
-                                        st.session_state.relatorio_atual[vaga_key] = (
-                                            relatorio
-                                        )
+                                    # (hash() muda a cada processo)
+                                    vaga_hash = hashlib.sha1(
+                                        texto_vaga.encode("utf-8")
+                                    ).hexdigest()[:10]
+                                    vaga_key = f"vaga_{i}_{vaga_hash}"
 
                                     # Criar um container específico para o relatório
                                     report_container = st.container()
                                     with report_container:
-                                        st.success("Relatório gerado com sucesso!")
                                         st.markdown("### 📁 Relatório de Preparação")
-                                        st.markdown(relatorio)
+
+                                        # Verificar se já foi gerado um relatório para essa vaga
+                                        if vaga_key in st.session_state.relatorio_atual:
+                                            relatorio = (
+                                                st.session_state.relatorio_atual[
+                                                    vaga_key
+                                                ]
+                                            )
+                                            st.markdown(relatorio)
+                                        else:
+                                            # Exibe o relatório conforme o modelo gera
+                                            relatorio = st.write_stream(
+                                                gerar_relatorio_preparacao_vaga_em_fluxo(
+                                                    descricao_vaga=texto_vaga,
+                                                    perfil_candidato=perfil,
+                                                )
+                                            )
+                                            # Salvar na sessão
+                                            st.session_state.relatorio_atual[
+                                                vaga_key
+                                            ] = relatorio
+                                        st.success("Relatório gerado com sucesso!")
 
                                         # Verificar se há relatório para download
                                         if relatorio and len(relatorio) > 0:
@@ -325,17 +318,7 @@ def main():
     with a1:
         areas_interesse = st.multiselect(
             "Áreas de Interesse *",
-            options=[
-                "Desenvolvimento de Software",
-                "Análise de Dados",
-                "Inteligência Artificial",
-                "Segurança da Informação",
-                "DevOps",
-                "UX/UI Design",
-                "Gestão de Projetos",
-                "QA/Testes",
-                "Outro",
-            ],
+            options=AREAS_INTERESSE + ["Outro"],
         )
     with a2:
         # campo "Outro" só aparece quando selecionado
@@ -348,18 +331,7 @@ def main():
     with s1:
         setores_interesse = st.multiselect(
             "Setores de Interesse *",
-            options=[
-                "Finanças",
-                "Saúde",
-                "Educação",
-                "Varejo",
-                "E-commerce",
-                "Tecnologia",
-                "Indústria",
-                "Consultoria",
-                "Governo",
-                "Outro",
-            ],
+            options=SETORES_INTERESSE + ["Outro"],
         )
     with s2:
         if "Outro" in setores_interesse:
@@ -417,29 +389,30 @@ def main():
                 if outro_setor:
                     setores_final.append(outro_setor)
 
-                # Extrai texto do currículo PDF
-                curriculo_bytes = curriculo.getvalue()
-                curriculo_texto = extrair_texto_pdf(curriculo_bytes)
+                # Extrai o texto do currículo e os dados do LinkedIn ao mesmo
+                # tempo, exibindo cada página do currículo assim que fica pronta
+                st.markdown("#### 📄 Texto do currículo")
 
-                # Extrai informações do LinkedIn
-                try:
-                    linkedin_dados = get_linkedin_profile(linkedin_url)
-                except Exception as e:
-                    linkedin_dados = f"Erro ao extrair dados do LinkedIn: {str(e)}"
+                def exibir_pagina(numero_pagina, texto_pagina):
+                    with st.expander(f"Página {numero_pagina}"):
+                        st.text(texto_pagina)
 
-                # Monta dicionário e gera JSON
-                dados = {
+                campos = {
                     "nome": nome,
                     "curso": curso,
                     "semestre": semestre,
                     "areas": areas_final,
                     "setores": setores_final,
                     "linkedin": linkedin_url,
-                    "linkedin_dados": linkedin_dados,
                     "arquivo": curriculo.name,
-                    "curriculo_texto": curriculo_texto,
-                    "timestamp": datetime.now().isoformat(),
                 }
+                dados = coletar_perfil(
+                    campos,
+                    curriculo.getvalue(),
+                    linkedin_url,
+                    ao_receber_pagina=exibir_pagina,
+                )
+                indexar_perfil(dados)
                 dados_json = json.dumps(dados, ensure_ascii=False, indent=2)
 
                 # Salva os dados na sessão
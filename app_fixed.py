@@ -4,15 +4,70 @@ import json
 import time
 import io
 import asyncio
-from datetime import datetime
-from service.azure_vision import extrair_texto_pdf
-from agents.scraper_linkedin import get_linkedin_profile
-from agents.relatorio import gerar_relatorio_preparacao_vaga
+from service.indice_vetorial import indexar_perfil
+from service.ingestao_perfil import coletar_perfil, hash_perfil
+from agents.lote_relatorios import (
+    ERRO,
+    GERANDO,
+    PENDENTE,
+    PRONTO,
+    SEM_ORCAMENTO,
+    LoteRelatorios,
+)
+from agents.relatorio import gerar_relatorio_preparacao_vaga_em_fluxo
+from config.taxonomia import AREAS_INTERESSE, SETORES_INTERESSE
 from llama_index.core.agent.workflow import ReActAgent
 
 MAX_FILE_SIZE_MB = 2
 
 
+def perfil_para_relatorio(dados):
+    return f"""
+                        Nome: {dados['nome']}
+                        Curso: {dados['curso']} ({dados['semestre']})
+                        Áreas de interesse: {', '.join(dados['areas'])}
+                        Setores de interesse: {', '.join(dados['setores'])}
+                        Resumo do currículo:
+                        {dados['curriculo_texto']}
+                        Perfil LinkedIn:
+                        {dados['linkedin_dados']}
+                        """
+
+
+def texto_vaga_para_relatorio(vaga):
+    return f"## {vaga.title}\n{vaga.markdown()}"
+
+
+@st.fragment(run_every=1)
+def exibir_relatorio_em_geracao(lote, vaga_id):
+    """Mostra o que já foi gerado do relatório e atualiza a cada segundo."""
+    estado = lote.estado(vaga_id)
+    if estado["status"] not in (PENDENTE, GERANDO):
+        # Terminou: a página inteira é refeita para exibir o relatório pronto
+        st.rerun()
+    if estado["status"] == PENDENTE:
+        st.info("Relatório na fila de geração...")
+    else:
+        st.info("Gerando relatório...")
+        st.markdown(estado["texto"])
+
+
+def vagas_proximas_do_perfil(dados):
+    """Vagas parecidas com o perfil, refeitas só quando ele muda, não a cada rerun."""
+    from tools.procurar_vagas import vagas_compativeis
+
+    perfil_hash = dados.get("perfil_hash") or hash_perfil(dados)
+    if st.session_state.get("vagas_proximas_hash") != perfil_hash:
+        try:
+            vagas = vagas_compativeis(dados)
+        except Exception as e:
+            st.warning(f"Não foi possível buscar as vagas já coletadas: {e}")
+            return []
+        st.session_state.vagas_proximas = vagas
+        st.session_state.vagas_proximas_hash = perfil_hash
+    return st.session_state.vagas_proximas
+
+
 def pagina_busca_vagas():
     try:
         asyncio.get_event_loop()
@@ -31,6 +86,9 @@ def pagina_busca_vagas():
     if "vagas_validas" not in st.session_state:
         st.session_state.vagas_validas = []
 
+    if "lote_relatorios" not in st.session_state:
+        st.session_state.lote_relatorios = None
+
     if "dados_candidato" not in st.session_state:
         st.error("Você precisa preencher o formulário primeiro.")
         st.session_state.pagina = "cadastro"
@@ -41,12 +99,33 @@ def pagina_busca_vagas():
     with st.expander("Dados do candidato"):
         st.json(dados)
 
+    # Vagas já coletadas por buscas anteriores, encontradas pelo índice
+    # semântico sem esperar o agente
+    vagas_proximas = vagas_proximas_do_perfil(dados)
+    if vagas_proximas:
+        st.subheader("⚡ Vagas já coletadas parecidas com o seu perfil")
+        for vaga in vagas_proximas:
+            with st.expander(f"{vaga.title} — {vaga.company}"):
+                st.markdown(vaga.markdown())
+
+    st.toggle(
+        "Gerar os relatórios de todas as vagas em segundo plano",
+        key="pre_gerar_relatorios",
+        help="Os relatórios começam a ser gerados assim que as vagas chegam, "
+        "dentro de um limite de tokens por busca.",
+    )
+
     # Ação de busca
     if st.button("Buscar vagas compatíveis"):
         with st.spinner("Buscando vagas... Isso pode demorar alguns minutos."):
-            from tools.procurar_vagas import tool_procurar_vagas
+            from tools.procurar_vagas import (
+                INSTRUCOES_RANKING,
+                criar_tool_procurar_vagas,
+                interpretar_ranking,
+            )
             from service.azure_llm import llm
 
+            tool_procurar_vagas, vagas_encontradas = criar_tool_procurar_vagas()
             agent = ReActAgent(
                 llm=llm,
                 system_prompt="Você é um assistente de busca de vagas de emprego. Encontre vagas de emprego adequadas.",
@@ -71,7 +150,8 @@ def pagina_busca_vagas():
             Perfil LinkedIn:
             {dados['linkedin_dados']}...
             
-            Encontre vagas adequadas para este perfil e formate-as de modo organizado.
+            Encontre vagas adequadas para este perfil.
+            {INSTRUCOES_RANKING}
             """
 
             try:
@@ -112,50 +192,27 @@ def pagina_busca_vagas():
                     if not isinstance(resposta_text, str):
                         resposta_text = str(resposta_text)
 
-                    # Verificar se a resposta tem conteúdo útil
-                    if not resposta_text or len(resposta_text.strip()) < 50:
-                        st.warning(
-                            "A resposta não contém vagas suficientes. Tentando buscar novamente..."
-                        )
-                        # Armazenar no log para debug
-                        print(f"Resposta muito curta recebida: {resposta_text}")
-
-                    # Melhoria: usar um separador mais robusto para dividir as vagas
-                    # Filtrar entradas vazias ou que sejam apenas espaços em branco
-                    vagas_list = [
-                        vaga
-                        for vaga in resposta_text.strip().split("---")
-                        if vaga.strip()
-                    ]
-                    if not vagas_list:
-                        # Tentar um método alternativo de divisão se o primeiro não funcionar
-                        vagas_list = [
-                            vaga
-                            for vaga in resposta_text.strip().split("## ")
-                            if vaga.strip()
-                        ]
-                        # Adicionar o prefixo "## " de volta às vagas exceto à primeira
-                        if len(vagas_list) > 1:
-                            vagas_list = [vagas_list[0]] + [
-                                f"## {vaga}" for vaga in vagas_list[1:]
-                            ]
-
-                    # Se ainda não houver vagas válidas, tentar uma divisão simples por linhas em branco
-                    if not vagas_list:
-                        import re
-
-                        # Dividir por 2 ou mais linhas em branco consecutivas
-                        vagas_list = [
-                            vaga
-                            for vaga in re.split(r"\n{2,}", resposta_text)
-                            if vaga.strip()
-                        ]
+                    # O agente só devolve os ids ordenados e um comentário; os
+                    # dados das vagas vêm direto da ferramenta de busca
+                    vagas_list = interpretar_ranking(resposta_text, vagas_encontradas)
 
                     # Armazenar vagas válidas na sessão para acesso posterior
                     st.session_state.vagas_validas = vagas_list
                     st.session_state.relatorios = {}
                     st.session_state.relatorio_ativo = None
 
+                    if st.session_state.lote_relatorios is not None:
+                        st.session_state.lote_relatorios.cancelar()
+                        st.session_state.lote_relatorios = None
+                    if st.session_state.pre_gerar_relatorios:
+                        lote = LoteRelatorios()
+                        perfil = perfil_para_relatorio(dados)
+                        for i, vaga in enumerate(vagas_list):
+                            lote.enviar(
+                                f"vaga_{i}", texto_vaga_para_relatorio(vaga), perfil
+                            )
+                        st.session_state.lote_relatorios = lote
+
                 else:
                     st.warning("Nenhuma vaga encontrada que corresponda ao seu perfil.")
             except Exception as e:
@@ -169,38 +226,51 @@ def pagina_busca_vagas():
     if st.session_state.vagas_validas:
         st.subheader("Vagas recomendadas")
         st.markdown("Clique em uma vaga para gerar o relatório de preparação.")
+        lote = st.session_state.lote_relatorios
         for i, vaga in enumerate(st.session_state.vagas_validas):
             vaga_id = f"vaga_{i}"
-            titulo = f"Vaga {i + 1}"
-            try:
-                # Tentar extrair o título da vaga do markdown
-                linhas = vaga.split("\n")
-                for linha in linhas[:3]:  # Olhar apenas as primeiras linhas
-                    if linha.strip().startswith("#") or "**" in linha:
-                        titulo = (
-                            f"Vaga {i + 1}: {linha.strip('#').strip().replace('*', '')}"
-                        )
-                        break
-            except:
-                pass
+            # Relatório gerado em segundo plano: pronto ou ainda chegando
+            estado_lote = lote.estado(vaga_id) if lote is not None else None
+            if estado_lote is not None and estado_lote["status"] == PRONTO:
+                st.session_state.relatorios.setdefault(vaga_id, estado_lote["texto"])
+            em_lote = estado_lote is not None and estado_lote["status"] in (
+                PENDENTE,
+                GERANDO,
+            )
+            titulo = f"Vaga {i + 1}: {vaga.title} — {vaga.company}"
             with st.expander(
                 titulo, expanded=(st.session_state.relatorio_ativo == vaga_id)
             ):
-                st.markdown(vaga)
+                st.markdown(vaga.markdown())
                 # Botão gerar ou toggle relatório
-                if vaga_id not in st.session_state.relatorios:
+                if em_lote:
+                    if st.button("📄 Ver relatório", key=f"toggle_{vaga_id}"):
+                        st.session_state.relatorio_ativo = (
+                            None
+                            if st.session_state.relatorio_ativo == vaga_id
+                            else vaga_id
+                        )
+                elif vaga_id not in st.session_state.relatorios:
+                    status_lote = estado_lote["status"] if estado_lote else None
+                    if status_lote == SEM_ORCAMENTO:
+                        st.caption(
+                            "Este relatório ficou fora do limite de tokens da "
+                            "geração em segundo plano."
+                        )
+                    elif status_lote == ERRO:
+                        st.caption("A geração deste relatório em segundo plano falhou.")
                     if st.button("📄 Gerar relatório", key=f"btn_{vaga_id}"):
-                        perfil = f"""
-                        Nome: {dados['nome']}
-                        Curso: {dados['curso']} ({dados['semestre']})
-                        Áreas de interesse: {', '.join(dados['areas'])}
-                        Setores de interesse: {', '.join(dados['setores'])}
-                        Resumo do currículo:
-                        {dados['curriculo_texto']}
-                        Perfil LinkedIn:
-                        {dados['linkedin_dados']}
-                        """
-                        rel = gerar_relatorio_preparacao_vaga(vaga.strip(), perfil)
+                        perfil = perfil_para_relatorio(dados)
+                        # Exibe o relatório conforme o modelo gera; ao
+                        # terminar, ele passa a ser mostrado pelo bloco abaixo
+                        em_geracao = st.empty()
+                        with em_geracao.container():
+                            rel = st.write_stream(
+                                gerar_relatorio_preparacao_vaga_em_fluxo(
+                                    texto_vaga_para_relatorio(vaga), perfil
+                                )
+                            )
+                        em_geracao.empty()
                         st.session_state.relatorios[vaga_id] = rel
                         st.session_state.relatorio_ativo = vaga_id
                 else:
@@ -211,7 +281,25 @@ def pagina_busca_vagas():
                             else vaga_id
                         )
                 # Exibir relatório ativo
-                if st.session_state.relatorio_ativo == vaga_id:
+                if st.session_state.relatorio_ativo == vaga_id and em_lote:
+                    exibir_relatorio_em_geracao(lote, vaga_id)
+                elif (
+                    st.session_state.relatorio_ativo == vaga_id
+                    and vaga_id not in st.session_state.relatorios
+                ):
+                    # O relatório aberto enquanto era gerado em segundo plano
+                    # terminou sem texto (erro ou sem orçamento)
+                    if estado_lote is not None and estado_lote["status"] == ERRO:
+                        st.error(
+                            "Não foi possível gerar o relatório. Use o botão "
+                            "acima para tentar novamente."
+                        )
+                    else:
+                        st.warning(
+                            "O relatório não foi gerado em segundo plano. Use o "
+                            "botão acima para gerá-lo agora."
+                        )
+                elif st.session_state.relatorio_ativo == vaga_id:
                     st.success("✅ Relatório gerado com sucesso!")
                     st.markdown("### 📁 Relatório de Preparação")
                     st.markdown(st.session_state.relatorios[vaga_id])
@@ -226,6 +314,9 @@ def pagina_busca_vagas():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Realizar nova busca"):
+                if st.session_state.lote_relatorios is not None:
+                    st.session_state.lote_relatorios.cancelar()
+                    st.session_state.lote_relatorios = None
                 st.session_state.vagas_validas = []
                 st.session_state.relatorios = {}
                 st.session_state.relatorio_ativo = None
@@ -278,17 +369,7 @@ def main():
         with a1:
             areas_interesse = st.multiselect(
                 "Áreas de Interesse *",
-                options=[
-                    "Desenvolvimento de Software",
-                    "Análise de Dados",
-                    "Inteligência Artificial",
-                    "Segurança da Informação",
-                    "DevOps",
-                    "UX/UI Design",
-                    "Gestão de Projetos",
-                    "QA/Testes",
-                    "Outro",
-                ],
+                options=AREAS_INTERESSE + ["Outro"],
             )
         with a2:
             # campo "Outro" só aparece quando selecionado
@@ -301,18 +382,7 @@ def main():
         with s1:
             setores_interesse = st.multiselect(
                 "Setores de Interesse *",
-                options=[
-                    "Finanças",
-                    "Saúde",
-                    "Educação",
-                    "Varejo",
-                    "E-commerce",
-                    "Tecnologia",
-                    "Indústria",
-                    "Consultoria",
-                    "Governo",
-                    "Outro",
-                ],
+                options=SETORES_INTERESSE + ["Outro"],
             )
         with s2:
             if "Outro" in setores_interesse:
@@ -370,29 +440,19 @@ def main():
                     if outro_setor:
                         setores_final.append(outro_setor)
 
-                    # Extrai texto do currículo PDF
-                    curriculo_bytes = curriculo.getvalue()
-                    curriculo_texto = extrair_texto_pdf(curriculo_bytes)
-
-                    # Extrai informações do LinkedIn
-                    try:
-                        linkedin_dados = get_linkedin_profile(linkedin_url)
-                    except Exception as e:
-                        linkedin_dados = f"Erro ao extrair dados do LinkedIn: {str(e)}"
-
-                    # Monta dicionário e gera JSON
-                    dados = {
+                    # Extrai o texto do currículo e os dados do LinkedIn ao
+                    # mesmo tempo
+                    campos = {
                         "nome": nome,
                         "curso": curso,
                         "semestre": semestre,
                         "areas": areas_final,
                         "setores": setores_final,
                         "linkedin": linkedin_url,
-                        "linkedin_dados": linkedin_dados,
                         "arquivo": curriculo.name,
-                        "curriculo_texto": curriculo_texto,
-                        "timestamp": datetime.now().isoformat(),
                     }
+                    dados = coletar_perfil(campos, curriculo.getvalue(), linkedin_url)
+                    indexar_perfil(dados)
                     dados_json = json.dumps(dados, ensure_ascii=False, indent=2)
 
                     # Salva os dados na sessão
@@ -0,0 +1,117 @@
+"""
+Benchmark do agrupamento de lines do OCR em linhas visuais.
+
+Compara a varredura ordenada de `_agrupar_linhas_por_posicao_vertical` com a
+implementação quadrática anterior em páginas sintéticas de 100, 1k e 10k lines,
+verificando também que as duas produzem o mesmo texto.
+
+Uso:
+    python -m benchmarks.bench_agrupamento_linhas
+"""
+
+import os
+import random
+import sys
+import time
+
+# O módulo cria o cliente do Azure na importação; valores fictícios bastam aqui.
+os.environ.setdefault("AZURE_COMPUTER_VISION_ENDPOINT", "http://localhost")
+os.environ.setdefault("AZURE_COMPUTER_VISION_API_KEY", "benchmark")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from azure.cognitiveservices.vision.computervision.models import Line  # noqa: E402
+
+from service.azure_vision import (  # noqa: E402
+    Linha,
+    _agrupar_linhas_por_posicao_vertical,
+    _calcular_centro_y,
+    _calcular_tolerancia,
+    _extrair_texto_das_linhas,
+    _ordenar_linhas_e_palavras,
+)
+
+TAMANHOS = [100, 1_000, 10_000]
+COLUNAS = 4
+ALTURA_LINHA = 20
+ESPACAMENTO = 30
+TOLERANCIA_VERTICAL = 1 / 3
+
+
+def _agrupar_quadratico(lines, tolerancia_vertical):
+    # Implementação original, mantida apenas como referência.
+    linhas = []
+    for line in lines:
+        centro_y = _calcular_centro_y(line.bounding_box)
+        tolerancia = _calcular_tolerancia(line.bounding_box, tolerancia_vertical)
+        palavra = (line.bounding_box[0], line.text)
+        for linha_existente in linhas:
+            if abs(linha_existente.centro_y - centro_y) <= tolerancia:
+                linha_existente.palavras.append(palavra)
+                break
+        else:
+            linhas.append(Linha(centro_y=centro_y, palavras=[palavra]))
+    _ordenar_linhas_e_palavras(linhas)
+    return linhas
+
+
+def gerar_pagina(quantidade, semente=42):
+    """Gera lines no formato do SDK, em ordem de leitura por coluna."""
+    aleatorio = random.Random(semente)
+    linhas_por_coluna = max(1, quantidade // COLUNAS)
+    lines = []
+    for coluna in range(COLUNAS):
+        for indice in range(linhas_por_coluna):
+            if len(lines) == quantidade:
+                break
+            topo = indice * ESPACAMENTO + aleatorio.uniform(-2, 2)
+            base = topo + ALTURA_LINHA
+            esquerda = coluna * 200 + aleatorio.uniform(0, 5)
+            direita = esquerda + 150
+            lines.append(
+                Line(
+                    bounding_box=[
+                        esquerda,
+                        topo,
+                        direita,
+                        topo,
+                        direita,
+                        base,
+                        esquerda,
+                        base,
+                    ],
+                    text=f"c{coluna}l{indice}",
+                    words=[],
+                )
+            )
+    return lines
+
+
+def medir(funcao, lines, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao(lines, TOLERANCIA_VERTICAL)
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+def main():
+    print(f"{'lines':>8} {'quadrático (ms)':>16} {'varredura (ms)':>16} {'ganho':>8}")
+    for quantidade in TAMANHOS:
+        lines = gerar_pagina(quantidade)
+        repeticoes = 1 if quantidade >= 10_000 else 5
+        tempo_antigo, linhas_antigas = medir(_agrupar_quadratico, lines, repeticoes)
+        tempo_novo, linhas_novas = medir(
+            _agrupar_linhas_por_posicao_vertical, lines, repeticoes
+        )
+        if _extrair_texto_das_linhas(linhas_antigas) != _extrair_texto_das_linhas(
+            linhas_novas
+        ):
+            raise SystemExit(f"Saída divergente para {quantidade} lines")
+        print(
+            f"{quantidade:>8} {tempo_antigo * 1000:>16.2f} "
+            f"{tempo_novo * 1000:>16.2f} {tempo_antigo / tempo_novo:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
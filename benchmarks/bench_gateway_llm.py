@@ -0,0 +1,90 @@
+"""
+Benchmark do gateway do LLM contra chamadas independentes.
+
+Usa o servidor local de `servidor_openai_falso`. Simula várias sessões do
+Streamlit (threads) pedindo relatórios ao mesmo tempo, em que parte dos
+prompts se repete (alunos vendo a mesma vaga), e compara:
+
+- chamadas independentes: um cliente HTTP por chamada, sem agrupamento;
+- o `GatewayLLM`: pool de conexões e prompts idênticos agrupados.
+
+Depois mede o gateway com o servidor recusando as primeiras requisições
+com 429, para conferir que todas terminam respeitando o Retry-After.
+
+Uso:
+    python -m benchmarks.bench_gateway_llm
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from benchmarks.servidor_openai_falso import ServidorOpenAIFalso  # noqa: E402
+from service.azure_llm import GatewayLLM  # noqa: E402
+
+CHAMADAS = 120
+PROMPTS_DISTINTOS = 40
+SESSOES = 30
+ATRASO = 0.2
+
+
+def prompts():
+    return [
+        f"relatório da vaga {numero % PROMPTS_DISTINTOS}" for numero in range(CHAMADAS)
+    ]
+
+
+def chamada_independente(endpoint, prompt):
+    with httpx.Client(timeout=30) as cliente:
+        resposta = cliente.post(
+            f"{endpoint}/openai/deployments/d/chat/completions",
+            params={"api-version": "2024-02-01"},
+            headers={"api-key": "benchmark"},
+            json={"messages": [{"role": "user", "content": prompt}]},
+        )
+        resposta.raise_for_status()
+        return resposta.json()["choices"][0]["message"]["content"]
+
+
+def medir(nome, servidor, chamar):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SESSOES) as executor:
+        respostas = list(executor.map(chamar, prompts()))
+    duracao = time.perf_counter() - inicio
+    print(
+        f"{nome:>24}: {duracao:5.2f}s, {len(respostas)} respostas, "
+        f"{servidor.requisicoes} requisições ({servidor.recusadas} com 429), "
+        f"{len(servidor.conexoes)} conexões"
+    )
+
+
+def main():
+    print(
+        f"{CHAMADAS} chamadas de {SESSOES} sessões, {PROMPTS_DISTINTOS} prompts "
+        f"distintos, {ATRASO}s por resposta"
+    )
+    with ServidorOpenAIFalso(atraso=ATRASO) as servidor:
+        medir(
+            "chamadas independentes",
+            servidor,
+            lambda prompt: chamada_independente(servidor.endpoint, prompt),
+        )
+
+    with ServidorOpenAIFalso(atraso=ATRASO) as servidor:
+        gateway = GatewayLLM(servidor.endpoint, chave_api="benchmark", deployment="d")
+        medir("gateway", servidor, gateway.completar)
+        gateway.fechar()
+
+    with ServidorOpenAIFalso(atraso=ATRASO, recusas_429=10, retry_after=1) as servidor:
+        gateway = GatewayLLM(servidor.endpoint, chave_api="benchmark", deployment="d")
+        medir("gateway com 429", servidor, gateway.completar)
+        gateway.fechar()
+
+
+if __name__ == "__main__":
+    main()
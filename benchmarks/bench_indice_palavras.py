@@ -0,0 +1,124 @@
+"""
+Benchmark do índice BM25 sobre 100.000 vagas sintéticas.
+
+As vagas combinam um título e uma descrição de ~150 palavras sorteadas com
+distribuição de Zipf de um vocabulário de termos de tecnologia e palavras
+geradas, como em textos reais (poucos termos muito comuns e uma cauda
+longa). Mede o tempo de indexação e a latência das consultas, incluindo
+consultas só com termos frequentes, o pior caso do BM25.
+
+Uso:
+    python -m benchmarks.bench_indice_palavras
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.indice_palavras import IndiceBM25  # noqa: E402
+
+VAGAS = 100_000
+PALAVRAS_POR_DESCRICAO = 150
+CONSULTAS = 500
+
+TERMOS = (
+    "desenvolvedor analista dados python java sql estágio engenheiro software "
+    "cloud azure aws devops kubernetes docker frontend backend react angular "
+    "node segurança informação redes suporte infraestrutura power bi excel "
+    "machine learning inteligência artificial estatística gestão projetos "
+    "scrum agile testes qualidade automação design ux ui figma produto "
+    "marketing vendas financeiro contábil banco varejo saúde educação governo"
+).split()
+TITULOS = [
+    "Estágio em Desenvolvimento de Software",
+    "Analista de Dados Júnior",
+    "Estagiário de Infraestrutura",
+    "Engenheiro de Machine Learning",
+    "Designer UX/UI",
+    "Analista de Segurança da Informação",
+    "Estágio em DevOps",
+    "Analista de Testes",
+]
+CONSULTAS_FREQUENTES = ["desenvolvedor python", "analista dados sql", "estágio"]
+
+
+def gerar_vocabulario(gerador):
+    sintetico = [
+        "".join(gerador.choice("abcdefghijlmnoprstuvxz") for _ in range(7))
+        for _ in range(20_000)
+    ]
+    vocabulario = TERMOS + sintetico
+    # Pesos acumulados: random.choices não precisa somá-los a cada sorteio
+    pesos, soma = [], 0.0
+    for posicao in range(len(vocabulario)):
+        soma += 1 / (posicao + 1)
+        pesos.append(soma)
+    return vocabulario, pesos
+
+
+def main():
+    gerador = random.Random(0)
+    vocabulario, pesos = gerar_vocabulario(gerador)
+
+    inicio = time.perf_counter()
+    documentos = [
+        (
+            f"vaga-{numero}",
+            gerador.choice(TITULOS)
+            + "\n"
+            + " ".join(
+                gerador.choices(
+                    vocabulario, cum_weights=pesos, k=PALAVRAS_POR_DESCRICAO
+                )
+            ),
+        )
+        for numero in range(VAGAS)
+    ]
+    print(f"{VAGAS} vagas geradas em {time.perf_counter() - inicio:.1f}s")
+
+    indice = IndiceBM25()
+    inicio = time.perf_counter()
+    indice.adicionar_varios(documentos)
+    tempo_indexacao = time.perf_counter() - inicio
+    print(
+        f"indexação: {tempo_indexacao:.1f}s "
+        f"({VAGAS / tempo_indexacao:,.0f} vagas/s, {len(indice._postagens):,} termos)"
+    )
+
+    consultas = [
+        " ".join(
+            gerador.choices(vocabulario, cum_weights=pesos, k=gerador.randint(1, 4))
+        )
+        for _ in range(CONSULTAS)
+    ]
+    for nome, lista in [
+        ("aleatórias", consultas),
+        ("frequentes", CONSULTAS_FREQUENTES * (CONSULTAS // 3)),
+    ]:
+        tempos = []
+        for consulta in lista:
+            inicio = time.perf_counter()
+            indice.buscar(consulta, k=10)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        tempos.sort()
+        print(
+            f"consultas {nome:>10}: p50 {tempos[len(tempos) // 2]:.2f} ms, "
+            f"p95 {tempos[int(len(tempos) * 0.95)]:.2f} ms, "
+            f"máximo {tempos[-1]:.2f} ms"
+        )
+
+    # Atualização incremental, como quando o on_data entrega uma vaga nova
+    inicio = time.perf_counter()
+    for numero in range(1000):
+        indice.adicionar(f"nova-{numero}", documentos[numero][1] + " kotlin")
+    print(
+        f"atualização incremental: "
+        f"{(time.perf_counter() - inicio) / 1000 * 1000:.2f} ms por vaga"
+    )
+
+
+if __name__ == "__main__":
+    main()
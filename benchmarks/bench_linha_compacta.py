@@ -0,0 +1,182 @@
+"""
+Benchmark da `Linha` com __slots__ contra o modelo pydantic anterior.
+
+Mede, para uma página sintética com lines completas do SDK (com palavras e
+confiança), o tempo do pós-processamento (agrupar e extrair o texto), o pico
+de memória durante o agrupamento e a memória que as linhas continuam
+segurando depois que o resultado do Azure é descartado.
+
+Uso:
+    python -m benchmarks.bench_linha_compacta
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# O módulo cria o cliente do Azure na importação; valores fictícios bastam aqui.
+os.environ.setdefault("AZURE_COMPUTER_VISION_ENDPOINT", "http://localhost")
+os.environ.setdefault("AZURE_COMPUTER_VISION_API_KEY", "benchmark")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from azure.cognitiveservices.vision.computervision.models import (  # noqa: E402
+    Line,
+    Word,
+)
+from pydantic import BaseModel, ConfigDict  # noqa: E402
+
+from service.azure_vision import (  # noqa: E402
+    _agrupar_linhas_por_posicao_vertical,
+    _calcular_centro_y,
+    _calcular_tolerancia,
+    _extrair_texto_das_linhas,
+)
+
+QUANTIDADE_LINES = 10_000
+PALAVRAS_POR_LINE = 6
+TOLERANCIA_VERTICAL = 1 / 3
+REPETICOES = 5
+
+
+class LinhaPydantic(BaseModel):
+    # Modelo anterior, mantido apenas como referência.
+    centro_y: float
+    palavras: list[Line] = []
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def _agrupar_pydantic(lines, tolerancia_vertical):
+    candidatas = sorted(
+        (
+            (
+                _calcular_centro_y(line.bounding_box),
+                _calcular_tolerancia(line.bounding_box, tolerancia_vertical),
+                line,
+            )
+            for line in lines
+        ),
+        key=lambda candidata: candidata[0],
+    )
+    linhas = []
+    for centro_y, tolerancia, line in candidatas:
+        if linhas and centro_y - linhas[-1].centro_y <= tolerancia:
+            linhas[-1].palavras.append(line)
+        else:
+            linhas.append(LinhaPydantic(centro_y=centro_y, palavras=[line]))
+    for linha in linhas:
+        linha.palavras.sort(key=lambda palavra: palavra.bounding_box[0])
+    linhas.sort(key=lambda l: l.centro_y)
+    return linhas
+
+
+def _texto_pydantic(linhas):
+    return "\n".join(
+        " ".join(palavra.text for palavra in linha.palavras if palavra.text)
+        for linha in linhas
+    )
+
+
+def gerar_lines(quantidade):
+    lines = []
+    for indice in range(quantidade):
+        # Duas colunas: cada linha visual tem duas lines do SDK
+        topo = (indice // 2) * 30
+        base = topo + 20
+        esquerda = (indice % 2) * 300
+        palavras = [
+            Word(
+                bounding_box=[
+                    esquerda + 40 * p,
+                    topo,
+                    esquerda + 40 * p + 35,
+                    topo,
+                    esquerda + 40 * p + 35,
+                    base,
+                    esquerda + 40 * p,
+                    base,
+                ],
+                text=f"palavra{p}",
+                confidence=0.99,
+            )
+            for p in range(PALAVRAS_POR_LINE)
+        ]
+        direita = esquerda + 40 * PALAVRAS_POR_LINE
+        lines.append(
+            Line(
+                bounding_box=[
+                    esquerda,
+                    topo,
+                    direita,
+                    topo,
+                    direita,
+                    base,
+                    esquerda,
+                    base,
+                ],
+                text=" ".join(palavra.text for palavra in palavras),
+                words=palavras,
+            )
+        )
+    return lines
+
+
+def medir_tempo(agrupar, extrair, lines):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        texto = extrair(agrupar(lines, TOLERANCIA_VERTICAL))
+    return (time.perf_counter() - inicio) / REPETICOES, texto
+
+
+def medir_memoria(agrupar):
+    gc.collect()
+    tracemalloc.start()
+    lines = gerar_lines(QUANTIDADE_LINES)
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    linhas = agrupar(lines, TOLERANCIA_VERTICAL)
+    _, pico = tracemalloc.get_traced_memory()
+    # Descarta o resultado do Azure e vê o que as linhas ainda seguram
+    del lines
+    gc.collect()
+    retida, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del linhas
+    return pico - base, retida
+
+
+def main():
+    lines = gerar_lines(QUANTIDADE_LINES)
+    tempo_antigo, texto_antigo = medir_tempo(_agrupar_pydantic, _texto_pydantic, lines)
+    tempo_novo, texto_novo = medir_tempo(
+        _agrupar_linhas_por_posicao_vertical, _extrair_texto_das_linhas, lines
+    )
+    if texto_antigo != texto_novo:
+        raise SystemExit("Texto divergente entre as implementações")
+    del lines
+
+    pico_antigo, retida_antiga = medir_memoria(_agrupar_pydantic)
+    pico_novo, retida_nova = medir_memoria(_agrupar_linhas_por_posicao_vertical)
+
+    mb = 1024**2
+    print(f"{QUANTIDADE_LINES} lines, {PALAVRAS_POR_LINE} palavras por line")
+    print(f"{'':>22} {'pydantic':>10} {'__slots__':>10} {'razão':>7}")
+    print(
+        f"{'tempo (ms)':>22} {tempo_antigo * 1000:>10.2f} "
+        f"{tempo_novo * 1000:>10.2f} {tempo_antigo / tempo_novo:>6.1f}x"
+    )
+    print(
+        f"{'pico agrupando (MB)':>22} {pico_antigo / mb:>10.2f} "
+        f"{pico_novo / mb:>10.2f} {pico_antigo / pico_novo:>6.1f}x"
+    )
+    print(
+        f"{'retida pelas linhas (MB)':>22} {retida_antiga / mb:>10.2f} "
+        f"{retida_nova / mb:>10.2f} {retida_antiga / retida_nova:>6.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark do OCR por partes em paralelo contra o OCR em um único pedido.
+
+Usa o servidor local de `servidor_read_falso`, em que cada página leva um
+tempo fixo para ficar pronta, e mede o tempo até o texto de PDFs (sem camada
+de texto) com 1, 5 e 20 páginas.
+
+Uso:
+    python -m benchmarks.bench_ocr_paralelo
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+# O módulo cria o cliente do Azure na importação; valores fictícios bastam aqui.
+os.environ.setdefault("AZURE_COMPUTER_VISION_ENDPOINT", "http://localhost")
+os.environ.setdefault("AZURE_COMPUTER_VISION_API_KEY", "benchmark")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfWriter  # noqa: E402
+
+import service.azure_vision as azure_vision  # noqa: E402
+from benchmarks.servidor_read_falso import ServidorReadFalso  # noqa: E402
+
+TAMANHOS = [1, 5, 20]
+ATRASO_POR_PAGINA = 0.2
+
+
+def gerar_pdf(paginas):
+    escritor = PdfWriter()
+    for _ in range(paginas):
+        escritor.add_blank_page(width=612, height=792)
+    saida = io.BytesIO()
+    escritor.write(saida)
+    return saida.getvalue()
+
+
+async def medir_pedido_unico(conteudo):
+    inicio = time.perf_counter()
+    _, textos = await azure_vision.ocr_async(conteudo)
+    return time.perf_counter() - inicio, len(textos)
+
+
+async def medir_em_partes(conteudo, paginas):
+    inicio = time.perf_counter()
+    textos = await azure_vision._ocr_em_partes_async(
+        conteudo,
+        list(range(1, paginas + 1)),
+        azure_vision.TOLERANCIA_VERTICAL_PADRAO,
+        azure_vision.IDIOMA_PADRAO,
+    )
+    return time.perf_counter() - inicio, len(textos)
+
+
+def main():
+    print(
+        f"{'páginas':>8} {'pedido único (s)':>17} {'em partes (s)':>14} "
+        f"{'ganho':>8}  (partes de {azure_vision.OCR_PARALELO_PAGINAS_POR_PARTE}"
+        f" páginas, até {azure_vision.OCR_PARALELO_CONCORRENCIA} em paralelo)"
+    )
+    with ServidorReadFalso(atraso_por_pagina=ATRASO_POR_PAGINA) as servidor:
+        azure_vision.AZURE_COMPUTER_VISION_ENDPOINT = servidor.endpoint
+        for paginas in TAMANHOS:
+            conteudo = gerar_pdf(paginas)
+            tempo_unico, total_unico = asyncio.run(medir_pedido_unico(conteudo))
+            tempo_partes, total_partes = asyncio.run(medir_em_partes(conteudo, paginas))
+            if not total_unico == total_partes == paginas:
+                raise SystemExit(f"Número de páginas divergente para {paginas}")
+            print(
+                f"{paginas:>8} {tempo_unico:>17.2f} {tempo_partes:>14.2f} "
+                f"{tempo_unico / tempo_partes:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Servidor local que imita o endpoint de chat completions do Azure OpenAI.
+
+A resposta repete o prompt ("resposta: <prompt>") depois de `atraso`
+segundos. Com "stream": true, o texto sai em eventos SSE, uma palavra por
+evento, precedidos do evento só com filtros de conteúdo que o Azure envia.
+As primeiras `recusas_429` requisições recebem 429 com Retry-After e
+retry-after-ms. O servidor conta as requisições, as conexões TCP abertas e
+os fluxos que o cliente fechou antes do fim, para conferir o agrupamento de
+prompts, o reuso de conexões e o cancelamento de fluxos.
+
+Uso:
+    python -m benchmarks.servidor_openai_falso --porta 8766
+
+    # ou, em código:
+    with ServidorOpenAIFalso(atraso=0.2) as servidor:
+        gateway = GatewayLLM(servidor.endpoint, chave_api="x", deployment="d")
+        gateway.completar("olá")
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _ServidorHTTP(ThreadingHTTPServer):
+    # Várias sessões conectando ao mesmo tempo não cabem na fila padrão (5)
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class ServidorOpenAIFalso:
+    """
+    Args:
+        porta: porta local (0 escolhe uma livre)
+        atraso: segundos até a resposta (ou o primeiro pedaço do fluxo)
+        recusas_429: quantas requisições iniciais devem ser recusadas com 429
+        retry_after: segundos informados nas recusas
+        atraso_por_pedaco: segundos entre os eventos de um fluxo
+    """
+
+    def __init__(
+        self,
+        porta=0,
+        atraso=0.1,
+        recusas_429=0,
+        retry_after=0.5,
+        atraso_por_pedaco=0.01,
+    ):
+        self.atraso = atraso
+        self.recusas_429 = recusas_429
+        self.retry_after = retry_after
+        self.atraso_por_pedaco = atraso_por_pedaco
+        self.requisicoes = 0
+        self.recusadas = 0
+        self.fluxos_interrompidos = 0
+        self.conexoes = set()
+        self.prompts = []
+        self._lock = threading.Lock()
+        self._servidor = _ServidorHTTP(("127.0.0.1", porta), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._servidor.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Mantém as conexões abertas entre requisições, como o Azure
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, status, corpo, headers=None):
+                dados = json.dumps(corpo).encode()
+                self.send_response(status)
+                for nome, valor in (headers or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def _enviar_evento(self, evento):
+                dados = f"data: {json.dumps(evento)}\n\n".encode()
+                self.wfile.write(f"{len(dados):x}\r\n".encode() + dados + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                tamanho = int(self.headers.get("Content-Length", 0))
+                corpo = json.loads(self.rfile.read(tamanho))
+                if "/chat/completions" not in self.path or not self.headers.get(
+                    "api-key"
+                ):
+                    return self._responder(404, {"error": {"code": "404"}})
+                prompt = corpo["messages"][-1]["content"]
+                with servidor._lock:
+                    servidor.requisicoes += 1
+                    servidor.conexoes.add(self.client_address)
+                    recusar = servidor.recusas_429 > 0
+                    if recusar:
+                        servidor.recusas_429 -= 1
+                        servidor.recusadas += 1
+                    else:
+                        servidor.prompts.append(prompt)
+                if recusar:
+                    return self._responder(
+                        429,
+                        {"error": {"code": "429", "message": "Rate limit"}},
+                        {
+                            "Retry-After": str(max(int(servidor.retry_after), 1)),
+                            "retry-after-ms": str(int(servidor.retry_after * 1000)),
+                        },
+                    )
+
+                time.sleep(servidor.atraso)
+                texto = f"resposta: {prompt}"
+                tokens_entrada = len(prompt) // 4 + 1
+                tokens_saida = len(texto) // 4 + 1
+                if not corpo.get("stream"):
+                    return self._responder(
+                        200,
+                        {
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": texto},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                            "usage": {
+                                "prompt_tokens": tokens_entrada,
+                                "completion_tokens": tokens_saida,
+                                "total_tokens": tokens_entrada + tokens_saida,
+                            },
+                        },
+                    )
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    self._enviar_evento({"choices": [], "prompt_filter_results": []})
+                    for palavra in texto.split(" "):
+                        self._enviar_evento(
+                            {
+                                "choices": [
+                                    {"index": 0, "delta": {"content": palavra + " "}}
+                                ]
+                            }
+                        )
+                        time.sleep(servidor.atraso_por_pedaco)
+                    dados = b"data: [DONE]\n\n"
+                    self.wfile.write(
+                        f"{len(dados):x}\r\n".encode() + dados + b"\r\n0\r\n\r\n"
+                    )
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # O cliente fechou o fluxo antes do fim
+                    self.close_connection = True
+                    with servidor._lock:
+                        servidor.fluxos_interrompidos += 1
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--porta", type=int, default=8766)
+    parser.add_argument("--atraso", type=float, default=0.1)
+    parser.add_argument("--recusas-429", type=int, default=0)
+    args = parser.parse_args()
+
+    with ServidorOpenAIFalso(args.porta, args.atraso, args.recusas_429) as servidor:
+        print(f"Azure OpenAI falso ouvindo em {servidor.endpoint}")
+        try:
+            servidor._thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Servidor local que imita a API Read do Azure Computer Vision (v3.2).
+
+Um PDF enviado gera uma linha "página N" por página. Qualquer outro corpo é
+tratado como texto puro: páginas separadas por form feed ("\\f") e linhas
+por quebra de linha. O parâmetro `pages` é respeitado. Cada página leva
+`atraso_por_pagina` segundos para ficar pronta, e as consultas anteriores a
+isso recebem "running" com o header Retry-After configurado.
+
+Uso:
+    python -m benchmarks.servidor_read_falso --porta 8765
+
+    # ou, em código:
+    with ServidorReadFalso(atraso_por_pagina=0.2) as servidor:
+        await ocr_async(conteudo, endpoint=servidor.endpoint, chave_api="x")
+"""
+
+import argparse
+import io
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from pypdf import PdfReader
+
+CAMINHO_ANALISE = "/vision/v3.2/read/analyze"
+CAMINHO_RESULTADOS = "/vision/v3.2/read/analyzeResults/"
+ALTURA_LINHA = 20
+ESPACAMENTO = 30
+
+
+def _extrair_texto(corpo):
+    if corpo.startswith(b"%PDF"):
+        total = len(PdfReader(io.BytesIO(corpo)).pages)
+        return "\f".join(f"página {numero}" for numero in range(1, total + 1))
+    return corpo.decode("utf-8", errors="replace")
+
+
+def _montar_resultados(texto, paginas=None):
+    read_results = []
+    for numero, pagina in enumerate(texto.split("\f"), 1):
+        if paginas and numero not in paginas:
+            continue
+        lines = []
+        for indice, conteudo in enumerate(pagina.splitlines()):
+            topo = indice * ESPACAMENTO
+            base = topo + ALTURA_LINHA
+            direita = 10 + 8 * len(conteudo)
+            lines.append(
+                {
+                    "boundingBox": [10, topo, direita, topo, direita, base, 10, base],
+                    "text": conteudo,
+                    "words": [],
+                }
+            )
+        read_results.append(
+            {
+                "page": numero,
+                "angle": 0,
+                "width": 612,
+                "height": 792,
+                "unit": "pixel",
+                "lines": lines,
+            }
+        )
+    return read_results
+
+
+class ServidorReadFalso:
+    """
+    Args:
+        porta: porta local (0 escolhe uma livre)
+        atraso_por_pagina: segundos até o resultado ficar pronto, por página
+        retry_after: valor do header Retry-After nas respostas pendentes
+        recusas_429: quantos envios iniciais devem ser recusados com 429
+    """
+
+    def __init__(self, porta=0, atraso_por_pagina=0.5, retry_after=None, recusas_429=0):
+        self.atraso_por_pagina = atraso_por_pagina
+        self.retry_after = retry_after
+        self.recusas_429 = recusas_429
+        self.envios = 0
+        self.consultas = 0
+        self._operacoes = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._servidor.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, status, corpo=None, headers=None):
+                dados = json.dumps(corpo).encode() if corpo is not None else b""
+                self.send_response(status)
+                for nome, valor in (headers or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_POST(self):
+                if not self.path.startswith(CAMINHO_ANALISE):
+                    return self._responder(404)
+                tamanho = int(self.headers.get("Content-Length", 0))
+                texto = _extrair_texto(self.rfile.read(tamanho))
+                filtro = parse_qs(urlparse(self.path).query).get("pages")
+                paginas = {int(n) for n in filtro[0].split(",")} if filtro else None
+                with servidor._lock:
+                    servidor.envios += 1
+                    if servidor.recusas_429 > 0:
+                        servidor.recusas_429 -= 1
+                        return self._responder(429, headers={"Retry-After": "1"})
+                    operacao_id = str(next(servidor._ids))
+                    resultados = _montar_resultados(texto, paginas)
+                    pronto_em = time.monotonic() + servidor.atraso_por_pagina * len(
+                        resultados
+                    )
+                    servidor._operacoes[operacao_id] = (pronto_em, resultados)
+                self._responder(
+                    202,
+                    headers={
+                        "Operation-Location": servidor.endpoint
+                        + CAMINHO_RESULTADOS
+                        + operacao_id
+                    },
+                )
+
+            def do_GET(self):
+                if not self.path.startswith(CAMINHO_RESULTADOS):
+                    return self._responder(404)
+                operacao_id = self.path[len(CAMINHO_RESULTADOS) :]
+                with servidor._lock:
+                    servidor.consultas += 1
+                    operacao = servidor._operacoes.get(operacao_id)
+                if operacao is None:
+                    return self._responder(404)
+                pronto_em, resultados = operacao
+                if time.monotonic() < pronto_em:
+                    headers = {}
+                    if servidor.retry_after is not None:
+                        headers["Retry-After"] = str(servidor.retry_after)
+                    return self._responder(200, {"status": "running"}, headers)
+                self._responder(
+                    200,
+                    {
+                        "status": "succeeded",
+                        "analyzeResult": {
+                            "version": "3.2.0",
+                            "modelVersion": "2022-04-30",
+                            "readResults": resultados,
+                        },
+                    },
+                )
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--atraso-por-pagina", type=float, default=0.5)
+    parser.add_argument("--retry-after", type=float, default=None)
+    args = parser.parse_args()
+
+    with ServidorReadFalso(
+        args.porta, args.atraso_por_pagina, args.retry_after
+    ) as servidor:
+        print(f"Read falso ouvindo em {servidor.endpoint}")
+        try:
+            servidor._thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
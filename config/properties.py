@@ -8,3 +8,102 @@ AZURE_COMPUTER_VISION_ENDPOINT = os.getenv("AZURE_COMPUTER_VISION_ENDPOINT")
 AZURE_COMPUTER_VISION_API_KEY = os.getenv("AZURE_COMPUTER_VISION_API_KEY")
 AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+OCR_CACHE_TAMANHO_MAXIMO_MB = float(os.getenv("OCR_CACHE_TAMANHO_MAXIMO_MB", "256"))
+OCR_CACHE_TTL_HORAS = float(os.getenv("OCR_CACHE_TTL_HORAS", "720"))
+
+OCR_PRAZO_SEGUNDOS = float(os.getenv("OCR_PRAZO_SEGUNDOS", "120"))
+OCR_INTERVALO_INICIAL_SEGUNDOS = float(
+    os.getenv("OCR_INTERVALO_INICIAL_SEGUNDOS", "0.25")
+)
+OCR_INTERVALO_MAXIMO_SEGUNDOS = float(os.getenv("OCR_INTERVALO_MAXIMO_SEGUNDOS", "2"))
+
+OCR_LOTE_CONCORRENCIA = int(os.getenv("OCR_LOTE_CONCORRENCIA", "4"))
+OCR_LOTE_ENVIOS_POR_SEGUNDO = float(os.getenv("OCR_LOTE_ENVIOS_POR_SEGUNDO", "10"))
+OCR_LOTE_MAX_TENTATIVAS = int(os.getenv("OCR_LOTE_MAX_TENTATIVAS", "5"))
+
+OCR_TEXTO_LOCAL_HABILITADO = (
+    os.getenv("OCR_TEXTO_LOCAL_HABILITADO", "true").lower() == "true"
+)
+OCR_TEXTO_LOCAL_MINIMO_CARACTERES = int(
+    os.getenv("OCR_TEXTO_LOCAL_MINIMO_CARACTERES", "20")
+)
+
+OCR_PARALELO_HABILITADO = os.getenv("OCR_PARALELO_HABILITADO", "true").lower() == "true"
+OCR_PARALELO_LIMIAR_PAGINAS = int(os.getenv("OCR_PARALELO_LIMIAR_PAGINAS", "4"))
+OCR_PARALELO_PAGINAS_POR_PARTE = int(os.getenv("OCR_PARALELO_PAGINAS_POR_PARTE", "2"))
+OCR_PARALELO_CONCORRENCIA = int(os.getenv("OCR_PARALELO_CONCORRENCIA", "8"))
+
+PERFIL_TIMEOUT_CURRICULO_SEGUNDOS = float(
+    os.getenv("PERFIL_TIMEOUT_CURRICULO_SEGUNDOS", "90")
+)
+PERFIL_TIMEOUT_LINKEDIN_SEGUNDOS = float(
+    os.getenv("PERFIL_TIMEOUT_LINKEDIN_SEGUNDOS", "30")
+)
+
+LINKEDIN_CACHE_TAMANHO_MAXIMO_MB = float(
+    os.getenv("LINKEDIN_CACHE_TAMANHO_MAXIMO_MB", "32")
+)
+LINKEDIN_CACHE_TTL_HORAS = float(os.getenv("LINKEDIN_CACHE_TTL_HORAS", "24"))
+LINKEDIN_CONEXOES_POR_HOST = int(os.getenv("LINKEDIN_CONEXOES_POR_HOST", "8"))
+
+SCRAPER_POOL_TAMANHO = int(os.getenv("SCRAPER_POOL_TAMANHO", "2"))
+SCRAPER_CONSULTAS_POR_DRIVER = int(os.getenv("SCRAPER_CONSULTAS_POR_DRIVER", "20"))
+SCRAPER_SLOW_MO = float(os.getenv("SCRAPER_SLOW_MO", "1.5"))
+SCRAPER_PAGE_LOAD_TIMEOUT = int(os.getenv("SCRAPER_PAGE_LOAD_TIMEOUT", "40"))
+
+VAGAS_FRESCOR_HORAS = float(os.getenv("VAGAS_FRESCOR_HORAS", "6"))
+# Vagas já armazenadas (coletadas pelo agendador ou por outras buscas) que
+# bastam para responder uma busca sem rodar os scrapers
+VAGAS_ARMAZENADAS_MINIMO = int(os.getenv("VAGAS_ARMAZENADAS_MINIMO", "5"))
+VAGAS_CACHE_TAMANHO_MAXIMO_MB = float(os.getenv("VAGAS_CACHE_TAMANHO_MAXIMO_MB", "16"))
+VAGAS_VARIANTES_PARALELAS = (
+    os.getenv("VAGAS_VARIANTES_PARALELAS", "true").lower() == "true"
+)
+# Quanto uma variante mais ampla que já achou vagas espera pelas mais específicas
+VAGAS_VARIANTES_PRAZO_SEGUNDOS = float(
+    os.getenv("VAGAS_VARIANTES_PRAZO_SEGUNDOS", "20")
+)
+
+VAGAS_COLETA_INTERVALO_MINUTOS = float(
+    os.getenv("VAGAS_COLETA_INTERVALO_MINUTOS", "180")
+)
+VAGAS_COLETA_JITTER_SEGUNDOS = float(os.getenv("VAGAS_COLETA_JITTER_SEGUNDOS", "30"))
+VAGAS_COLETA_CONCORRENCIA = int(os.getenv("VAGAS_COLETA_CONCORRENCIA", "2"))
+# Separadas por ";", já que costumam ter vírgula ("São Paulo, SP")
+VAGAS_COLETA_LOCALIZACOES = os.getenv("VAGAS_COLETA_LOCALIZACOES", "Brasília/DF")
+
+VAGAS_FONTES = os.getenv("VAGAS_FONTES", "linkedin,jobspy")
+JOBSPY_SITES = os.getenv("JOBSPY_SITES", "indeed,glassdoor")
+JOBSPY_PAIS = os.getenv("JOBSPY_PAIS", "Brazil")
+
+# "azure" usa o deployment de embeddings abaixo; "hash" gera vetores localmente,
+# sem rede, e é o padrão quando não há deployment configurado
+AZURE_OPENAI_EMBEDDING_DEPLOYMENT = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+INDICE_EMBEDDINGS = os.getenv(
+    "INDICE_EMBEDDINGS", "azure" if AZURE_OPENAI_EMBEDDING_DEPLOYMENT else "hash"
+)
+INDICE_HASH_DIMENSAO = int(os.getenv("INDICE_HASH_DIMENSAO", "512"))
+
+MATCH_PESO_PALAVRAS_CHAVE = float(os.getenv("MATCH_PESO_PALAVRAS_CHAVE", "0.3"))
+MATCH_PERFIS_POR_BLOCO = int(os.getenv("MATCH_PERFIS_POR_BLOCO", "256"))
+
+LLM_CACHE_TAMANHO_MAXIMO_MB = float(os.getenv("LLM_CACHE_TAMANHO_MAXIMO_MB", "64"))
+LLM_CACHE_TTL_HORAS = float(os.getenv("LLM_CACHE_TTL_HORAS", "720"))
+
+RELATORIOS_LOTE_CONCORRENCIA = int(os.getenv("RELATORIOS_LOTE_CONCORRENCIA", "3"))
+RELATORIOS_LOTE_ORCAMENTO_TOKENS = int(
+    os.getenv("RELATORIOS_LOTE_ORCAMENTO_TOKENS", "60000")
+)
+RELATORIOS_TOKENS_SAIDA_ESTIMADOS = int(
+    os.getenv("RELATORIOS_TOKENS_SAIDA_ESTIMADOS", "1500")
+)
+
+# Limites do deployment do LLM (0 desliga o limite correspondente)
+LLM_REQUISICOES_POR_MINUTO = int(os.getenv("LLM_REQUISICOES_POR_MINUTO", "300"))
+LLM_TOKENS_POR_MINUTO = int(os.getenv("LLM_TOKENS_POR_MINUTO", "50000"))
+LLM_TOKENS_SAIDA_ESTIMADOS = int(os.getenv("LLM_TOKENS_SAIDA_ESTIMADOS", "1000"))
+LLM_MAX_TENTATIVAS = int(os.getenv("LLM_MAX_TENTATIVAS", "5"))
+LLM_CONEXOES = int(os.getenv("LLM_CONEXOES", "20"))
+LLM_TIMEOUT_SEGUNDOS = float(os.getenv("LLM_TIMEOUT_SEGUNDOS", "120"))
@@ -0,0 +1,52 @@
+# Opções do formulário de cadastro ("Outro" é acrescentado pela interface)
+AREAS_INTERESSE = [
+    "Desenvolvimento de Software",
+    "Análise de Dados",
+    "Inteligência Artificial",
+    "Segurança da Informação",
+    "DevOps",
+    "UX/UI Design",
+    "Gestão de Projetos",
+    "QA/Testes",
+]
+
+SETORES_INTERESSE = [
+    "Finanças",
+    "Saúde",
+    "Educação",
+    "Varejo",
+    "E-commerce",
+    "Tecnologia",
+    "Indústria",
+    "Consultoria",
+    "Governo",
+]
+
+# Termos de busca de vagas usados para cada área pela coleta agendada
+TERMOS_BUSCA_POR_AREA = {
+    "Desenvolvimento de Software": ["desenvolvedor de software", "desenvolvedor"],
+    "Análise de Dados": ["analista de dados", "cientista de dados"],
+    "Inteligência Artificial": [
+        "engenheiro de machine learning",
+        "inteligência artificial",
+    ],
+    "Segurança da Informação": ["analista de segurança da informação"],
+    "DevOps": ["engenheiro devops", "engenheiro de cloud"],
+    "UX/UI Design": ["designer ux ui", "designer de produto"],
+    "Gestão de Projetos": ["gerente de projetos", "analista de projetos"],
+    "QA/Testes": ["analista de testes", "engenheiro de qa"],
+}
+
+# Palavras que indicam cada setor no texto de uma vaga (além do próprio nome),
+# usadas pela pontuação em lote
+PALAVRAS_CHAVE_POR_SETOR = {
+    "Finanças": ["financeiro", "banco", "bancário", "fintech", "investimentos"],
+    "Saúde": ["hospital", "clínica", "healthtech", "farmacêutica"],
+    "Educação": ["ensino", "escola", "universidade", "edtech"],
+    "Varejo": ["loja", "lojas", "retail"],
+    "E-commerce": ["ecommerce", "marketplace", "loja virtual"],
+    "Tecnologia": ["software", "tecnologia da informação", "saas"],
+    "Indústria": ["industrial", "fábrica", "manufatura"],
+    "Consultoria": ["consultor", "consultoria"],
+    "Governo": ["setor público", "órgão público", "governo federal"],
+}
@@ -3,9 +3,10 @@ Este arquivo contém funções auxiliares para corrigir o problema de geração
 de relatórios no aplicativo Streamlit.
 """
 
+import hashlib
 import streamlit as st
 import traceback
-from agents.relatorio import gerar_relatorio_preparacao_vaga
+from agents.relatorio import gerar_relatorio_preparacao_vaga_em_fluxo
 
 
 def gerar_e_exibir_relatorio(vaga, perfil_candidato, indice):
@@ -29,30 +30,35 @@ def gerar_e_exibir_relatorio(vaga, perfil_candidato, indice):
             return False
 
         # Identificador único para esta vaga
-        vaga_hash = abs(hash(vaga)) % 100000
+        vaga_hash = hashlib.sha1(vaga.encode("utf-8")).hexdigest()[:10]
         vaga_key = f"vaga_{indice}_{vaga_hash}"
 
         # Verificar se já temos um relatório em cache
         if "relatorio_cache" not in st.session_state:
             st.session_state.relatorio_cache = {}
 
-        if vaga_key in st.session_state.relatorio_cache:
+        relatorio_em_cache = vaga_key in st.session_state.relatorio_cache
+        if relatorio_em_cache:
             relatorio = st.session_state.relatorio_cache[vaga_key]
             st.info("Usando relatório em cache")
         else:
-            # Gerar um novo relatório
-            with st.spinner("Gerando relatório personalizado..."):
-                relatorio = gerar_relatorio_preparacao_vaga(
+            # Gerar um novo relatório, exibido conforme o modelo gera
+            st.markdown("### 📁 Relatório de Preparação")
+            relatorio = st.write_stream(
+                gerar_relatorio_preparacao_vaga_em_fluxo(
                     descricao_vaga=vaga,
                     perfil_candidato=perfil_candidato,
                 )
-                # Salvar no cache
-                st.session_state.relatorio_cache[vaga_key] = relatorio
+            )
+            # Salvar no cache
+            st.session_state.relatorio_cache[vaga_key] = relatorio
+            st.success("✅ Relatório gerado com sucesso!")
 
-        # Exibir o relatório
-        st.success("✅ Relatório gerado com sucesso!")
-        st.markdown("### 📁 Relatório de Preparação")
-        st.markdown(relatorio)
+        if relatorio_em_cache:
+            # Exibir o relatório
+            st.success("✅ Relatório gerado com sucesso!")
+            st.markdown("### 📁 Relatório de Preparação")
+            st.markdown(relatorio)
 
         # Botão para download do relatório
         relatorio_bytes = relatorio.encode("utf-8")
@@ -0,0 +1,38 @@
+import io
+
+from pypdf import PdfReader, PdfWriter
+
+
+def contar_paginas(conteudo_pdf: bytes) -> int:
+    """Retorna o número de páginas do PDF ou 0 se ele não puder ser lido."""
+    try:
+        return len(PdfReader(io.BytesIO(conteudo_pdf)).pages)
+    except Exception:
+        return 0
+
+
+def dividir_pdf(
+    conteudo_pdf: bytes, paginas: list[int], paginas_por_parte: int
+) -> list[tuple[list[int], bytes]]:
+    """
+    Separa as páginas indicadas em PDFs menores.
+
+    Args:
+        conteudo_pdf: bytes do PDF original
+        paginas: números das páginas (a partir de 1) a incluir, em ordem
+        paginas_por_parte: máximo de páginas em cada parte
+
+    Returns:
+        Lista de (números das páginas originais, bytes do PDF da parte)
+    """
+    leitor = PdfReader(io.BytesIO(conteudo_pdf))
+    partes = []
+    for inicio in range(0, len(paginas), paginas_por_parte):
+        numeros = paginas[inicio : inicio + paginas_por_parte]
+        escritor = PdfWriter()
+        for numero in numeros:
+            escritor.add_page(leitor.pages[numero - 1])
+        saida = io.BytesIO()
+        escritor.write(saida)
+        partes.append((numeros, saida.getvalue()))
+    return partes
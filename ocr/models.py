@@ -6,3 +6,14 @@ class OCRDocumentoFalhaException(Exception):
 class OCRDocumentoFalhaAzureException(Exception):
     def __init__(self, mensagem: str):
         self.mensagem = mensagem
+
+
+class OCRTempoEsgotadoAzureException(Exception):
+    def __init__(self, mensagem: str):
+        self.mensagem = mensagem
+
+
+class OCRLimiteRequisicoesAzureException(Exception):
+    def __init__(self, mensagem: str, retry_after: float = None):
+        self.mensagem = mensagem
+        self.retry_after = retry_after
@@ -0,0 +1,105 @@
+import io
+
+from azure.cognitiveservices.vision.computervision.models import Line
+from pypdf import PdfReader
+
+PROPORCAO_LARGURA_CARACTERE = 0.5
+# Em alturas de fonte: diferença de linha de base aceita para trechos da
+# mesma linha, e distância até a qual trechos sem espaço formam uma palavra
+TOLERANCIA_BASE = 0.1
+TOLERANCIA_COLAGEM = 0.25
+
+
+def extrair_lines_locais(conteudo_pdf: bytes) -> list[list[Line]]:
+    """
+    Lê a camada de texto do PDF, sem OCR, mantendo a posição de cada trecho.
+
+    Args:
+        conteudo_pdf: bytes do PDF
+
+    Returns:
+        Uma lista de `Line` por página, no mesmo formato do Azure Read
+        (bounding_box com 8 valores, de cima para baixo). Retorna lista
+        vazia se o PDF não puder ser lido.
+    """
+    try:
+        leitor = PdfReader(io.BytesIO(conteudo_pdf))
+        return [_extrair_lines_da_pagina(pagina) for pagina in leitor.pages]
+    except Exception as e:
+        print(f"Não foi possível ler a camada de texto do PDF: {e}")
+        return []
+
+
+def _extrair_lines_da_pagina(pagina) -> list[Line]:
+    # Coordenadas relativas ao canto superior esquerdo da mediabox, que nem
+    # sempre começa em (0, 0)
+    esquerda_pagina = float(pagina.mediabox.left)
+    topo_pagina = float(pagina.mediabox.top)
+    trechos = []
+
+    def visitor_text(texto, cm, tm, font_dict, font_size):
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4] - esquerda_pagina
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        altura = abs(font_size * tm[3] * cm[3]) or font_size or 1
+        # Trechos com quebra de linha descem uma altura de fonte por linha
+        for indice, bruto in enumerate(texto.split("\n")):
+            trecho = bruto.strip()
+            if not trecho:
+                continue
+            base = topo_pagina - y + indice * altura
+            largura = len(trecho) * altura * PROPORCAO_LARGURA_CARACTERE
+            anterior = trechos[-1] if trechos else None
+            if indice == 0 and anterior and _continua(anterior, x, base, altura):
+                # O mesmo texto dividido em vários comandos do PDF ("Enge" +
+                # "nharia"): sem espaço no texto nem distância entre eles, é
+                # a mesma palavra
+                colado = (
+                    not anterior["termina_com_espaco"]
+                    and bruto[:1] not in (" ", "\t")
+                    and x - anterior["direita"] <= altura * TOLERANCIA_COLAGEM
+                )
+                anterior["texto"] += trecho if colado else " " + trecho
+                anterior["direita"] = max(anterior["direita"], x + largura)
+            else:
+                trechos.append(
+                    {
+                        "x": x,
+                        "base": base,
+                        "altura": altura,
+                        "texto": trecho,
+                        "direita": x + largura,
+                    }
+                )
+            trechos[-1]["termina_com_espaco"] = bruto[-1:] in (" ", "\t")
+
+    pagina.extract_text(visitor_text=visitor_text)
+    return [
+        Line(
+            bounding_box=[
+                t["x"],
+                t["base"] - t["altura"],
+                t["direita"],
+                t["base"] - t["altura"],
+                t["direita"],
+                t["base"],
+                t["x"],
+                t["base"],
+            ],
+            text=t["texto"],
+            words=[],
+        )
+        for t in trechos
+    ]
+
+
+def _continua(anterior, x, base, altura):
+    """O trecho começa na mesma linha de base, logo depois do anterior."""
+    return (
+        abs(base - anterior["base"]) <= altura * TOLERANCIA_BASE
+        and anterior["x"] <= x <= anterior["direita"] + altura
+    )
+
+
+def tem_texto_utilizavel(lines: list[Line], minimo_caracteres: int) -> bool:
+    caracteres = sum(len(line.text.replace(" ", "")) for line in lines)
+    return caracteres >= minimo_caracteres
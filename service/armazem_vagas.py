@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ArmazemVagas:
+    """
+    Armazena em SQLite as vagas encontradas pelas buscas.
+
+    Cada vaga é identificada pelo job_id do LinkedIn (ou pelo link, quando
+    não há job_id) e guarda o registro completo, com a descrição inteira, e
+    quando foi vista pela primeira e pela última vez. As buscas guardam a
+    lista de vagas que retornaram, para serem respondidas daqui enquanto
+    estiverem recentes.
+
+    Args:
+        caminho: arquivo SQLite do armazém
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS vagas (
+                    chave TEXT PRIMARY KEY,
+                    dados TEXT NOT NULL,
+                    primeira_vez REAL NOT NULL,
+                    ultima_vez REAL NOT NULL
+                )
+                """)
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS consultas (
+                    chave TEXT PRIMARY KEY,
+                    vagas TEXT NOT NULL,
+                    atualizada_em REAL NOT NULL
+                )
+                """)
+
+    @contextmanager
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    @staticmethod
+    def chave_vaga(vaga: dict) -> Optional[str]:
+        return vaga.get("job_id") or vaga.get("link") or None
+
+    def gravar_vagas(self, vagas: list[dict]) -> list[str]:
+        """
+        Insere ou atualiza as vagas, preservando quando cada uma foi vista
+        pela primeira vez.
+
+        Returns:
+            Chaves das vagas gravadas, na ordem recebida e sem repetições
+        """
+        agora = time.time()
+        registros = {}
+        for vaga in vagas:
+            chave = self.chave_vaga(vaga)
+            if chave:
+                registros[chave] = json.dumps(vaga, ensure_ascii=False)
+        with self._conectar() as conexao:
+            conexao.executemany(
+                """
+                INSERT INTO vagas (chave, dados, primeira_vez, ultima_vez)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (chave) DO UPDATE SET
+                    dados = excluded.dados,
+                    ultima_vez = excluded.ultima_vez
+                """,
+                [(chave, dados, agora, agora) for chave, dados in registros.items()],
+            )
+        return list(registros)
+
+    def obter_vagas(self, chaves: list[str]) -> list[dict]:
+        """Retorna as vagas na ordem das chaves, com primeira_vez e ultima_vez."""
+        if not chaves:
+            return []
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT chave, dados, primeira_vez, ultima_vez FROM vagas "
+                f"WHERE chave IN ({','.join('?' * len(chaves))})",
+                chaves,
+            ).fetchall()
+        por_chave = {
+            chave: {
+                **json.loads(dados),
+                "primeira_vez": primeira_vez,
+                "ultima_vez": ultima_vez,
+            }
+            for chave, dados, primeira_vez, ultima_vez in linhas
+        }
+        return [por_chave[chave] for chave in chaves if chave in por_chave]
+
+    def iterar_vagas(self, lote: int = 1000) -> Iterator[tuple[str, dict]]:
+        """Percorre (chave, registro) de todas as vagas, lendo `lote` por vez."""
+        ultima = ""
+        while True:
+            with self._conectar() as conexao:
+                linhas = conexao.execute(
+                    "SELECT chave, dados FROM vagas WHERE chave > ? "
+                    "ORDER BY chave LIMIT ?",
+                    (ultima, lote),
+                ).fetchall()
+            if not linhas:
+                return
+            for chave, dados in linhas:
+                yield chave, json.loads(dados)
+            ultima = linhas[-1][0]
+
+    def obter_consulta(self, chave: str) -> Optional[tuple[list[str], float]]:
+        """Retorna (chaves das vagas, idade em segundos) da última execução da busca."""
+        with self._conectar() as conexao:
+            linha = conexao.execute(
+                "SELECT vagas, atualizada_em FROM consultas WHERE chave = ?",
+                (chave,),
+            ).fetchone()
+        if linha is None:
+            return None
+        return json.loads(linha[0]), time.time() - linha[1]
+
+    def gravar_consulta(self, chave: str, chaves_vagas: list[str]):
+        with self._conectar() as conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO consultas (chave, vagas, atualizada_em) "
+                "VALUES (?, ?, ?)",
+                (chave, json.dumps(chaves_vagas), time.time()),
+            )
+
+    def estatisticas(self) -> dict:
+        with self._conectar() as conexao:
+            vagas = conexao.execute("SELECT COUNT(*) FROM vagas").fetchone()[0]
+            consultas = conexao.execute("SELECT COUNT(*) FROM consultas").fetchone()[0]
+        return {"vagas": vagas, "consultas": consultas}
@@ -1,15 +1,421 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
 from llama_index.llms.azure_openai import AzureOpenAI
+
 from config.properties import (
     AZURE_OPENAI_API_KEY,
     AZURE_OPENAI_ENDPOINT,
+    LLM_CONEXOES,
     LLM_DEPLOYMENT_NAME,
+    LLM_MAX_TENTATIVAS,
+    LLM_REQUISICOES_POR_MINUTO,
+    LLM_TIMEOUT_SEGUNDOS,
+    LLM_TOKENS_POR_MINUTO,
+    LLM_TOKENS_SAIDA_ESTIMADOS,
 )
+from service.metricas import incrementar
 
+# Também fazem parte da chave do cache de respostas (service/cache_llm.py)
+LLM_MODELO = "gpt-4.1"
+LLM_API_VERSION = "2024-02-01"
+# Mesma temperatura padrão do AzureOpenAI do llama_index
+LLM_TEMPERATURA = 0.1
 
+BACKOFF_BASE_SEGUNDOS = 1.0
+BACKOFF_MAXIMO_SEGUNDOS = 30.0
+STATUS_REPETIVEIS = {408, 429, 500, 502, 503, 504}
+
+# Usado pelos agentes do llama_index (ReActAgent); as chamadas diretas de
+# completar passam por `gateway_llm`. Este cliente não passa pelo
+# LimitadorLLM (ver a classe)
 llm = AzureOpenAI(
-    api_version="2024-02-01",
-    model="gpt-4.1",
+    api_version=LLM_API_VERSION,
+    model=LLM_MODELO,
     engine=LLM_DEPLOYMENT_NAME,
     api_key=AZURE_OPENAI_API_KEY,
     azure_endpoint=AZURE_OPENAI_ENDPOINT,
 )
+
+
+class LLMFalhaException(Exception):
+    def __init__(self, mensagem: str):
+        self.mensagem = mensagem
+
+
+class LLMLimiteRequisicoesException(Exception):
+    def __init__(self, mensagem: str, retry_after: float = None):
+        self.mensagem = mensagem
+        self.retry_after = retry_after
+
+
+def estimar_tokens(texto: str) -> int:
+    """Aproximação de ~4 caracteres por token, suficiente para os limites."""
+    return len(texto) // 4 + 1
+
+
+class _Balde:
+    """
+    Balde de fichas reabastecido continuamente até `por_minuto`. O nível pode
+    ficar negativo (pedido maior que o balde, ou consumo real acima do
+    estimado); os pedidos seguintes esperam a dívida ser paga.
+    """
+
+    def __init__(self, por_minuto: float):
+        self.capacidade = por_minuto
+        self.taxa = por_minuto / 60
+        self._nivel = float(por_minuto)
+        self._atualizado = time.monotonic()
+
+    def _reabastecer(self):
+        agora = time.monotonic()
+        self._nivel = min(
+            self.capacidade, self._nivel + (agora - self._atualizado) * self.taxa
+        )
+        self._atualizado = agora
+
+    def espera(self, quantidade: float) -> float:
+        """Segundos até haver `quantidade` fichas (limitada ao tamanho do balde)."""
+        if self.capacidade <= 0:
+            return 0.0
+        self._reabastecer()
+        falta = min(quantidade, self.capacidade) - self._nivel
+        return max(falta, 0) / self.taxa
+
+    def retirar(self, quantidade: float):
+        if self.capacidade > 0:
+            self._reabastecer()
+            self._nivel -= quantidade
+
+    def devolver(self, quantidade: float):
+        """Devolve fichas não usadas; uma quantidade negativa cobra o excedente."""
+        self.retirar(-quantidade)
+        self._nivel = min(self._nivel, self.capacidade)
+
+
+class LimitadorLLM:
+    """
+    Limita requisições e tokens por minuto, como as cotas de um deployment
+    do Azure OpenAI. Os pedidos são atendidos em ordem de chegada, para que
+    um prompt grande não fique esperando atrás de vários pequenos.
+
+    Um 429 pausa todos os pedidos pelo tempo indicado no Retry-After.
+
+    Só vale para o `GatewayLLM`: o `llm` do llama_index usado pelo ReActAgent
+    chama o Azure pelo SDK da OpenAI, com seus próprios retries, e não entra
+    nestes baldes. As buscas do agente dividem a cota do deployment sem
+    serem contadas aqui; os limites devem deixar folga para elas.
+    """
+
+    def __init__(self, requisicoes_por_minuto: float, tokens_por_minuto: float):
+        self.requisicoes = _Balde(requisicoes_por_minuto)
+        self.tokens = _Balde(tokens_por_minuto)
+        self._pausado_ate = 0.0
+        self._lock = asyncio.Lock()
+        self._devolucao = asyncio.Event()
+
+    async def aguardar(self, tokens: int):
+        async with self._lock:
+            while True:
+                espera = max(
+                    self._pausado_ate - time.monotonic(),
+                    self.requisicoes.espera(1),
+                    self.tokens.espera(tokens),
+                )
+                if espera <= 0:
+                    break
+                # Tokens devolvidos por uma resposta podem encurtar a espera
+                self._devolucao.clear()
+                try:
+                    await asyncio.wait_for(self._devolucao.wait(), espera)
+                except asyncio.TimeoutError:
+                    pass
+            self.requisicoes.retirar(1)
+            self.tokens.retirar(tokens)
+
+    def devolver_tokens(self, quantidade: float):
+        """Devolve a parte não usada de uma reserva (negativa cobra o excedente)."""
+        self.tokens.devolver(quantidade)
+        self._devolucao.set()
+
+    def pausar(self, segundos: float):
+        self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+
+class GatewayLLM:
+    """
+    Cliente compartilhado para o endpoint de chat completions do Azure OpenAI.
+
+    Todas as chamadas, síncronas ou assíncronas e de qualquer thread, rodam
+    no mesmo event loop em segundo plano, e por isso dividem:
+
+    - um pool de conexões HTTP (`httpx.AsyncClient`);
+    - o `LimitadorLLM` de requisições e tokens por minuto;
+    - as requisições em andamento: prompts idênticos (mesmo corpo) feitos
+      ao mesmo tempo esperam a mesma resposta em vez de irem duas vezes ao
+      Azure. Fluxos não são agrupados.
+
+    Falhas temporárias (429, 5xx, erros de rede) são repetidas até
+    `max_tentativas`, esperando o Retry-After informado ou um backoff
+    exponencial, ambos com jitter.
+
+    Args:
+        endpoint: URL do recurso do Azure OpenAI
+        chave_api: chave do recurso
+        deployment: nome do deployment do modelo
+        api_version: versão da API REST
+        requisicoes_por_minuto: limite de requisições (0 desliga)
+        tokens_por_minuto: limite de tokens de entrada + saída (0 desliga)
+        max_tentativas: tentativas por chamada, incluindo a primeira (pelo
+            menos 1)
+        conexoes: máximo de conexões HTTP abertas
+        timeout_segundos: timeout de cada tentativa
+    """
+
+    def __init__(
+        self,
+        endpoint: str = AZURE_OPENAI_ENDPOINT,
+        chave_api: str = AZURE_OPENAI_API_KEY,
+        deployment: str = LLM_DEPLOYMENT_NAME,
+        api_version: str = LLM_API_VERSION,
+        requisicoes_por_minuto: float = LLM_REQUISICOES_POR_MINUTO,
+        tokens_por_minuto: float = LLM_TOKENS_POR_MINUTO,
+        max_tentativas: int = LLM_MAX_TENTATIVAS,
+        conexoes: int = LLM_CONEXOES,
+        timeout_segundos: float = LLM_TIMEOUT_SEGUNDOS,
+    ):
+        if max_tentativas < 1:
+            raise ValueError("max_tentativas deve ser pelo menos 1")
+        self.endpoint = endpoint
+        self.chave_api = chave_api
+        self.deployment = deployment
+        self.api_version = api_version
+        self.max_tentativas = max_tentativas
+        self.conexoes = conexoes
+        self.timeout_segundos = timeout_segundos
+        self.limitador = LimitadorLLM(requisicoes_por_minuto, tokens_por_minuto)
+        self._em_andamento: dict[str, asyncio.Future] = {}
+        self._cliente: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def completar(self, prompt: str, **opcoes) -> str:
+        """Texto da resposta ao `prompt` (mensagem única do usuário)."""
+        return self._executar(self._completar_agrupado(self._corpo(prompt, opcoes)))
+
+    async def completar_async(self, prompt: str, **opcoes) -> str:
+        return await self._aguardar(
+            self._completar_agrupado(self._corpo(prompt, opcoes))
+        )
+
+    def completar_em_fluxo(self, prompt: str, **opcoes) -> Iterator[str]:
+        """Pedaços do texto conforme o modelo gera; fechar o iterador cancela."""
+        fluxo = self._fluxo(self._corpo(prompt, opcoes, fluxo=True))
+        try:
+            while (pedaco := self._executar(_proximo(fluxo))) is not None:
+                yield pedaco
+        finally:
+            self._executar(_fechar(fluxo))
+
+    async def completar_em_fluxo_async(
+        self, prompt: str, **opcoes
+    ) -> AsyncIterator[str]:
+        fluxo = self._fluxo(self._corpo(prompt, opcoes, fluxo=True))
+        try:
+            while (pedaco := await self._aguardar(_proximo(fluxo))) is not None:
+                yield pedaco
+        finally:
+            await self._aguardar(_fechar(fluxo))
+
+    def fechar(self):
+        """Fecha as conexões e encerra o event loop em segundo plano."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._cliente is not None:
+            asyncio.run_coroutine_threadsafe(self._cliente.aclose(), loop).result()
+            self._cliente = None
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _loop_em_execucao(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="gateway-llm", daemon=True
+                ).start()
+            return self._loop
+
+    def _executar(self, corrotina):
+        return asyncio.run_coroutine_threadsafe(
+            corrotina, self._loop_em_execucao()
+        ).result()
+
+    async def _aguardar(self, corrotina):
+        loop = self._loop_em_execucao()
+        if asyncio.get_running_loop() is loop:
+            return await corrotina
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(corrotina, loop)
+        )
+
+    def _corpo(self, prompt, opcoes, fluxo=False):
+        corpo = {
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": opcoes.get("temperatura", LLM_TEMPERATURA),
+        }
+        if opcoes.get("max_tokens"):
+            corpo["max_tokens"] = opcoes["max_tokens"]
+        if fluxo:
+            corpo["stream"] = True
+        return corpo
+
+    def _reserva(self, corpo):
+        saida = corpo.get("max_tokens") or LLM_TOKENS_SAIDA_ESTIMADOS
+        return estimar_tokens(corpo["messages"][-1]["content"]) + saida
+
+    async def _completar_agrupado(self, corpo):
+        chave = hashlib.sha256(
+            json.dumps(corpo, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(self._completar(corpo))
+            self._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self._em_andamento.pop(chave, None))
+        else:
+            incrementar("llm_requisicoes", resultado="agrupada")
+        # shield: um chamador cancelado não cancela a resposta dos demais
+        return await asyncio.shield(tarefa)
+
+    async def _completar(self, corpo):
+        reserva = self._reserva(corpo)
+        resposta = await self._enviar(corpo, reserva)
+        dados = resposta.json()
+        usados = (dados.get("usage") or {}).get("total_tokens")
+        if usados:
+            self.limitador.devolver_tokens(reserva - usados)
+        escolhas = dados.get("choices") or [{}]
+        return (escolhas[0].get("message") or {}).get("content") or ""
+
+    async def _fluxo(self, corpo):
+        reserva = self._reserva(corpo)
+        resposta = await self._enviar(corpo, reserva, fluxo=True)
+        pedacos = []
+        try:
+            async for linha in resposta.aiter_lines():
+                if not linha.startswith("data:"):
+                    continue
+                dados = linha[len("data:") :].strip()
+                if dados == "[DONE]":
+                    break
+                # O primeiro evento do Azure traz só os filtros de conteúdo
+                for escolha in json.loads(dados).get("choices") or []:
+                    pedaco = (escolha.get("delta") or {}).get("content")
+                    if pedaco:
+                        pedacos.append(pedaco)
+                        yield pedaco
+        finally:
+            await resposta.aclose()
+            usados = estimar_tokens(corpo["messages"][-1]["content"]) + (
+                estimar_tokens("".join(pedacos))
+            )
+            self.limitador.devolver_tokens(reserva - usados)
+
+    async def _enviar(self, corpo, reserva, fluxo=False) -> httpx.Response:
+        if self._cliente is None:
+            self._cliente = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.conexoes,
+                    max_keepalive_connections=self.conexoes,
+                ),
+                timeout=self.timeout_segundos,
+            )
+        url = (
+            f"{self.endpoint.rstrip('/')}/openai/deployments/{self.deployment}"
+            f"/chat/completions"
+        )
+        requisicao = self._cliente.build_request(
+            "POST",
+            url,
+            params={"api-version": self.api_version},
+            headers={"api-key": self.chave_api or ""},
+            json=corpo,
+        )
+
+        for tentativa in range(1, self.max_tentativas + 1):
+            await self.limitador.aguardar(reserva)
+            retry_after = None
+            try:
+                resposta = await self._cliente.send(requisicao, stream=fluxo)
+            except httpx.TransportError as e:
+                erro = LLMFalhaException(f"Erro de rede ao chamar o LLM: {e!r}")
+            else:
+                if resposta.status_code == 200:
+                    incrementar("llm_requisicoes", resultado="ok")
+                    return resposta
+                await resposta.aread()
+                await resposta.aclose()
+                if resposta.status_code not in STATUS_REPETIVEIS:
+                    incrementar("llm_requisicoes", resultado="erro")
+                    raise LLMFalhaException(
+                        f"Erro ao chamar o LLM: {resposta.status_code} "
+                        f"{resposta.text[:500]}"
+                    )
+                retry_after = _obter_retry_after(resposta.headers)
+                if resposta.status_code == 429:
+                    erro = LLMLimiteRequisicoesException(
+                        "Limite de requisições do Azure OpenAI atingido", retry_after
+                    )
+                else:
+                    erro = LLMFalhaException(
+                        f"Erro temporário do LLM: {resposta.status_code}"
+                    )
+
+            # A tentativa recusada não consumiu tokens da cota
+            self.limitador.devolver_tokens(reserva)
+            if tentativa == self.max_tentativas:
+                incrementar("llm_requisicoes", resultado="erro")
+                raise erro
+            incrementar("llm_requisicoes", resultado="repetida")
+            espera = retry_after or min(
+                BACKOFF_BASE_SEGUNDOS * 2 ** (tentativa - 1), BACKOFF_MAXIMO_SEGUNDOS
+            )
+            espera += random.uniform(0, espera / 2)
+            if isinstance(erro, LLMLimiteRequisicoesException):
+                self.limitador.pausar(espera)
+            await asyncio.sleep(espera)
+
+
+async def _proximo(fluxo):
+    # O fluxo é consumido no loop do gateway, que só aceita corrotinas
+    try:
+        return await fluxo.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _fechar(fluxo):
+    await fluxo.aclose()
+
+
+def _obter_retry_after(headers):
+    # O Azure OpenAI envia retry-after-ms além do Retry-After em segundos
+    try:
+        return max(float(headers["retry-after-ms"]) / 1000, 0)
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return max(float(headers["Retry-After"]), 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+gateway_llm = GatewayLLM()
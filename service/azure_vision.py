@@ -1,32 +1,79 @@
+import asyncio
+import hashlib
 import io
+import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
 
 from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-from azure.cognitiveservices.vision.computervision.models import Line
 from azure.cognitiveservices.vision.computervision.models import (
     OperationStatusCodes,
     ReadOperationResult,
 )
 from msrest.authentication import CognitiveServicesCredentials
-from pydantic import BaseModel, ConfigDict
 
 from config.properties import (
     AZURE_COMPUTER_VISION_API_KEY,
     AZURE_COMPUTER_VISION_ENDPOINT,
+    CACHE_DIR,
+    OCR_CACHE_TAMANHO_MAXIMO_MB,
+    OCR_CACHE_TTL_HORAS,
+    OCR_INTERVALO_INICIAL_SEGUNDOS,
+    OCR_INTERVALO_MAXIMO_SEGUNDOS,
+    OCR_PARALELO_CONCORRENCIA,
+    OCR_PARALELO_HABILITADO,
+    OCR_PARALELO_LIMIAR_PAGINAS,
+    OCR_PARALELO_PAGINAS_POR_PARTE,
+    OCR_PRAZO_SEGUNDOS,
+    OCR_TEXTO_LOCAL_HABILITADO,
+    OCR_TEXTO_LOCAL_MINIMO_CARACTERES,
+)
+from ocr.models import (
+    OCRDocumentoFalhaAzureException,
+    OCRLimiteRequisicoesAzureException,
+    OCRTempoEsgotadoAzureException,
 )
-from ocr.models import OCRDocumentoFalhaAzureException
+from ocr.divisao import contar_paginas, dividir_pdf
+from ocr.texto_local import extrair_lines_locais, tem_texto_utilizavel
+from service.cache import CacheDisco
+from service.metricas import incrementar
+
+TOLERANCIA_VERTICAL_PADRAO = 1 / 3
+IDIOMA_PADRAO = "pt"
+
+BACKOFF_BASE_SEGUNDOS = 1.0
+BACKOFF_MAXIMO_SEGUNDOS = 60.0
 
 azure_vision_client = ComputerVisionClient(
     AZURE_COMPUTER_VISION_ENDPOINT,
     CognitiveServicesCredentials(AZURE_COMPUTER_VISION_API_KEY),
 )
 
+cache_ocr = CacheDisco(
+    os.path.join(CACHE_DIR, "ocr.sqlite3"),
+    tamanho_maximo_bytes=int(OCR_CACHE_TAMANHO_MAXIMO_MB * 1024**2),
+    ttl_segundos=OCR_CACHE_TTL_HORAS * 3600,
+)
 
-def ocr(content: bytes) -> tuple[ReadOperationResult, list[str]]:
+
+def ocr(
+    content: bytes,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+    paginas: list[int] = None,
+) -> tuple[ReadOperationResult, list[str]]:
     content_ = io.BytesIO(content)
 
     read_response = azure_vision_client.read_in_stream(
-        content_, raw=True, language="pt"
+        content_,
+        raw=True,
+        language=idioma,
+        pages=[str(pagina) for pagina in paginas] if paginas else None,
     )
     read_operation_location = read_response.headers["Operation-Location"]
     operation_id = read_operation_location.split("/")[-1]
@@ -44,37 +91,488 @@ def ocr(content: bytes) -> tuple[ReadOperationResult, list[str]]:
             f"Erro ao realizar OCR: {read_result.status}"
         )
 
-    textos_das_paginas = _obter_paginas_do_resultado(read_result)
+    textos_das_paginas = _obter_paginas_do_resultado(read_result, tolerancia_vertical)
+
+    return read_result, textos_das_paginas
+
+
+async def ocr_async(
+    content: bytes,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+    paginas: list[int] = None,
+    cliente_http: httpx.AsyncClient = None,
+    endpoint: str = None,
+    chave_api: str = None,
+    prazo_segundos: float = OCR_PRAZO_SEGUNDOS,
+) -> tuple[ReadOperationResult, list[str]]:
+    """
+    Versão assíncrona de `ocr` que conversa direto com a API REST do Read.
+
+    A consulta do resultado respeita o header Retry-After e, na falta dele,
+    começa com um intervalo curto que dobra a cada tentativa. Várias
+    chamadas podem aguardar em paralelo no mesmo event loop; para isso,
+    compartilhe um `cliente_http` entre elas.
+
+    Raises:
+        OCRLimiteRequisicoesAzureException: o envio foi recusado com 429
+        OCRTempoEsgotadoAzureException: o prazo total foi excedido
+        OCRDocumentoFalhaAzureException: a operação terminou sem sucesso
+    """
+    endpoint = (endpoint or AZURE_COMPUTER_VISION_ENDPOINT).rstrip("/")
+    headers = {"Ocp-Apim-Subscription-Key": chave_api or AZURE_COMPUTER_VISION_API_KEY}
+    loop = asyncio.get_running_loop()
+    prazo = loop.time() + prazo_segundos
+
+    def restante():
+        segundos = prazo - loop.time()
+        if segundos <= 0:
+            raise OCRTempoEsgotadoAzureException(
+                f"OCR não concluído em {prazo_segundos} segundos"
+            )
+        return segundos
+
+    params = {"language": idioma}
+    if paginas:
+        params["pages"] = ",".join(str(pagina) for pagina in paginas)
+
+    cliente = cliente_http or httpx.AsyncClient()
+    try:
+        resposta = await cliente.post(
+            f"{endpoint}/vision/v3.2/read/analyze",
+            params=params,
+            headers={**headers, "Content-Type": "application/octet-stream"},
+            content=content,
+            timeout=restante(),
+        )
+        if resposta.status_code == 429:
+            raise OCRLimiteRequisicoesAzureException(
+                "Limite de requisições do Azure atingido",
+                _obter_retry_after(resposta.headers),
+            )
+        if resposta.status_code != 202:
+            raise OCRDocumentoFalhaAzureException(
+                f"Erro ao enviar documento para OCR: {resposta.status_code}"
+            )
+        read_operation_location = resposta.headers["Operation-Location"]
+
+        intervalo = OCR_INTERVALO_INICIAL_SEGUNDOS
+        espera = _obter_retry_after(resposta.headers) or intervalo
+        while True:
+            await asyncio.sleep(min(espera, restante()))
+            resposta = await cliente.get(
+                read_operation_location, headers=headers, timeout=restante()
+            )
+            intervalo = min(intervalo * 2, OCR_INTERVALO_MAXIMO_SEGUNDOS)
+            espera = _obter_retry_after(resposta.headers) or intervalo
+            if resposta.status_code == 429:
+                continue
+            if resposta.status_code != 200:
+                raise OCRDocumentoFalhaAzureException(
+                    f"Erro ao consultar resultado do OCR: {resposta.status_code}"
+                )
+            resultado_json = resposta.json()
+            if resultado_json.get("status") not in ["notStarted", "running"]:
+                break
+    except httpx.TimeoutException:
+        raise OCRTempoEsgotadoAzureException(
+            f"OCR não concluído em {prazo_segundos} segundos"
+        )
+    finally:
+        if cliente_http is None:
+            await cliente.aclose()
+
+    read_result = ReadOperationResult.deserialize(resultado_json)
+    if read_result.status != OperationStatusCodes.succeeded:
+        raise OCRDocumentoFalhaAzureException(
+            f"Erro ao realizar OCR: {read_result.status}"
+        )
+
+    textos_das_paginas = _obter_paginas_do_resultado(read_result, tolerancia_vertical)
 
     return read_result, textos_das_paginas
 
 
-def extrair_texto_pdf(conteudo_pdf):
-    _, paginas = ocr(conteudo_pdf)
+def _obter_retry_after(headers):
+    try:
+        return max(float(headers["Retry-After"]), 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def _ocr_async_repetindo(
+    content,
+    tolerancia_vertical,
+    idioma,
+    paginas=None,
+    cliente_http=None,
+    antes_de_enviar=None,
+    max_tentativas=1,
+):
+    """
+    `ocr_async` que aguarda `antes_de_enviar` a cada envio ao Azure e repete
+    só este envio quando ele é recusado com 429.
+    """
+    for tentativa in range(1, max_tentativas + 1):
+        if antes_de_enviar is not None:
+            await antes_de_enviar()
+        try:
+            return await ocr_async(
+                content,
+                tolerancia_vertical,
+                idioma,
+                paginas=paginas,
+                cliente_http=cliente_http,
+            )
+        except OCRLimiteRequisicoesAzureException as e:
+            if tentativa == max_tentativas:
+                raise
+            espera = e.retry_after or min(
+                BACKOFF_BASE_SEGUNDOS * 2 ** (tentativa - 1), BACKOFF_MAXIMO_SEGUNDOS
+            )
+            await asyncio.sleep(espera + random.uniform(0, espera / 2))
+
+
+def extrair_texto_pdf(
+    conteudo_pdf,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+):
+    paginas = obter_paginas_pdf(conteudo_pdf, tolerancia_vertical, idioma)
     texto_completo = "\n".join(paginas)
     return texto_completo
 
 
+def obter_paginas_pdf(
+    conteudo_pdf,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+) -> list[str]:
+    # O mesmo PDF com as mesmas configurações sempre gera o mesmo texto,
+    # então reenvios do mesmo arquivo não precisam passar pelo Azure.
+    chave = _chave_cache_ocr(conteudo_pdf, tolerancia_vertical, idioma)
+    paginas = cache_ocr.obter(chave)
+    if paginas is None:
+        paginas = _extrair_paginas_texto_local(conteudo_pdf, tolerancia_vertical)
+        faltantes = _paginas_sem_texto(conteudo_pdf, paginas)
+        if faltantes or not paginas:
+            if _dividir_em_partes(faltantes):
+                textos = _executar_sincrono(
+                    _ocr_em_partes_async(
+                        conteudo_pdf, faltantes, tolerancia_vertical, idioma
+                    )
+                )
+            else:
+                read_result, textos_ocr = ocr(
+                    conteudo_pdf,
+                    tolerancia_vertical,
+                    idioma,
+                    paginas=_filtro_de_paginas(paginas, faltantes),
+                )
+                textos = _textos_por_pagina(read_result, textos_ocr)
+            paginas = _mesclar_paginas(paginas, textos)
+        cache_ocr.gravar(chave, paginas)
+    return paginas
+
+
+async def obter_paginas_pdf_async(
+    conteudo_pdf,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+    cliente_http: httpx.AsyncClient = None,
+    antes_de_enviar: Optional[Callable[[], Awaitable[None]]] = None,
+    max_tentativas: int = 1,
+) -> list[str]:
+    """
+    Versão assíncrona de `obter_paginas_pdf`.
+
+    Args:
+        antes_de_enviar: aguardado antes de cada envio ao Azure (um por parte
+            do PDF, e de novo a cada repetição), por exemplo para limitar a
+            taxa de envios
+        max_tentativas: tentativas de cada envio recusado com 429; uma parte
+            recusada é repetida sozinha, sem reenviar as que já terminaram
+    """
+    chave = _chave_cache_ocr(conteudo_pdf, tolerancia_vertical, idioma)
+    paginas = cache_ocr.obter(chave)
+    if paginas is None:
+        paginas = _extrair_paginas_texto_local(conteudo_pdf, tolerancia_vertical)
+        faltantes = _paginas_sem_texto(conteudo_pdf, paginas)
+        if faltantes or not paginas:
+            if _dividir_em_partes(faltantes):
+                textos = await _ocr_em_partes_async(
+                    conteudo_pdf,
+                    faltantes,
+                    tolerancia_vertical,
+                    idioma,
+                    cliente_http=cliente_http,
+                    antes_de_enviar=antes_de_enviar,
+                    max_tentativas=max_tentativas,
+                )
+            else:
+                read_result, textos_ocr = await _ocr_async_repetindo(
+                    conteudo_pdf,
+                    tolerancia_vertical,
+                    idioma,
+                    paginas=_filtro_de_paginas(paginas, faltantes),
+                    cliente_http=cliente_http,
+                    antes_de_enviar=antes_de_enviar,
+                    max_tentativas=max_tentativas,
+                )
+                textos = _textos_por_pagina(read_result, textos_ocr)
+            paginas = _mesclar_paginas(paginas, textos)
+        cache_ocr.gravar(chave, paginas)
+    return paginas
+
+
+async def _ocr_em_partes_async(
+    conteudo_pdf,
+    numeros,
+    tolerancia_vertical,
+    idioma,
+    cliente_http=None,
+    antes_de_enviar=None,
+    max_tentativas=1,
+):
+    # Documentos longos são divididos em PDFs menores enviados em paralelo,
+    # para que o texto não fique esperando um único pedido com todas as páginas.
+    textos = {}
+    async for textos_da_parte in _iterar_partes_ocr_async(
+        conteudo_pdf,
+        numeros,
+        tolerancia_vertical,
+        idioma,
+        cliente_http,
+        antes_de_enviar,
+        max_tentativas,
+    ):
+        textos.update(textos_da_parte)
+    return textos
+
+
+async def _iterar_partes_ocr_async(
+    conteudo_pdf,
+    numeros,
+    tolerancia_vertical,
+    idioma,
+    cliente_http=None,
+    antes_de_enviar=None,
+    max_tentativas=1,
+):
+    """
+    Gera {número da página: texto} de cada parte assim que ela termina.
+
+    Cada parte é um envio ao Azure: aguarda `antes_de_enviar` e repete
+    sozinha os 429 (ver `_ocr_async_repetindo`).
+    """
+    partes = dividir_pdf(conteudo_pdf, numeros, OCR_PARALELO_PAGINAS_POR_PARTE)
+    semaforo = asyncio.Semaphore(OCR_PARALELO_CONCORRENCIA)
+    cliente = cliente_http or httpx.AsyncClient()
+
+    async def processar_parte(numeros_da_parte, conteudo_da_parte):
+        async with semaforo:
+            read_result, textos = await _ocr_async_repetindo(
+                conteudo_da_parte,
+                tolerancia_vertical,
+                idioma,
+                cliente_http=cliente,
+                antes_de_enviar=antes_de_enviar,
+                max_tentativas=max_tentativas,
+            )
+        return _textos_por_pagina(read_result, textos, numeros_da_parte)
+
+    tarefas = [
+        asyncio.ensure_future(processar_parte(numeros_da_parte, conteudo_da_parte))
+        for numeros_da_parte, conteudo_da_parte in partes
+    ]
+    try:
+        for proxima in asyncio.as_completed(tarefas):
+            yield await proxima
+    finally:
+        # As partes ainda em andamento terminam antes de o cliente ser
+        # fechado; senão falhariam com "cliente fechado" e esconderiam o erro
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+        if cliente_http is None:
+            await cliente.aclose()
+
+
+async def iterar_paginas_pdf_async(
+    conteudo_pdf,
+    tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO,
+    idioma=IDIOMA_PADRAO,
+    cliente_http: httpx.AsyncClient = None,
+) -> AsyncIterator[tuple[int, str]]:
+    """
+    Gera (número da página, texto) em ordem, cada página assim que fica pronta.
+
+    Páginas com camada de texto saem na hora; as demais vão ao Azure em partes
+    paralelas (mesmo abaixo do limiar de `obter_paginas_pdf`), e cada página é
+    liberada quando ela e todas as anteriores já têm texto. O resultado
+    completo vai para o mesmo cache de `obter_paginas_pdf`.
+    """
+    chave = _chave_cache_ocr(conteudo_pdf, tolerancia_vertical, idioma)
+    paginas = cache_ocr.obter(chave)
+    if paginas is not None:
+        for numero, texto in enumerate(paginas, 1):
+            yield numero, texto
+        return
+
+    paginas = _extrair_paginas_texto_local(conteudo_pdf, tolerancia_vertical)
+    faltantes = _paginas_sem_texto(conteudo_pdf, paginas)
+    proxima_pagina = 1
+
+    if not faltantes and not paginas:
+        # PDF que não pôde ser lido localmente: vai inteiro para o Azure
+        read_result, textos = await ocr_async(
+            conteudo_pdf, tolerancia_vertical, idioma, cliente_http=cliente_http
+        )
+        paginas = _mesclar_paginas(paginas, _textos_por_pagina(read_result, textos))
+    elif faltantes:
+        prontas = list(paginas) or [None] * len(faltantes)
+        textos_das_partes = _iterar_partes_ocr_async(
+            conteudo_pdf, faltantes, tolerancia_vertical, idioma, cliente_http
+        )
+        textos = {}
+        try:
+            while True:
+                # Libera, em ordem, as páginas que já têm texto
+                for numero, texto in textos.items():
+                    prontas[numero - 1] = texto
+                while (
+                    proxima_pagina <= len(prontas)
+                    and prontas[proxima_pagina - 1] is not None
+                ):
+                    yield proxima_pagina, prontas[proxima_pagina - 1]
+                    proxima_pagina += 1
+                try:
+                    textos = await textos_das_partes.__anext__()
+                except StopAsyncIteration:
+                    break
+        finally:
+            await textos_das_partes.aclose()
+        incrementar("ocr_paginas", len(faltantes), origem="azure")
+        paginas = [texto or "" for texto in prontas]
+
+    for numero in range(proxima_pagina, len(paginas) + 1):
+        yield numero, paginas[numero - 1]
+    cache_ocr.gravar(chave, paginas)
+
+
+def _dividir_em_partes(faltantes):
+    return (
+        OCR_PARALELO_HABILITADO
+        and len(faltantes) > OCR_PARALELO_LIMIAR_PAGINAS
+        and len(faltantes) > OCR_PARALELO_PAGINAS_POR_PARTE
+    )
+
+
+def _executar_sincrono(corrotina):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(corrotina)
+    # Já existe um event loop nesta thread; roda a corrotina em outra
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, corrotina).result()
+
+
+def _extrair_paginas_texto_local(conteudo_pdf, tolerancia_vertical):
+    # PDFs gerados digitalmente já trazem texto; só páginas sem texto
+    # utilizável (ex.: digitalizadas) ficam como None para irem ao Azure.
+    if not OCR_TEXTO_LOCAL_HABILITADO:
+        return []
+    paginas = []
+    for lines in extrair_lines_locais(conteudo_pdf):
+        if tem_texto_utilizavel(lines, OCR_TEXTO_LOCAL_MINIMO_CARACTERES):
+            linhas = _agrupar_linhas_por_posicao_vertical(lines, tolerancia_vertical)
+            paginas.append(_extrair_texto_das_linhas(linhas))
+        else:
+            paginas.append(None)
+    locais = sum(texto is not None for texto in paginas)
+    incrementar("ocr_paginas", locais, origem="texto_local")
+    return paginas
+
+
+def _paginas_sem_texto(conteudo_pdf, paginas):
+    """Números das páginas que precisam de OCR (vazio se o PDF não foi lido)."""
+    if not paginas:
+        return list(range(1, contar_paginas(conteudo_pdf) + 1))
+    return [numero for numero, texto in enumerate(paginas, 1) if texto is None]
+
+
+def _filtro_de_paginas(paginas, faltantes):
+    # Sem filtro quando o documento inteiro precisa de OCR
+    if not paginas or len(faltantes) == len(paginas):
+        return None
+    return faltantes
+
+
+def _textos_por_pagina(read_result, textos, numeros=None):
+    """
+    Mapeia número da página -> texto, com os textos já montados por `ocr` ou
+    `ocr_async` (na ordem de read_results). Com `numeros`, as páginas do
+    resultado (de uma parte do PDF) são traduzidas para a numeração original.
+    """
+    return {
+        numeros[page.page - 1] if numeros else page.page: texto
+        for page, texto in zip(read_result.analyze_result.read_results, textos)
+    }
+
+
+def _mesclar_paginas(paginas, textos):
+    total = max(len(paginas), max(textos, default=0))
+    mescladas = list(paginas) + [None] * (total - len(paginas))
+    for numero, texto in textos.items():
+        mescladas[numero - 1] = texto
+    incrementar("ocr_paginas", len(textos), origem="azure")
+    return [texto or "" for texto in mescladas]
+
+
+def _chave_cache_ocr(conteudo_pdf, tolerancia_vertical, idioma):
+    digest = hashlib.sha256(conteudo_pdf).hexdigest()
+    return f"{digest}:{float(tolerancia_vertical)!r}:{idioma}"
+
+
 def _obter_paginas_do_resultado(
-    resultado_bruto, tolerancia_vertical=(1 / 3)
+    resultado_bruto, tolerancia_vertical=TOLERANCIA_VERTICAL_PADRAO
 ) -> list[str]:
     pages = resultado_bruto.analyze_result.read_results
     textos_das_paginas = []
 
     for page in pages:
-        linhas = _agrupar_linhas_por_posicao_vertical(page.lines, tolerancia_vertical)
-        texto_da_pagina = _extrair_texto_das_linhas(linhas)
+        texto_da_pagina = _obter_texto_da_pagina(page, tolerancia_vertical)
         textos_das_paginas.append(texto_da_pagina)
 
     return textos_das_paginas
 
 
+def _obter_texto_da_pagina(page, tolerancia_vertical):
+    linhas = _agrupar_linhas_por_posicao_vertical(page.lines, tolerancia_vertical)
+    return _extrair_texto_das_linhas(linhas)
+
+
 def _agrupar_linhas_por_posicao_vertical(lines, tolerancia_vertical):
+    # Ordena as lines pelo centro vertical uma única vez e varre em sequência:
+    # a única linha candidata é a última aberta, que tem o centro mais próximo.
+    # Isso troca a busca quadrática em todas as linhas por O(n log n).
+    # Das lines do SDK só são copiados x, centro e texto, para que os objetos
+    # completos (com palavras e confiança) não fiquem presos nas linhas.
+    candidatas = sorted(
+        (
+            (
+                _calcular_centro_y(line.bounding_box),
+                _calcular_tolerancia(line.bounding_box, tolerancia_vertical),
+                (line.bounding_box[0], line.text),
+            )
+            for line in lines
+        ),
+        key=itemgetter(0),
+    )
     linhas: list[Linha] = []
-    for line in lines:
-        centro_y = _calcular_centro_y(line.bounding_box)
-        tolerancia = _calcular_tolerancia(line.bounding_box, tolerancia_vertical)
-        _adicionar_line_nas_linhas(linhas, line, centro_y, tolerancia)
+    for centro_y, tolerancia, palavra in candidatas:
+        _adicionar_line_nas_linhas(linhas, palavra, centro_y, tolerancia)
     _ordenar_linhas_e_palavras(linhas)
     return linhas
 
@@ -88,32 +586,35 @@ def _calcular_tolerancia(bbox, tolerancia_vertical):
     return altura * tolerancia_vertical
 
 
-def _adicionar_line_nas_linhas(linhas, linha, centro_y, tolerancia):
-    for linha_existente in linhas:
-        if abs(linha_existente.centro_y - centro_y) <= tolerancia:
-            linha_existente.palavras.append(linha)
-            return
-    linhas.append(Linha(centro_y=centro_y, palavras=[linha]))
+def _adicionar_line_nas_linhas(linhas, palavra, centro_y, tolerancia):
+    if linhas and centro_y - linhas[-1].centro_y <= tolerancia:
+        linhas[-1].palavras.append(palavra)
+        return
+    linhas.append(Linha(centro_y=centro_y, palavras=[palavra]))
 
 
 def _ordenar_linhas_e_palavras(linhas):
     for linha in linhas:
-        linha.palavras.sort(key=lambda palavra: palavra.bounding_box[0])
-    linhas.sort(key=lambda l: l.centro_y)
+        linha.palavras.sort(key=itemgetter(0))
+    linhas.sort(key=attrgetter("centro_y"))
 
 
 def _extrair_texto_das_linhas(linhas):
     texto_da_pagina = []
     for linha in linhas:
-        texto_linha = " ".join(
-            palavra.text for palavra in linha.palavras if palavra.text
-        )
+        texto_linha = " ".join(texto for _, texto in linha.palavras if texto)
         texto_da_pagina.append(texto_linha)
     return "\n".join(texto_da_pagina)
 
 
-class Linha(BaseModel):
-    centro_y: float
-    palavras: list[Line] = []
+class Linha:
+    """
+    Linha visual da página: o centro vertical da primeira line agrupada e as
+    palavras como tuplas (x da borda esquerda, texto).
+    """
+
+    __slots__ = ("centro_y", "palavras")
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    def __init__(self, centro_y: float, palavras: list[tuple[float, str]] = None):
+        self.centro_y = centro_y
+        self.palavras = palavras if palavras is not None else []
@@ -0,0 +1,160 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Optional
+
+
+class CacheDisco:
+    """
+    Cache persistente em SQLite com expiração (TTL) e remoção LRU por tamanho.
+
+    Pode ser compartilhado entre threads e processos: cada operação abre sua
+    própria conexão e o banco roda em modo WAL. Os valores são serializados
+    em JSON.
+
+    Args:
+        caminho: arquivo SQLite do cache
+        tamanho_maximo_bytes: tamanho total a partir do qual as entradas
+            acessadas há mais tempo são removidas
+        ttl_segundos: tempo de vida das entradas (None para não expirar)
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        tamanho_maximo_bytes: int,
+        ttl_segundos: Optional[float] = None,
+    ):
+        self.caminho = caminho
+        self.tamanho_maximo_bytes = tamanho_maximo_bytes
+        self.ttl_segundos = ttl_segundos
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS entradas (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    criado_em REAL NOT NULL,
+                    acessado_em REAL NOT NULL,
+                    expira_em REAL
+                )
+                """)
+            conexao.execute(
+                "CREATE INDEX IF NOT EXISTS idx_acessado_em ON entradas (acessado_em)"
+            )
+
+    @contextmanager
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    def obter(self, chave: str) -> Optional[Any]:
+        entrada = self.obter_com_idade(chave)
+        return None if entrada is None else entrada[0]
+
+    def obter_com_idade(self, chave: str) -> Optional[tuple[Any, float]]:
+        """Retorna (valor, idade em segundos) ou None se ausente ou expirado."""
+        agora = time.time()
+        with self._conectar() as conexao:
+            linha = conexao.execute(
+                "SELECT valor, criado_em, expira_em FROM entradas WHERE chave = ?",
+                (chave,),
+            ).fetchone()
+            if linha is not None and linha[2] is not None and linha[2] <= agora:
+                conexao.execute("DELETE FROM entradas WHERE chave = ?", (chave,))
+                linha = None
+            if linha is not None:
+                conexao.execute(
+                    "UPDATE entradas SET acessado_em = ? WHERE chave = ?",
+                    (agora, chave),
+                )
+
+        with self._lock:
+            if linha is None:
+                self._falhas += 1
+                return None
+            self._acertos += 1
+        return json.loads(linha[0]), agora - linha[1]
+
+    def gravar(self, chave: str, valor: Any, ttl_segundos: Optional[float] = None):
+        agora = time.time()
+        ttl = self.ttl_segundos if ttl_segundos is None else ttl_segundos
+        serializado = json.dumps(valor, ensure_ascii=False)
+        tamanho = len(serializado.encode("utf-8"))
+        with self._conectar() as conexao:
+            conexao.execute(
+                """
+                INSERT OR REPLACE INTO entradas
+                    (chave, valor, tamanho, criado_em, acessado_em, expira_em)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    chave,
+                    serializado,
+                    tamanho,
+                    agora,
+                    agora,
+                    agora + ttl if ttl is not None else None,
+                ),
+            )
+            self._remover_excedentes(conexao, agora)
+
+    def remover(self, chave: str):
+        with self._conectar() as conexao:
+            conexao.execute("DELETE FROM entradas WHERE chave = ?", (chave,))
+
+    def limpar(self):
+        with self._conectar() as conexao:
+            conexao.execute("DELETE FROM entradas")
+
+    def _remover_excedentes(self, conexao, agora):
+        conexao.execute(
+            "DELETE FROM entradas WHERE expira_em IS NOT NULL AND expira_em <= ?",
+            (agora,),
+        )
+        total = conexao.execute(
+            "SELECT COALESCE(SUM(tamanho), 0) FROM entradas"
+        ).fetchone()[0]
+        if total <= self.tamanho_maximo_bytes:
+            return
+
+        # Remove as entradas menos usadas recentemente até caber no limite
+        excedente = total - self.tamanho_maximo_bytes
+        removidas = []
+        for chave, tamanho in conexao.execute(
+            "SELECT chave, tamanho FROM entradas ORDER BY acessado_em"
+        ):
+            if excedente <= 0:
+                break
+            removidas.append((chave,))
+            excedente -= tamanho
+        conexao.executemany("DELETE FROM entradas WHERE chave = ?", removidas)
+
+    def estatisticas(self) -> dict:
+        with self._conectar() as conexao:
+            entradas, tamanho = conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM entradas"
+            ).fetchone()
+        with self._lock:
+            acertos, falhas = self._acertos, self._falhas
+        return {
+            "acertos": acertos,
+            "falhas": falhas,
+            "entradas": entradas,
+            "tamanho_bytes": tamanho,
+        }
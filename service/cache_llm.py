@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import time
+from typing import Iterator, Optional
+
+from config.properties import (
+    CACHE_DIR,
+    LLM_CACHE_TAMANHO_MAXIMO_MB,
+    LLM_CACHE_TTL_HORAS,
+    LLM_DEPLOYMENT_NAME,
+)
+from service.azure_llm import LLM_API_VERSION, LLM_MODELO, gateway_llm
+from service.cache import CacheDisco
+from service.metricas import incrementar, registrar_latencia
+
+# Respostas do LLM compartilhadas entre sessões e processos
+cache_llm = CacheDisco(
+    os.path.join(CACHE_DIR, "llm.sqlite3"),
+    tamanho_maximo_bytes=int(LLM_CACHE_TAMANHO_MAXIMO_MB * 1024**2),
+    ttl_segundos=LLM_CACHE_TTL_HORAS * 3600,
+)
+
+
+def chave_llm(template: str, **entradas: str) -> str:
+    """
+    Digest estável (ao contrário de hash(), que muda a cada processo) do
+    modelo, do deployment, do template do prompt e das entradas.
+    """
+    conteudo = json.dumps(
+        {
+            "modelo": LLM_MODELO,
+            "deployment": LLM_DEPLOYMENT_NAME,
+            "api_version": LLM_API_VERSION,
+            "template": template,
+            "entradas": entradas,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def obter_do_cache(template: str, **entradas: str) -> Optional[str]:
+    """Resposta já gravada para o prompt, sem chamar o LLM."""
+    return cache_llm.obter(chave_llm(template, **entradas))
+
+
+def completar_com_cache(template: str, **entradas: str) -> str:
+    """
+    `gateway_llm.completar(template.format(**entradas))`, respondido do cache
+    em disco quando o mesmo prompt já foi completado pelo mesmo modelo.
+
+    Erros do LLM são propagados e respostas vazias não são gravadas.
+    """
+    chave = chave_llm(template, **entradas)
+    texto = cache_llm.obter(chave)
+    if texto is not None:
+        incrementar("llm_cache", resultado="acerto")
+        return texto
+    incrementar("llm_cache", resultado="falha")
+
+    inicio = time.perf_counter()
+    texto = gateway_llm.completar(template.format(**entradas))
+    registrar_latencia("llm_complete", time.perf_counter() - inicio)
+    if texto.strip():
+        cache_llm.gravar(chave, texto)
+    return texto
+
+
+def completar_com_cache_em_fluxo(template: str, **entradas: str) -> Iterator[str]:
+    """
+    Versão de `completar_com_cache` que entrega o texto aos pedaços, conforme
+    o modelo gera (`gateway_llm.completar_em_fluxo`). Uma resposta em cache é
+    entregue de uma vez.
+
+    O texto só é gravado no cache quando o fluxo termina; um fluxo
+    interrompido ou com erro não deixa uma resposta parcial no cache.
+    """
+    chave = chave_llm(template, **entradas)
+    texto = cache_llm.obter(chave)
+    if texto is not None:
+        incrementar("llm_cache", resultado="acerto")
+        yield texto
+        return
+    incrementar("llm_cache", resultado="falha")
+
+    inicio = time.perf_counter()
+    pedacos = []
+    fluxo = gateway_llm.completar_em_fluxo(template.format(**entradas))
+    try:
+        for pedaco in fluxo:
+            if not pedacos:
+                registrar_latencia("llm_primeiro_token", time.perf_counter() - inicio)
+            pedacos.append(pedaco)
+            yield pedaco
+    finally:
+        # Encerra o pedido ao Azure quando o chamador para de consumir
+        fluxo.close()
+    registrar_latencia("llm_fluxo", time.perf_counter() - inicio)
+
+    texto = "".join(pedacos)
+    if texto.strip():
+        cache_llm.gravar(chave, texto)
@@ -0,0 +1,39 @@
+from config.taxonomia import (
+    AREAS_INTERESSE,
+    PALAVRAS_CHAVE_POR_SETOR,
+    SETORES_INTERESSE,
+    TERMOS_BUSCA_POR_AREA,
+)
+from service.texto import tokens
+
+# Áreas e setores do formulário, na ordem das colunas das matrizes de
+# categorias da pontuação em lote
+CATEGORIAS = AREAS_INTERESSE + SETORES_INTERESSE
+
+
+def _termos(categoria):
+    termos = [categoria]
+    termos += TERMOS_BUSCA_POR_AREA.get(categoria, [])
+    termos += PALAVRAS_CHAVE_POR_SETOR.get(categoria, [])
+    return [frozenset(tokens(termo)) for termo in termos]
+
+
+# Uma categoria aparece em um texto quando todas as palavras de algum dos seus
+# termos aparecem nele
+_TERMOS_POR_CATEGORIA = {categoria: _termos(categoria) for categoria in CATEGORIAS}
+
+
+def categorias_do_texto(texto: str) -> list[str]:
+    """Áreas e setores da taxonomia mencionados no texto de uma vaga."""
+    palavras = set(tokens(texto))
+    return [
+        categoria
+        for categoria, termos in _TERMOS_POR_CATEGORIA.items()
+        if any(termo <= palavras for termo in termos)
+    ]
+
+
+def categorias_do_perfil(perfil: dict) -> list[str]:
+    """Áreas e setores escolhidos no cadastro que fazem parte da taxonomia."""
+    escolhidas = set(perfil.get("areas") or []) | set(perfil.get("setores") or [])
+    return [categoria for categoria in CATEGORIAS if categoria in escolhidas]
@@ -0,0 +1,203 @@
+import hashlib
+from array import array
+import math
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional
+
+import numpy as np
+
+from service.metricas import registrar_latencia
+from service.texto import termos
+
+
+class _Postagens:
+    """Documentos (ids internos) e frequências de um termo."""
+
+    __slots__ = ("ids", "frequencias")
+
+    def __init__(self):
+        # array.array cresce com custo amortizado constante; as consultas
+        # leem os mesmos bytes como arrays NumPy
+        self.ids = array("i")
+        self.frequencias = array("f")
+
+    def acrescentar(self, documento: int, frequencia: int):
+        self.ids.append(documento)
+        self.frequencias.append(frequencia)
+
+    def como_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        # Cópias, para não prender o buffer dos array.array, que não podem
+        # crescer enquanto exportam um
+        return (
+            np.frombuffer(self.ids, dtype=np.int32).copy(),
+            np.frombuffer(self.frequencias, dtype=np.float32).copy(),
+        )
+
+
+class IndiceBM25:
+    """
+    Índice invertido em memória com ranqueamento BM25.
+
+    Os textos passam por `service.texto.termos` (sem acentos, sem stopwords e
+    no singular). Cada termo guarda os documentos em que aparece em arrays
+    NumPy, então uma consulta soma as contribuições de cada termo sobre um
+    vetor de notas sem laços em Python por documento.
+
+    Atualizações são incrementais: um documento reenviado com outro texto é
+    marcado como removido e reinserido; as postagens removidas são ignoradas
+    nas consultas e descartadas quando passam da metade do índice.
+
+    Args:
+        k1: saturação da frequência do termo
+        b: peso da normalização pelo tamanho do documento
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postagens: dict[str, _Postagens] = {}
+        self._chaves: list[Optional[str]] = []
+        self._digests: dict[str, tuple[int, str]] = {}
+        self._comprimentos = np.empty(64, dtype=np.float32)
+        self._ativos = np.empty(64, dtype=bool)
+        self._soma_comprimentos = 0.0
+        self._removidos = 0
+
+    def __len__(self):
+        return len(self._digests)
+
+    def __contains__(self, chave: str):
+        return chave in self._digests
+
+    def adicionar(self, chave: str, texto: str) -> bool:
+        """
+        Indexa (ou reindexa) um documento.
+
+        Returns:
+            False se o documento já estava indexado com o mesmo texto
+        """
+        digest = hashlib.sha1(texto.encode("utf-8")).hexdigest()
+        frequencias = Counter(termos(texto))
+        with self._lock:
+            anterior = self._digests.get(chave)
+            if anterior is not None:
+                if anterior[1] == digest:
+                    return False
+                self._marcar_removido(anterior[0])
+
+            documento = len(self._chaves)
+            if documento == len(self._comprimentos):
+                capacidade = max(documento * 2, 64)
+                self._comprimentos = np.resize(self._comprimentos, capacidade)
+                self._ativos = np.resize(self._ativos, capacidade)
+            comprimento = sum(frequencias.values())
+            self._chaves.append(chave)
+            self._digests[chave] = (documento, digest)
+            self._comprimentos[documento] = comprimento
+            self._ativos[documento] = True
+            self._soma_comprimentos += comprimento
+            for termo, frequencia in frequencias.items():
+                postagens = self._postagens.get(termo)
+                if postagens is None:
+                    postagens = self._postagens[termo] = _Postagens()
+                postagens.acrescentar(documento, frequencia)
+            self._compactar_se_necessario()
+            return True
+
+    def adicionar_varios(self, documentos: Iterable[tuple[str, str]]) -> int:
+        """Indexa pares (chave, texto); retorna quantos eram novos ou mudaram."""
+        return sum(self.adicionar(chave, texto) for chave, texto in documentos)
+
+    def remover(self, chave: str):
+        with self._lock:
+            anterior = self._digests.pop(chave, None)
+            if anterior is not None:
+                self._marcar_removido(anterior[0])
+                self._compactar_se_necessario()
+
+    def _marcar_removido(self, documento):
+        self._ativos[documento] = False
+        self._chaves[documento] = None
+        self._soma_comprimentos -= float(self._comprimentos[documento])
+        self._removidos += 1
+
+    def _compactar_se_necessario(self):
+        if self._removidos * 2 <= len(self._chaves) or self._removidos < 1000:
+            return
+        # Renumera os documentos ativos e descarta as postagens removidas
+        ativos = self._ativos[: len(self._chaves)]
+        novos_ids = np.cumsum(ativos, dtype=np.int32) - 1
+        for termo in list(self._postagens):
+            postagens = self._postagens[termo]
+            ids, frequencias = postagens.como_arrays()
+            manter = ativos[ids]
+            if not manter.any():
+                del self._postagens[termo]
+                continue
+            postagens.ids = array("i", novos_ids[ids[manter]].tobytes())
+            postagens.frequencias = array("f", frequencias[manter].tobytes())
+        self._comprimentos = self._comprimentos[: len(self._chaves)][ativos].copy()
+        self._chaves = [chave for chave in self._chaves if chave is not None]
+        self._ativos = np.ones(len(self._chaves), dtype=bool)
+        self._digests = {
+            chave: (documento, self._digests[chave][1])
+            for documento, chave in enumerate(self._chaves)
+        }
+        self._removidos = 0
+
+    def buscar(self, consulta: str, k: int = 10) -> list[tuple[str, float]]:
+        """
+        Retorna (chave, nota BM25) dos `k` documentos mais relevantes para a
+        consulta, da maior nota para a menor. Documentos sem nenhum termo da
+        consulta não são retornados.
+        """
+        termos_consulta = set(termos(consulta))
+        inicio = time.perf_counter()
+        with self._lock:
+            total_documentos = len(self._chaves)
+            ativos_total = total_documentos - self._removidos
+            if not termos_consulta or ativos_total == 0 or k <= 0:
+                return []
+            media = self._soma_comprimentos / ativos_total
+            comprimentos = self._comprimentos[:total_documentos]
+            ativos = self._ativos[:total_documentos]
+            notas = np.zeros(total_documentos, dtype=np.float32)
+            for termo in termos_consulta:
+                postagens = self._postagens.get(termo)
+                if postagens is None:
+                    continue
+                ids, frequencias = postagens.como_arrays()
+                if self._removidos:
+                    manter = ativos[ids]
+                    ids, frequencias = ids[manter], frequencias[manter]
+                if len(ids) == 0:
+                    continue
+                idf = math.log(1 + (ativos_total - len(ids) + 0.5) / (len(ids) + 0.5))
+                normalizacao = self.k1 * (
+                    1 - self.b + self.b * comprimentos[ids] / media
+                )
+                notas[ids] += (
+                    idf * frequencias * (self.k1 + 1) / (frequencias + normalizacao)
+                )
+
+            candidatos = np.flatnonzero(notas)
+            if len(candidatos) > k:
+                candidatos = candidatos[np.argpartition(-notas[candidatos], k - 1)[:k]]
+            candidatos = candidatos[np.argsort(-notas[candidatos])]
+            resultado = [
+                (self._chaves[documento], float(notas[documento]))
+                for documento in candidatos
+            ]
+        registrar_latencia("indice_palavras_busca", time.perf_counter() - inicio)
+        return resultado
+
+
+def texto_vaga_para_busca(vaga: dict) -> str:
+    """Texto indexado de uma vaga; o título entra duas vezes para pesar mais."""
+    titulo = vaga.get("title") or ""
+    return "\n".join(
+        [titulo, titulo, vaga.get("company") or "", vaga.get("description") or ""]
+    )
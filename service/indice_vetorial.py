@@ -0,0 +1,556 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, Union
+
+import numpy as np
+
+from config.properties import (
+    AZURE_OPENAI_API_KEY,
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+    AZURE_OPENAI_ENDPOINT,
+    CACHE_DIR,
+    INDICE_EMBEDDINGS,
+    INDICE_HASH_DIMENSAO,
+)
+from service.categorias import categorias_do_texto
+from service.metricas import incrementar, registrar_latencia
+from service.texto import tokens
+
+
+class Embeddings(ABC):
+    """
+    Gera os vetores usados pelo `IndiceVetorial`.
+
+    `nome` identifica o modelo e a dimensão: um índice salvo com outro nome é
+    descartado ao carregar, já que os vetores não são comparáveis.
+    """
+
+    nome: str
+    dimensao: int
+
+    @abstractmethod
+    def gerar(self, textos: list[str]) -> np.ndarray:
+        """Retorna uma matriz float32 (len(textos) × dimensao)."""
+
+
+class EmbeddingsHash(Embeddings):
+    """
+    Embeddings locais pelo truque do hashing: cada palavra e cada par de
+    palavras vizinhas soma ±1 em uma posição escolhida pelo seu hash.
+
+    Não entende sinônimos, mas é determinístico, não usa rede e aproxima
+    vagas e perfis com o mesmo vocabulário; serve para testes e para rodar
+    sem um deployment de embeddings.
+    """
+
+    def __init__(self, dimensao: int = INDICE_HASH_DIMENSAO):
+        self.dimensao = dimensao
+        self.nome = f"hash-{dimensao}"
+
+    def _posicao(self, termo: str) -> tuple[int, float]:
+        # blake2b em vez de hash(), que muda a cada processo
+        valor = int.from_bytes(
+            hashlib.blake2b(termo.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        return valor % self.dimensao, 1.0 if valor >> 63 else -1.0
+
+    def gerar(self, textos: list[str]) -> np.ndarray:
+        vetores = np.zeros((len(textos), self.dimensao), dtype=np.float32)
+        for linha, texto in enumerate(textos):
+            palavras = tokens(texto)
+            for termo in palavras + [
+                " ".join(par) for par in zip(palavras, palavras[1:])
+            ]:
+                posicao, sinal = self._posicao(termo)
+                vetores[linha, posicao] += sinal
+        return vetores
+
+
+class EmbeddingsAzure(Embeddings):
+    """
+    Embeddings de um deployment do Azure OpenAI (ex.: text-embedding-3-small).
+
+    Args:
+        deployment: nome do deployment de embeddings
+        lote: textos enviados por requisição
+        caracteres_maximos: textos maiores são cortados antes do envio
+    """
+
+    def __init__(
+        self,
+        deployment: str = AZURE_OPENAI_EMBEDDING_DEPLOYMENT,
+        lote: int = 64,
+        caracteres_maximos: int = 8000,
+    ):
+        from openai import AzureOpenAI
+
+        self._cliente = AzureOpenAI(
+            api_version="2024-02-01",
+            api_key=AZURE_OPENAI_API_KEY,
+            azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        )
+        self.deployment = deployment
+        self.lote = lote
+        self.caracteres_maximos = caracteres_maximos
+        self.dimensao = len(self._gerar_lote(["dimensao"])[0])
+        self.nome = f"azure:{deployment}-{self.dimensao}"
+
+    def _gerar_lote(self, textos):
+        resposta = self._cliente.embeddings.create(
+            model=self.deployment,
+            input=[texto[: self.caracteres_maximos] or " " for texto in textos],
+        )
+        return [item.embedding for item in sorted(resposta.data, key=lambda i: i.index)]
+
+    def gerar(self, textos: list[str]) -> np.ndarray:
+        vetores = []
+        for inicio in range(0, len(textos), self.lote):
+            vetores.extend(self._gerar_lote(textos[inicio : inicio + self.lote]))
+        return np.asarray(vetores, dtype=np.float32).reshape(len(textos), -1)
+
+
+def normalizar_linhas(vetores: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+    return vetores / np.maximum(normas, 1e-12)
+
+
+def _digest(texto: str) -> str:
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+class IndiceVetorial:
+    """
+    Índice vetorial em memória com busca exata por similaridade de cosseno.
+
+    Os vetores ficam normalizados em uma única matriz float32, então uma
+    consulta é um produto matriz-vetor seguido de `argpartition`: alguns
+    milissegundos para dezenas de milhares de itens. Inserções são
+    incrementais (a matriz cresce por dobra) e um item reinserido com o mesmo
+    texto não é enviado de novo ao modelo de embeddings.
+
+    Persistido em SQLite, um item por linha: `salvar` grava só os itens
+    alterados desde a última vez e traz os que outros processos (o app e o
+    agendador de coletas) gravaram nesse meio-tempo, em vez de reescrever o
+    índice inteiro por cima do deles.
+
+    Args:
+        embeddings: gerador dos vetores
+        caminho: arquivo SQLite onde o índice é persistido (None para só memória)
+    """
+
+    def __init__(self, embeddings: Embeddings, caminho: Optional[str] = None):
+        self.embeddings = embeddings
+        self.caminho = caminho
+        self._lock = threading.RLock()
+        self._ids: list[str] = []
+        self._posicoes: dict[str, int] = {}
+        self._digests: list[str] = []
+        self._metadados: list[dict] = []
+        self._vetores = np.zeros((0, embeddings.dimensao), dtype=np.float32)
+        # Itens alterados ou removidos aqui e ainda não gravados
+        self._alterados: set[str] = set()
+        self._removidos: set[str] = set()
+        # Maior versão do arquivo já aplicada à memória
+        self._versao = 0
+        if caminho:
+            self._abrir()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, id_item: str):
+        return id_item in self._posicoes
+
+    def metadados(self, id_item: str) -> Optional[dict]:
+        with self._lock:
+            posicao = self._posicoes.get(id_item)
+            return None if posicao is None else self._metadados[posicao]
+
+    def adicionar(self, itens: Iterable[tuple[str, str, dict]]) -> int:
+        """
+        Insere ou atualiza itens (id, texto, metadados).
+
+        Returns:
+            Quantidade de textos novos ou alterados que precisaram de embedding
+        """
+        with self._lock:
+            pendentes = {}
+            for id_item, texto, metadados in itens:
+                digest = _digest(texto)
+                posicao = self._posicoes.get(id_item)
+                if posicao is not None and self._digests[posicao] == digest:
+                    self._metadados[posicao] = metadados
+                else:
+                    pendentes[id_item] = (texto, digest, metadados)
+            if not pendentes:
+                return 0
+
+            inicio = time.perf_counter()
+            vetores = normalizar_linhas(
+                self.embeddings.gerar([texto for texto, _, _ in pendentes.values()])
+            )
+            registrar_latencia(
+                "indice_embeddings",
+                time.perf_counter() - inicio,
+                modelo=self.embeddings.nome,
+            )
+            for vetor, (id_item, (_, digest, metadados)) in zip(
+                vetores, pendentes.items()
+            ):
+                self._colocar(id_item, digest, metadados, vetor)
+                self._alterados.add(id_item)
+                self._removidos.discard(id_item)
+            return len(pendentes)
+
+    def _colocar(self, id_item, digest, metadados, vetor):
+        posicao = self._posicoes.get(id_item)
+        if posicao is None:
+            posicao = len(self._ids)
+            self._reservar(posicao + 1)
+            self._posicoes[id_item] = posicao
+            self._ids.append(id_item)
+            self._digests.append(digest)
+            self._metadados.append(metadados)
+        else:
+            self._digests[posicao] = digest
+            self._metadados[posicao] = metadados
+        self._vetores[posicao] = vetor
+
+    def _reservar(self, total):
+        capacidade = len(self._vetores)
+        if total <= capacidade:
+            return
+        nova = np.zeros(
+            (max(total, capacidade * 2, 64), self.embeddings.dimensao),
+            dtype=np.float32,
+        )
+        nova[:capacidade] = self._vetores
+        self._vetores = nova
+
+    def remover(self, ids: Iterable[str]):
+        """Remove itens movendo o último para a posição liberada."""
+        with self._lock:
+            for id_item in ids:
+                posicao = self._posicoes.pop(id_item, None)
+                if posicao is None:
+                    continue
+                ultima = len(self._ids) - 1
+                if posicao != ultima:
+                    self._ids[posicao] = self._ids[ultima]
+                    self._digests[posicao] = self._digests[ultima]
+                    self._metadados[posicao] = self._metadados[ultima]
+                    self._vetores[posicao] = self._vetores[ultima]
+                    self._posicoes[self._ids[posicao]] = posicao
+                self._ids.pop()
+                self._digests.pop()
+                self._metadados.pop()
+                self._alterados.discard(id_item)
+                self._removidos.add(id_item)
+
+    def vetor(self, consulta: str) -> np.ndarray:
+        return normalizar_linhas(self.embeddings.gerar([consulta]))[0]
+
+    def buscar(
+        self,
+        consulta: Union[str, np.ndarray],
+        k: int = 10,
+        filtro: Optional[Callable[[dict], bool]] = None,
+    ) -> list[tuple[str, float, dict]]:
+        """
+        Retorna os `k` itens mais parecidos com a consulta.
+
+        Args:
+            consulta: texto ou vetor já normalizado
+            k: quantidade de resultados
+            filtro: recebe os metadados e diz se o item pode ser retornado
+
+        Returns:
+            Lista de (id, similaridade de cosseno, metadados), da maior para a
+            menor similaridade
+        """
+        vetor = self.vetor(consulta) if isinstance(consulta, str) else consulta
+        with self._lock:
+            total = len(self._ids)
+            if total == 0 or k <= 0:
+                return []
+            inicio = time.perf_counter()
+            notas = self._vetores[:total] @ vetor.astype(np.float32)
+            if filtro is not None:
+                permitidos = np.fromiter(
+                    (filtro(metadados) for metadados in self._metadados),
+                    dtype=bool,
+                    count=total,
+                )
+                notas = np.where(permitidos, notas, -np.inf)
+            k = min(k, total)
+            melhores = np.argpartition(-notas, k - 1)[:k]
+            melhores = melhores[np.argsort(-notas[melhores])]
+            resultado = [
+                (self._ids[posicao], float(notas[posicao]), self._metadados[posicao])
+                for posicao in melhores
+                if notas[posicao] > -np.inf
+            ]
+        registrar_latencia("indice_busca", time.perf_counter() - inicio)
+        return resultado
+
+    def exportar(self) -> tuple[list[str], np.ndarray, list[dict]]:
+        """Cópia de (ids, vetores normalizados, metadados), para pontuação em lote."""
+        with self._lock:
+            total = len(self._ids)
+            return list(self._ids), self._vetores[:total].copy(), list(self._metadados)
+
+    @contextmanager
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    def _abrir(self):
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS itens (
+                    id TEXT PRIMARY KEY,
+                    digest TEXT,
+                    metadados TEXT,
+                    vetor BLOB,
+                    versao INTEGER NOT NULL
+                )
+                """)
+            conexao.execute("CREATE INDEX IF NOT EXISTS itens_versao ON itens (versao)")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS info (chave TEXT PRIMARY KEY, valor TEXT)"
+            )
+            linha = conexao.execute(
+                "SELECT valor FROM info WHERE chave = 'embeddings'"
+            ).fetchone()
+            if linha is not None and linha[0] != self.embeddings.nome:
+                print(
+                    f"[indice_vetorial] {self.caminho} foi gerado com "
+                    f"{linha[0]}; o índice será refeito"
+                )
+                conexao.execute("DELETE FROM itens")
+            conexao.execute(
+                "INSERT OR REPLACE INTO info (chave, valor) VALUES ('embeddings', ?)",
+                (self.embeddings.nome,),
+            )
+        self.sincronizar()
+
+    def sincronizar(self):
+        """Traz para a memória os itens gravados por outros processos."""
+        if not self.caminho:
+            return
+        with self._lock, self._conectar() as conexao:
+            self._aplicar_novas_versoes(conexao)
+
+    def _aplicar_novas_versoes(self, conexao):
+        linhas = conexao.execute(
+            "SELECT id, digest, metadados, vetor, versao FROM itens "
+            "WHERE versao > ? ORDER BY versao",
+            (self._versao,),
+        )
+        for id_item, digest, metadados, vetor, versao in linhas:
+            self._versao = versao
+            # O que ainda não foi gravado aqui é mais novo
+            if id_item in self._alterados or id_item in self._removidos:
+                continue
+            if vetor is None:
+                self.remover([id_item])
+                self._removidos.discard(id_item)
+                continue
+            vetor = np.frombuffer(vetor, dtype=np.float32)
+            if len(vetor) != self.embeddings.dimensao:
+                continue
+            self._colocar(id_item, digest, json.loads(metadados), vetor)
+
+    def salvar(self):
+        """
+        Grava os itens alterados ou removidos desde a última gravação e
+        traz os que outros processos gravaram. O custo é proporcional ao que
+        mudou, não ao tamanho do índice.
+        """
+        if not self.caminho:
+            return
+        with self._lock, self._conectar() as conexao:
+            # Trava de escrita desde o início: as versões não se repetem
+            conexao.execute("BEGIN IMMEDIATE")
+            self._aplicar_novas_versoes(conexao)
+            versao = conexao.execute(
+                "SELECT COALESCE(MAX(versao), 0) FROM itens"
+            ).fetchone()[0]
+            linhas = []
+            for id_item in self._alterados:
+                posicao = self._posicoes[id_item]
+                versao += 1
+                linhas.append(
+                    (
+                        id_item,
+                        self._digests[posicao],
+                        json.dumps(self._metadados[posicao], ensure_ascii=False),
+                        self._vetores[posicao].tobytes(),
+                        versao,
+                    )
+                )
+            for id_item in self._removidos:
+                # A linha fica sem vetor para que os outros processos também
+                # removam o item
+                versao += 1
+                linhas.append((id_item, None, None, None, versao))
+            conexao.executemany(
+                "INSERT OR REPLACE INTO itens (id, digest, metadados, vetor, versao) "
+                "VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+            self._versao = versao
+            self._alterados.clear()
+            self._removidos.clear()
+
+
+def texto_vaga(vaga: dict) -> str:
+    """Texto de uma vaga usado para gerar o seu embedding."""
+    return "\n".join(
+        str(vaga.get(campo) or "")
+        for campo in ("title", "company", "place", "description")
+    )
+
+
+def texto_perfil(perfil: dict) -> str:
+    """Texto do perfil consolidado do candidato usado para gerar o seu embedding."""
+    return "\n".join(
+        [
+            f"{perfil.get('curso', '')} {perfil.get('semestre', '')}",
+            "Áreas: " + ", ".join(perfil.get("areas") or []),
+            "Setores: " + ", ".join(perfil.get("setores") or []),
+            perfil.get("curriculo_texto") or "",
+            perfil.get("linkedin_dados") or "",
+        ]
+    )
+
+
+_lock_indices = threading.Lock()
+_embeddings: Optional[Embeddings] = None
+_indices: dict[str, IndiceVetorial] = {}
+
+
+def obter_embeddings() -> Embeddings:
+    """Embeddings configurados em INDICE_EMBEDDINGS, criados no primeiro uso."""
+    global _embeddings
+    with _lock_indices:
+        if _embeddings is None:
+            if INDICE_EMBEDDINGS == "azure":
+                _embeddings = EmbeddingsAzure()
+            else:
+                _embeddings = EmbeddingsHash()
+        return _embeddings
+
+
+def _obter_indice(nome: str) -> IndiceVetorial:
+    embeddings = obter_embeddings()
+    with _lock_indices:
+        if nome not in _indices:
+            _indices[nome] = IndiceVetorial(
+                embeddings, os.path.join(CACHE_DIR, f"indice_{nome}.sqlite3")
+            )
+        return _indices[nome]
+
+
+def obter_indice_vagas() -> IndiceVetorial:
+    return _obter_indice("vagas")
+
+
+def obter_indice_perfis() -> IndiceVetorial:
+    return _obter_indice("perfis")
+
+
+def indexar_vagas(vagas: list[dict], chave: Callable[[dict], Optional[str]]) -> int:
+    """
+    Acrescenta vagas ao índice compartilhado e o persiste.
+
+    Args:
+        vagas: registros normalizados das vagas
+        chave: função que dá o identificador de cada vaga (o mesmo do armazém)
+
+    Returns:
+        Quantidade de vagas novas ou alteradas
+    """
+    itens = []
+    for vaga in vagas:
+        id_vaga = chave(vaga)
+        if id_vaga:
+            texto = texto_vaga(vaga)
+            metadados = {
+                campo: vaga.get(campo)
+                for campo in ("fonte", "title", "company", "place", "link")
+            }
+            metadados["categorias"] = categorias_do_texto(texto)
+            itens.append((id_vaga, texto, metadados))
+    indice = obter_indice_vagas()
+    alteradas = indice.adicionar(itens)
+    if alteradas:
+        indice.salvar()
+    return alteradas
+
+
+def indexar_perfil(perfil: dict):
+    """Acrescenta (ou atualiza) o perfil do candidato, identificado pelo LinkedIn."""
+    id_perfil = perfil.get("linkedin") or perfil.get("nome")
+    if not id_perfil:
+        return
+    metadados = {
+        campo: perfil.get(campo)
+        for campo in (
+            "nome",
+            "curso",
+            "semestre",
+            "areas",
+            "setores",
+            "linkedin",
+            "perfil_hash",
+        )
+    }
+    try:
+        indice = obter_indice_perfis()
+        # Reenvio de um perfil sem mudanças: nada a recalcular
+        anterior = indice.metadados(id_perfil)
+        if (
+            perfil.get("perfil_hash")
+            and anterior
+            and anterior.get("perfil_hash") == perfil["perfil_hash"]
+        ):
+            incrementar("indice_perfis", resultado="inalterado")
+            return
+        if indice.adicionar([(id_perfil, texto_perfil(perfil), metadados)]):
+            indice.salvar()
+    except Exception as e:
+        # O cadastro continua; o perfil é indexado no próximo envio
+        print(f"[indice_vetorial] Erro ao indexar perfil: {e}")
+
+
+def vagas_semelhantes_ao_perfil(perfil: dict, k: int = 10) -> list[tuple[str, float]]:
+    """Retorna (id da vaga, similaridade) das `k` vagas indexadas mais próximas."""
+    indice = obter_indice_vagas()
+    # Inclui as vagas que o agendador de coletas indexou em outro processo
+    indice.sincronizar()
+    return [
+        (id_vaga, nota) for id_vaga, nota, _ in indice.buscar(texto_perfil(perfil), k)
+    ]
+
+
+def perfis_semelhantes_a_vaga(vaga: dict, k: int = 10) -> list[tuple[dict, float]]:
+    """Retorna (metadados do perfil, similaridade) dos `k` candidatos mais próximos."""
+    indice = obter_indice_perfis()
+    return [
+        (metadados, nota) for _, nota, metadados in indice.buscar(texto_vaga(vaga), k)
+    ]
@@ -0,0 +1,248 @@
+"""
+Ingestão em lote de currículos em PDF.
+
+Envia os arquivos de um diretório (ou listados em um manifesto, um caminho
+por linha) para o OCR com concorrência limitada, repete envios recusados
+com 429 e grava cada resultado em JSONL assim que o arquivo termina. Ao
+rodar de novo com a mesma saída, os arquivos já processados com sucesso
+são pulados.
+
+Uso:
+    python -m service.ingestao_lote curriculos/ --saida resultados.jsonl
+    python -m service.ingestao_lote manifesto.txt --saida resultados.jsonl --concorrencia 8
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import AsyncIterator, Iterable, Optional
+
+import httpx
+
+from config.properties import (
+    OCR_LOTE_CONCORRENCIA,
+    OCR_LOTE_ENVIOS_POR_SEGUNDO,
+    OCR_LOTE_MAX_TENTATIVAS,
+)
+from service.azure_vision import obter_paginas_pdf_async
+
+
+def listar_arquivos(entrada: str) -> list[str]:
+    """
+    Lista os PDFs de um diretório (recursivamente) ou de um manifesto.
+
+    Args:
+        entrada: diretório com PDFs ou arquivo de manifesto; caminhos
+            relativos do manifesto são resolvidos a partir dele
+
+    Returns:
+        Caminhos dos arquivos, sem repetições, na ordem encontrada
+    """
+    if os.path.isdir(entrada):
+        arquivos = []
+        for raiz, _, nomes in os.walk(entrada):
+            for nome in nomes:
+                if nome.lower().endswith(".pdf"):
+                    arquivos.append(os.path.join(raiz, nome))
+        return sorted(arquivos)
+
+    base = os.path.dirname(os.path.abspath(entrada))
+    arquivos = []
+    with open(entrada, encoding="utf-8") as manifesto:
+        for linha in manifesto:
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            arquivos.append(os.path.normpath(os.path.join(base, linha)))
+    return list(dict.fromkeys(arquivos))
+
+
+def carregar_concluidos(saida: str) -> set[tuple[str, str]]:
+    """Lê a saída de uma execução anterior e retorna (arquivo, sha256) concluídos."""
+    concluidos = set()
+    if not os.path.exists(saida):
+        return concluidos
+    with open(saida, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                # Linha truncada por uma execução interrompida
+                continue
+            if registro.get("status") == "ok":
+                concluidos.add((registro["arquivo"], registro["sha256"]))
+    return concluidos
+
+
+class _LimitadorEnvios:
+    """Espaça os envios para não passar de `por_segundo` requisições por segundo."""
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1 / por_segundo if por_segundo > 0 else 0
+        self._proximo = 0.0
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self):
+        async with self._lock:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(agora, self._proximo) + self.intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+async def _processar_arquivo(
+    caminho, concluidos, semaforo, limitador, cliente, max_tentativas
+):
+    async with semaforo:
+        try:
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+        except OSError as e:
+            # Um arquivo ausente ou ilegível não interrompe o lote
+            return {
+                "arquivo": caminho,
+                "sha256": None,
+                "status": "erro",
+                "erro": str(e),
+                "envios": 0,
+                "duracao_segundos": 0.0,
+            }
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        registro = {"arquivo": caminho, "sha256": sha256}
+        if (caminho, sha256) in concluidos:
+            return None
+
+        # Um PDF longo vai ao Azure em várias partes; cada envio (e cada
+        # repetição de uma parte recusada com 429) passa pelo limitador
+        envios = 0
+
+        async def antes_de_enviar():
+            nonlocal envios
+            envios += 1
+            await limitador.aguardar()
+
+        inicio = time.perf_counter()
+        try:
+            paginas = await obter_paginas_pdf_async(
+                conteudo,
+                cliente_http=cliente,
+                antes_de_enviar=antes_de_enviar,
+                max_tentativas=max_tentativas,
+            )
+        except Exception as e:
+            registro.update(status="erro", erro=getattr(e, "mensagem", str(e)))
+        else:
+            registro.update(status="ok", paginas=paginas, texto="\n".join(paginas))
+
+    registro["envios"] = envios
+    registro["duracao_segundos"] = round(time.perf_counter() - inicio, 3)
+    return registro
+
+
+async def ingerir_lote(
+    arquivos: Iterable[str],
+    saida: str,
+    concorrencia: int = OCR_LOTE_CONCORRENCIA,
+    envios_por_segundo: float = OCR_LOTE_ENVIOS_POR_SEGUNDO,
+    max_tentativas: int = OCR_LOTE_MAX_TENTATIVAS,
+    cliente_http: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[dict]:
+    """
+    Processa os arquivos com OCR e gera cada resultado assim que fica pronto.
+
+    Cada resultado também é anexado a `saida` (JSONL) antes de ser gerado,
+    de modo que uma execução interrompida pode ser retomada.
+
+    Args:
+        arquivos: caminhos dos PDFs
+        saida: arquivo JSONL de resultados
+        concorrencia: máximo de documentos em processamento ao mesmo tempo
+        envios_por_segundo: limite de envios ao Azure por segundo
+        max_tentativas: tentativas de cada envio ao Azure (cada parte de um
+            PDF longo) recusado com 429 (pelo menos 1)
+        cliente_http: cliente compartilhado (um novo é criado se omitido)
+
+    Yields:
+        Dicionário com arquivo, sha256, status e páginas ou erro
+    """
+    if max_tentativas < 1:
+        raise ValueError("max_tentativas deve ser pelo menos 1")
+    concluidos = carregar_concluidos(saida)
+    semaforo = asyncio.Semaphore(concorrencia)
+    limitador = _LimitadorEnvios(envios_por_segundo)
+    cliente = cliente_http or httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=concorrencia * 2)
+    )
+    tarefas = [
+        asyncio.ensure_future(
+            _processar_arquivo(
+                caminho, concluidos, semaforo, limitador, cliente, max_tentativas
+            )
+        )
+        for caminho in arquivos
+    ]
+    try:
+        with open(saida, "a", encoding="utf-8") as arquivo_saida:
+            for proxima in asyncio.as_completed(tarefas):
+                registro = await proxima
+                if registro is None:
+                    continue
+                arquivo_saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                arquivo_saida.flush()
+                yield registro
+    finally:
+        for tarefa in tarefas:
+            tarefa.cancel()
+        # As tarefas canceladas ainda usam o cliente até terminarem
+        await asyncio.gather(*tarefas, return_exceptions=True)
+        if cliente_http is None:
+            await cliente.aclose()
+
+
+def executar_ingestao(entrada: str, saida: str, **opcoes) -> dict:
+    """
+    Versão síncrona de `ingerir_lote` para um diretório ou manifesto.
+
+    Returns:
+        Resumo com as contagens de arquivos processados com sucesso e com erro
+    """
+
+    async def consumir():
+        resumo = {"ok": 0, "erro": 0}
+        async for registro in ingerir_lote(listar_arquivos(entrada), saida, **opcoes):
+            resumo[registro["status"]] += 1
+            print(f"[{registro['status']}] {registro['arquivo']}")
+        return resumo
+
+    return asyncio.run(consumir())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão em lote de currículos")
+    parser.add_argument("entrada", help="Diretório com PDFs ou arquivo de manifesto")
+    parser.add_argument("--saida", required=True, help="Arquivo JSONL de resultados")
+    parser.add_argument("--concorrencia", type=int, default=OCR_LOTE_CONCORRENCIA)
+    parser.add_argument(
+        "--envios-por-segundo", type=float, default=OCR_LOTE_ENVIOS_POR_SEGUNDO
+    )
+    parser.add_argument("--max-tentativas", type=int, default=OCR_LOTE_MAX_TENTATIVAS)
+    args = parser.parse_args()
+    if args.max_tentativas < 1:
+        parser.error("--max-tentativas deve ser pelo menos 1")
+
+    resumo = executar_ingestao(
+        args.entrada,
+        args.saida,
+        concorrencia=args.concorrencia,
+        envios_por_segundo=args.envios_por_segundo,
+        max_tentativas=args.max_tentativas,
+    )
+    print(f"Concluído: {resumo['ok']} com sucesso, {resumo['erro']} com erro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from typing import Callable, Optional
+
+from agents.scraper_linkedin import obter_perfil_linkedin
+from config.properties import (
+    PERFIL_TIMEOUT_CURRICULO_SEGUNDOS,
+    PERFIL_TIMEOUT_LINKEDIN_SEGUNDOS,
+)
+from service.azure_vision import iterar_paginas_pdf_async
+from service.metricas import incrementar, registrar_latencia
+
+# Fontes que estouram o prazo continuam rodando até terminar; o pool é maior
+# que o necessário por envio para que elas não bloqueiem os próximos.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ingestao-perfil")
+_FIM = object()
+
+
+def coletar_perfil(
+    campos: dict,
+    curriculo_bytes: bytes,
+    linkedin_url: str,
+    ao_receber_pagina: Optional[Callable[[int, str], None]] = None,
+    timeout_curriculo: float = PERFIL_TIMEOUT_CURRICULO_SEGUNDOS,
+    timeout_linkedin: float = PERFIL_TIMEOUT_LINKEDIN_SEGUNDOS,
+) -> dict:
+    """
+    Extrai o texto do currículo e o perfil do LinkedIn ao mesmo tempo.
+
+    Cada fonte tem seu próprio prazo. Se uma delas falhar ou estourar o prazo,
+    o dicionário é montado com uma mensagem no lugar do conteúdo (ou com as
+    páginas do currículo que já tinham chegado), em vez de interromper o envio.
+
+    Args:
+        campos: dados do formulário (nome, curso, áreas etc.)
+        curriculo_bytes: conteúdo do PDF do currículo
+        linkedin_url: URL do perfil do LinkedIn
+        ao_receber_pagina: chamado na thread de quem chamou com (número,
+            texto) de cada página do currículo, assim que ela fica pronta
+        timeout_curriculo: prazo em segundos para o currículo
+        timeout_linkedin: prazo em segundos para o LinkedIn
+
+    Returns:
+        `campos` acrescido de linkedin_dados, linkedin_hash (None se o perfil
+        não pôde ser lido), curriculo_texto, timestamp e perfil_hash (ver
+        `hash_perfil`)
+    """
+    inicio = time.monotonic()
+    paginas_recebidas = queue.Queue()
+    futuro_linkedin = _executor.submit(
+        _medir, "linkedin", obter_perfil_linkedin, linkedin_url
+    )
+    futuro_curriculo = _executor.submit(
+        _medir, "curriculo", _ler_curriculo, curriculo_bytes, paginas_recebidas
+    )
+
+    # As páginas são repassadas nesta thread, que é a única que pode
+    # desenhar na interface do Streamlit.
+    paginas = []
+    prazo_curriculo = inicio + timeout_curriculo
+    while True:
+        try:
+            item = paginas_recebidas.get(
+                timeout=max(prazo_curriculo - time.monotonic(), 0)
+            )
+        except queue.Empty:
+            break
+        if item is _FIM:
+            break
+        numero, texto = item
+        paginas.append(texto)
+        if ao_receber_pagina:
+            ao_receber_pagina(numero, texto)
+
+    curriculo_texto = _obter_resultado(
+        futuro_curriculo,
+        "curriculo",
+        max(prazo_curriculo - time.monotonic(), 0),
+        f"Erro ao extrair texto do currículo: tempo limite de "
+        f"{timeout_curriculo:.0f}s excedido",
+        "Erro ao extrair texto do currículo",
+        # Aproveita as páginas que chegaram antes da falha
+        parcial="\n".join(paginas) if paginas else None,
+    )
+
+    perfil_linkedin = _obter_resultado(
+        futuro_linkedin,
+        "linkedin",
+        max(inicio + timeout_linkedin - time.monotonic(), 0),
+        f"Erro ao extrair dados do LinkedIn: tempo limite de "
+        f"{timeout_linkedin:.0f}s excedido",
+        "Erro ao extrair dados do LinkedIn",
+    )
+    if isinstance(perfil_linkedin, dict):
+        linkedin_dados, linkedin_hash = (
+            perfil_linkedin["texto"],
+            perfil_linkedin["hash"],
+        )
+    else:
+        linkedin_dados, linkedin_hash = perfil_linkedin, None
+
+    dados = {
+        **campos,
+        "linkedin": linkedin_url,
+        "linkedin_dados": linkedin_dados,
+        "linkedin_hash": linkedin_hash,
+        "curriculo_texto": curriculo_texto,
+        "timestamp": datetime.now().isoformat(),
+    }
+    dados["perfil_hash"] = hash_perfil(dados)
+    return dados
+
+
+def hash_perfil(dados: dict) -> str:
+    """
+    Digest do conteúdo que os passos seguintes usam do perfil (formulário,
+    currículo e LinkedIn, este pelo linkedin_hash quando disponível). Um
+    reenvio sem mudanças tem o mesmo digest, e o que já foi calculado para
+    ele pode ser reaproveitado.
+    """
+    conteudo = {
+        campo: dados.get(campo)
+        for campo in ("nome", "curso", "semestre", "areas", "setores", "linkedin")
+    }
+    conteudo["curriculo_texto"] = dados.get("curriculo_texto")
+    conteudo["linkedin_conteudo"] = dados.get("linkedin_hash") or dados.get(
+        "linkedin_dados"
+    )
+    return hashlib.sha256(
+        json.dumps(conteudo, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _ler_curriculo(curriculo_bytes, paginas_recebidas):
+    paginas = []
+
+    async def consumir():
+        async for numero, texto in iterar_paginas_pdf_async(curriculo_bytes):
+            paginas.append(texto)
+            paginas_recebidas.put((numero, texto))
+
+    try:
+        asyncio.run(consumir())
+    finally:
+        paginas_recebidas.put(_FIM)
+    return "\n".join(paginas)
+
+
+def _medir(fonte, funcao, *args):
+    inicio = time.perf_counter()
+    status = "erro"
+    try:
+        resultado = funcao(*args)
+        status = "ok"
+        return resultado
+    finally:
+        registrar_latencia(
+            "ingestao_perfil", time.perf_counter() - inicio, fonte=fonte, status=status
+        )
+
+
+def _obter_resultado(
+    futuro, fonte, timeout, mensagem_timeout, prefixo_erro, parcial=None
+):
+    try:
+        return futuro.result(timeout=timeout)
+    except FuturesTimeoutError:
+        incrementar("ingestao_perfil_timeouts", fonte=fonte)
+        print(f"[ingestao_perfil] {fonte} excedeu o tempo limite")
+        return parcial or mensagem_timeout
+    except Exception as e:
+        print(f"[ingestao_perfil] Erro em {fonte}: {e}")
+        return parcial or f"{prefixo_erro}: {str(e)}"
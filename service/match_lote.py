@@ -0,0 +1,230 @@
+"""
+Pontuação em lote de uma turma de candidatos contra todas as vagas indexadas.
+
+A nota de cada par (candidato, vaga) combina a similaridade de cosseno dos
+embeddings com a fração das áreas e setores escolhidos pelo candidato que
+aparecem na vaga. As duas partes são calculadas em uma só multiplicação de
+matrizes, em blocos de candidatos, e cada bloco guarda só as k melhores vagas
+de cada um.
+
+Uso:
+    python -m service.match_lote --saida matches.jsonl
+    python -m service.match_lote --saida matches.jsonl --k 20 --peso-palavras 0.5
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from config.properties import MATCH_PERFIS_POR_BLOCO, MATCH_PESO_PALAVRAS_CHAVE
+from service.categorias import CATEGORIAS, categorias_do_perfil, categorias_do_texto
+from service.indice_vetorial import (
+    IndiceVetorial,
+    normalizar_linhas,
+    obter_indice_perfis,
+    obter_indice_vagas,
+    texto_perfil,
+)
+from service.metricas import registrar_latencia
+
+_COLUNAS = {categoria: coluna for coluna, categoria in enumerate(CATEGORIAS)}
+
+
+def matriz_categorias(listas: list[list[str]]) -> np.ndarray:
+    """Matriz 0/1 (len(listas) × len(CATEGORIAS)) das categorias de cada item."""
+    matriz = np.zeros((len(listas), len(CATEGORIAS)), dtype=np.float32)
+    for linha, categorias in enumerate(listas):
+        for categoria in categorias:
+            if categoria in _COLUNAS:
+                matriz[linha, _COLUNAS[categoria]] = 1
+    return matriz
+
+
+def pontuar_em_lote(
+    vetores_perfis: np.ndarray,
+    categorias_perfis: np.ndarray,
+    vetores_vagas: np.ndarray,
+    categorias_vagas: np.ndarray,
+    k: int = 10,
+    peso_palavras: float = MATCH_PESO_PALAVRAS_CHAVE,
+    perfis_por_bloco: int = MATCH_PERFIS_POR_BLOCO,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna as `k` melhores vagas de cada perfil.
+
+    nota = (1 - peso_palavras) * cosseno + peso_palavras * cobertura, em que
+    cobertura é a fração das categorias do perfil presentes na vaga.
+
+    Args:
+        vetores_perfis: embeddings normalizados dos perfis (P × d)
+        categorias_perfis: matriz de `matriz_categorias` dos perfis (P × C)
+        vetores_vagas: embeddings normalizados das vagas (V × d)
+        categorias_vagas: matriz de `matriz_categorias` das vagas (V × C)
+        k: vagas por perfil
+        peso_palavras: peso da cobertura de categorias, entre 0 e 1
+        perfis_por_bloco: perfis pontuados por multiplicação; limita a memória
+            a perfis_por_bloco × V notas
+
+    Returns:
+        (índices das vagas, notas), ambos P × k e ordenados da maior nota
+        para a menor
+    """
+    total_perfis, total_vagas = len(vetores_perfis), len(vetores_vagas)
+    k = min(k, total_vagas)
+    indices = np.zeros((total_perfis, k), dtype=np.int64)
+    notas = np.zeros((total_perfis, k), dtype=np.float32)
+    if total_perfis == 0 or k == 0:
+        return indices, notas
+
+    # Cosseno e cobertura viram um único produto escalar acrescentando as
+    # categorias como colunas: [(1-w)·p, w·c/|c|] · [v, c_vaga]
+    cobertura = categorias_perfis / np.maximum(
+        categorias_perfis.sum(axis=1, keepdims=True), 1
+    )
+    perfis = np.hstack(
+        [(1 - peso_palavras) * vetores_perfis, peso_palavras * cobertura]
+    ).astype(np.float32)
+    vagas_t = np.ascontiguousarray(
+        np.hstack([vetores_vagas, categorias_vagas]).astype(np.float32).T
+    )
+
+    for inicio in range(0, total_perfis, perfis_por_bloco):
+        bloco = perfis[inicio : inicio + perfis_por_bloco] @ vagas_t
+        melhores = np.argpartition(-bloco, k - 1, axis=1)[:, :k]
+        notas_melhores = np.take_along_axis(bloco, melhores, axis=1)
+        ordem = np.argsort(-notas_melhores, axis=1)
+        fim = inicio + len(bloco)
+        indices[inicio:fim] = np.take_along_axis(melhores, ordem, axis=1)
+        notas[inicio:fim] = np.take_along_axis(notas_melhores, ordem, axis=1)
+    return indices, notas
+
+
+def _categorias_das_vagas(metadados: list[dict]) -> np.ndarray:
+    return matriz_categorias(
+        [
+            (
+                item["categorias"]
+                if "categorias" in item
+                else categorias_do_texto(item.get("title") or "")
+            )
+            for item in metadados
+        ]
+    )
+
+
+def ranquear_turma(
+    perfis: list[dict],
+    k: int = 10,
+    indice_vagas: Optional[IndiceVetorial] = None,
+    peso_palavras: float = MATCH_PESO_PALAVRAS_CHAVE,
+) -> list[list[tuple[str, float, dict]]]:
+    """
+    Pontua perfis consolidados (como os de `coletar_perfil`) contra todas as
+    vagas do índice.
+
+    Returns:
+        Para cada perfil, na mesma ordem, a lista de (id da vaga, nota,
+        metadados da vaga) das `k` melhores
+    """
+    indice_vagas = indice_vagas or obter_indice_vagas()
+    ids, vetores_vagas, metadados = indice_vagas.exportar()
+    vetores_perfis = normalizar_linhas(
+        indice_vagas.embeddings.gerar([texto_perfil(perfil) for perfil in perfis])
+    )
+    indices, notas = pontuar_em_lote(
+        vetores_perfis,
+        matriz_categorias([categorias_do_perfil(perfil) for perfil in perfis]),
+        vetores_vagas,
+        _categorias_das_vagas(metadados),
+        k=k,
+        peso_palavras=peso_palavras,
+    )
+    return [
+        [
+            (ids[posicao], float(nota), metadados[posicao])
+            for posicao, nota in zip(linha_indices, linha_notas)
+        ]
+        for linha_indices, linha_notas in zip(indices, notas)
+    ]
+
+
+def ranquear_perfis_indexados(
+    k: int = 10, peso_palavras: float = MATCH_PESO_PALAVRAS_CHAVE
+) -> list[dict]:
+    """
+    Pontua todos os perfis do índice de perfis contra todas as vagas, usando
+    os embeddings já guardados (nenhuma chamada ao modelo).
+
+    Returns:
+        Um dicionário por perfil: {"perfil": id, "nome", "vagas": [...]}
+    """
+    inicio = time.perf_counter()
+    ids_perfis, vetores_perfis, perfis = obter_indice_perfis().exportar()
+    ids_vagas, vetores_vagas, vagas = obter_indice_vagas().exportar()
+    indices, notas = pontuar_em_lote(
+        vetores_perfis,
+        matriz_categorias([categorias_do_perfil(perfil) for perfil in perfis]),
+        vetores_vagas,
+        _categorias_das_vagas(vagas),
+        k=k,
+        peso_palavras=peso_palavras,
+    )
+    registrar_latencia("match_lote", time.perf_counter() - inicio)
+    return [
+        {
+            "perfil": id_perfil,
+            "nome": perfil.get("nome"),
+            "vagas": [
+                {
+                    "id": ids_vagas[posicao],
+                    "nota": round(float(nota), 4),
+                    **{
+                        campo: vagas[posicao].get(campo)
+                        for campo in ("title", "company", "place", "link")
+                    },
+                }
+                for posicao, nota in zip(linha_indices, linha_notas)
+            ],
+        }
+        for id_perfil, perfil, linha_indices, linha_notas in zip(
+            ids_perfis, perfis, indices, notas
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pontua todos os candidatos cadastrados contra todas as vagas coletadas."
+    )
+    parser.add_argument("--saida", help="arquivo JSONL de saída (padrão: stdout)")
+    parser.add_argument("--k", type=int, default=10, help="vagas por candidato")
+    parser.add_argument(
+        "--peso-palavras",
+        type=float,
+        default=MATCH_PESO_PALAVRAS_CHAVE,
+        help="peso da cobertura de áreas e setores na nota, entre 0 e 1",
+    )
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultados = ranquear_perfis_indexados(args.k, args.peso_palavras)
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        for resultado in resultados:
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+    print(
+        f"{len(resultados)} candidatos pontuados em "
+        f"{time.perf_counter() - inicio:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import threading
+from collections import defaultdict, deque
+
+MAXIMO_AMOSTRAS = 1000
+
+_lock = threading.Lock()
+_contadores = defaultdict(int)
+_latencias = defaultdict(lambda: deque(maxlen=MAXIMO_AMOSTRAS))
+
+
+def _nome_com_rotulos(nome, rotulos):
+    if not rotulos:
+        return nome
+    pares = ",".join(f"{chave}={valor}" for chave, valor in sorted(rotulos.items()))
+    return f"{nome}{{{pares}}}"
+
+
+def incrementar(nome: str, valor: int = 1, **rotulos):
+    """
+    Soma `valor` ao contador `nome`, separado pelos rótulos informados.
+
+    Ex.: incrementar("ocr_paginas", origem="azure")
+    """
+    with _lock:
+        _contadores[_nome_com_rotulos(nome, rotulos)] += valor
+
+
+def registrar_latencia(nome: str, segundos: float, **rotulos):
+    """Guarda uma amostra de latência (são mantidas as últimas MAXIMO_AMOSTRAS)."""
+    with _lock:
+        _latencias[_nome_com_rotulos(nome, rotulos)].append(segundos)
+
+
+def _percentil(valores_ordenados, percentual):
+    indice = round(percentual / 100 * (len(valores_ordenados) - 1))
+    return valores_ordenados[indice]
+
+
+def obter_metricas() -> dict:
+    """
+    Retorna um retrato dos contadores e um resumo das latências registradas.
+
+    Returns:
+        {"contadores": {nome: valor}, "latencias": {nome: {quantidade, media,
+        p50, p95, maximo}}}
+    """
+    with _lock:
+        contadores = dict(_contadores)
+        amostras = {nome: sorted(valores) for nome, valores in _latencias.items()}
+
+    latencias = {}
+    for nome, valores in amostras.items():
+        if not valores:
+            continue
+        latencias[nome] = {
+            "quantidade": len(valores),
+            "media": sum(valores) / len(valores),
+            "p50": _percentil(valores, 50),
+            "p95": _percentil(valores, 95),
+            "maximo": valores[-1],
+        }
+    return {"contadores": contadores, "latencias": latencias}
+
+
+def zerar_metricas():
+    with _lock:
+        _contadores.clear()
+        _latencias.clear()
@@ -0,0 +1,65 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+_DIACRITICOS = re.compile(r"[\u0300-\u036f]")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: "Gestão" -> "gestao"."""
+    texto = (texto or "").lower()
+    if texto.isascii():
+        return texto
+    return _DIACRITICOS.sub("", unicodedata.normalize("NFKD", texto))
+
+
+def tokens(texto: str) -> list[str]:
+    """Palavras normalizadas com mais de um caractere, na ordem do texto."""
+    return [token for token in re.findall(r"\w+", normalizar(texto)) if len(token) > 1]
+
+
+# Palavras muito frequentes em português (já sem acento), que não ajudam a
+# distinguir uma vaga de outra; inclui termos comuns a quase todo anúncio
+STOPWORDS = frozenset("""
+    a ao aos aquela aquele aqueles as ate com como da das de dela dele deles
+    do dos e ela ele eles em entre era essa esse esta este eu foi for ha isso
+    isto ja la lhe mais mas me mesmo meu minha muito na nas nao nem no nos
+    nossa nosso num numa o os ou para pela pelas pelo pelos por qual quando
+    que quem se sem ser seu sua suas seus so sobre tambem te tem ter um uma
+    umas uns voce voces vai vamos sao esta estao
+    vaga vagas oportunidade empresa
+    """.split())
+
+_PLURAIS = [
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ns", "m"),
+    ("res", "r"),
+    ("zes", "z"),
+]
+
+
+def singular(palavra: str) -> str:
+    """
+    Reduz o plural de uma palavra já normalizada, pelas regras mais comuns do
+    português: "gestoes" -> "gestao", "analistas" -> "analista".
+    """
+    if len(palavra) <= 3 or not palavra.endswith("s"):
+        return palavra
+    for sufixo, troca in _PLURAIS:
+        if palavra.endswith(sufixo) and len(palavra) > len(sufixo) + 1:
+            return palavra[: -len(sufixo)] + troca
+    return palavra[:-1]
+
+
+@lru_cache(maxsize=100_000)
+def _termo(token: str) -> Optional[str]:
+    return None if token in STOPWORDS else singular(token)
+
+
+def termos(texto: str) -> list[str]:
+    """Tokens sem stopwords e no singular, usados pelo índice de palavras-chave."""
+    return [termo for termo in map(_termo, tokens(texto)) if termo]
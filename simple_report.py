@@ -3,22 +3,9 @@ Este arquivo contém função simplificada para gerar relatórios para vagas.
 """
 
 import streamlit as st
-from service.azure_llm import llm  # Importando o modelo de linguagem
+from service.cache_llm import completar_com_cache
 
-
-def gerar_relatorio_simples(vaga, perfil_candidato):
-    """
-    Gera um relatório simplificado de preparação para a vaga baseado no perfil do candidato.
-
-    Args:
-        vaga (str): Descrição da vaga
-        perfil_candidato (str): Dados do perfil do candidato
-
-    Returns:
-        str: Relatório formatado de preparação para a entrevista
-    """
-    try:
-        prompt = f"""
+TEMPLATE_RELATORIO_SIMPLES = """
         Você é um especialista em carreiras e orientação profissional. Gere um relatório detalhado de preparação para 
         uma entrevista de emprego com base nos dados a seguir:
         
@@ -39,17 +26,23 @@ def gerar_relatorio_simples(vaga, perfil_candidato):
         Organize o relatório em seções claras e forneça orientações práticas.
         """
 
-        # Chamando o modelo de linguagem para gerar o relatório
-        response = llm.complete(prompt)
 
-        # Formatando o resultado como string
-        if hasattr(response, "text"):
-            return response.text
-        elif hasattr(response, "content"):
-            return response.content
-        else:
-            return str(response)
+def gerar_relatorio_simples(vaga, perfil_candidato):
+    """
+    Gera um relatório simplificado de preparação para a vaga baseado no perfil do candidato.
+
+    Args:
+        vaga (str): Descrição da vaga
+        perfil_candidato (str): Dados do perfil do candidato
 
+    Returns:
+        str: Relatório formatado de preparação para a entrevista
+    """
+    try:
+        # Mesmo prompt, vaga e perfil: resposta do cache em disco
+        return completar_com_cache(
+            TEMPLATE_RELATORIO_SIMPLES, vaga=vaga, perfil_candidato=perfil_candidato
+        )
     except Exception as e:
         return f"Erro ao gerar relatório: {str(e)}\n\nPor favor, tente novamente mais tarde."
 
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Os módulos criam clientes e caches na importação; valores fictícios e um
+# diretório de cache temporário bastam para os testes.
+os.environ.setdefault("AZURE_COMPUTER_VISION_ENDPOINT", "http://localhost")
+os.environ.setdefault("AZURE_COMPUTER_VISION_API_KEY", "teste")
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="cache-testes-"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
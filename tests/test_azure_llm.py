@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("llama_index.llms.azure_openai")
+
+from benchmarks.servidor_openai_falso import ServidorOpenAIFalso  # noqa: E402
+from service.azure_llm import GatewayLLM, LLMLimiteRequisicoesException  # noqa: E402
+
+
+@pytest.fixture
+def criar_gateway():
+    gateways = []
+
+    def criar(servidor, **opcoes):
+        opcoes = {"requisicoes_por_minuto": 0, "tokens_por_minuto": 0, **opcoes}
+        gateway = GatewayLLM(servidor.endpoint, "teste", "modelo", **opcoes)
+        gateways.append(gateway)
+        return gateway
+
+    yield criar
+    for gateway in gateways:
+        gateway.fechar()
+
+
+def completar_varios(gateway, prompts, **opcoes):
+    async def todos():
+        return await asyncio.gather(
+            *(gateway.completar_async(prompt, **opcoes) for prompt in prompts)
+        )
+
+    return asyncio.run(todos())
+
+
+def test_429_espera_o_retry_after_ms_e_repete(criar_gateway):
+    # Retry-After diz 1s e retry-after-ms 0,4s: vale o mais preciso
+    with ServidorOpenAIFalso(atraso=0, recusas_429=2, retry_after=0.4) as servidor:
+        gateway = criar_gateway(servidor)
+        inicio = time.monotonic()
+        texto = gateway.completar("olá")
+        duracao = time.monotonic() - inicio
+    assert texto == "resposta: olá"
+    assert servidor.requisicoes == 3
+    # Duas esperas de 0,4s mais até 50% de jitter cada
+    assert 0.8 <= duracao < 1.8
+
+
+def test_429_em_todas_as_tentativas_levanta_limite_de_requisicoes(criar_gateway):
+    with ServidorOpenAIFalso(atraso=0, recusas_429=5, retry_after=0.1) as servidor:
+        gateway = criar_gateway(servidor, max_tentativas=3)
+        with pytest.raises(LLMLimiteRequisicoesException) as erro:
+            gateway.completar("olá")
+    assert erro.value.retry_after == pytest.approx(0.1)
+    assert servidor.requisicoes == 3
+
+
+def test_prompts_identicos_simultaneos_fazem_uma_requisicao(criar_gateway):
+    with ServidorOpenAIFalso(atraso=0.3) as servidor:
+        gateway = criar_gateway(servidor)
+        textos = completar_varios(gateway, ["mesmo prompt"] * 5 + ["outro"])
+    assert textos == ["resposta: mesmo prompt"] * 5 + ["resposta: outro"]
+    assert servidor.requisicoes == 2
+
+
+def test_fechar_o_fluxo_no_meio_fecha_a_resposta(criar_gateway):
+    prompt = " ".join(f"palavra{numero}" for numero in range(40))
+    with ServidorOpenAIFalso(atraso=0, atraso_por_pedaco=0.1) as servidor:
+        gateway = criar_gateway(servidor)
+        inicio = time.monotonic()
+        fluxo = gateway.completar_em_fluxo(prompt)
+        assert next(fluxo) == "resposta: "
+        fluxo.close()
+        # O servidor percebe a conexão fechada na próxima escrita
+        while servidor.fluxos_interrompidos == 0 and time.monotonic() - inicio < 3:
+            time.sleep(0.05)
+        duracao = time.monotonic() - inicio
+    assert servidor.fluxos_interrompidos == 1
+    # O fluxo completo levaria mais de 4s
+    assert duracao < 3
+
+
+def test_limite_de_requisicoes_por_minuto_atrasa_a_rajada(criar_gateway):
+    # Balde de 60 requisições, reabastecido a 1 por segundo
+    with ServidorOpenAIFalso(atraso=0) as servidor:
+        gateway = criar_gateway(servidor, requisicoes_por_minuto=60)
+        inicio = time.monotonic()
+        completar_varios(gateway, [f"prompt {numero}" for numero in range(62)])
+        duracao = time.monotonic() - inicio
+    assert servidor.requisicoes == 62
+    assert duracao >= 1.9
+
+
+def test_limite_de_tokens_por_minuto_atrasa_a_rajada(criar_gateway):
+    # Cada pedido reserva ~300 tokens de um balde de 600: o terceiro espera a
+    # resposta de um dos dois primeiros devolver o que não foi usado
+    with ServidorOpenAIFalso(atraso=0.5) as servidor:
+        gateway = criar_gateway(servidor, tokens_por_minuto=600)
+        inicio = time.monotonic()
+        textos = completar_varios(
+            gateway, ["primeiro", "segundo", "terceiro"], max_tokens=295
+        )
+        duracao = time.monotonic() - inicio
+    assert textos == ["resposta: primeiro", "resposta: segundo", "resposta: terceiro"]
+    # Sem a devolução, o balde levaria ~30s para ter os tokens do terceiro
+    assert 0.95 <= duracao < 5
+
+
+def test_max_tentativas_menor_que_um_e_recusado():
+    with pytest.raises(ValueError):
+        GatewayLLM("http://localhost", "teste", "modelo", max_tentativas=0)
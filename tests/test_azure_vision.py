@@ -0,0 +1,126 @@
+import asyncio
+import io
+import time
+from types import SimpleNamespace
+
+import pytest
+from pypdf import PdfWriter
+
+import service.azure_vision as azure_vision
+from benchmarks.servidor_read_falso import ServidorReadFalso
+from ocr.models import (
+    OCRDocumentoFalhaAzureException,
+    OCRLimiteRequisicoesAzureException,
+    OCRTempoEsgotadoAzureException,
+)
+from service.azure_vision import ocr_async
+
+TEXTO = "Experiência\nPython e SQL".encode()
+
+
+def executar_ocr(servidor, **opcoes):
+    return asyncio.run(
+        ocr_async(TEXTO, endpoint=servidor.endpoint, chave_api="teste", **opcoes)
+    )
+
+
+def test_ocr_async_retorna_texto_das_paginas():
+    with ServidorReadFalso(atraso_por_pagina=0) as servidor:
+        _, textos = executar_ocr(servidor)
+    assert textos == ["Experiência\nPython e SQL"]
+
+
+def test_ocr_async_respeita_retry_after_da_consulta():
+    # Sem o header, a segunda consulta sairia ~0,75s após o envio
+    with ServidorReadFalso(atraso_por_pagina=0.3, retry_after=1) as servidor:
+        inicio = time.monotonic()
+        _, textos = executar_ocr(servidor)
+        duracao = time.monotonic() - inicio
+    assert textos == ["Experiência\nPython e SQL"]
+    assert servidor.consultas == 2
+    assert duracao >= 1.2
+
+
+def test_ocr_async_envio_recusado_com_429_informa_retry_after():
+    with ServidorReadFalso(atraso_por_pagina=0, recusas_429=1) as servidor:
+        with pytest.raises(OCRLimiteRequisicoesAzureException) as erro:
+            executar_ocr(servidor)
+        assert erro.value.retry_after == 1
+        assert servidor.envios == 1
+
+        _, textos = executar_ocr(servidor)
+    assert textos == ["Experiência\nPython e SQL"]
+
+
+def test_ocr_async_esgota_o_prazo():
+    with ServidorReadFalso(atraso_por_pagina=10) as servidor:
+        inicio = time.monotonic()
+        with pytest.raises(OCRTempoEsgotadoAzureException):
+            executar_ocr(servidor, prazo_segundos=0.5)
+        duracao = time.monotonic() - inicio
+    assert duracao < 1.5
+
+
+def test_falha_de_uma_parte_encerra_as_demais_antes_de_fechar_o_cliente(
+    monkeypatch,
+):
+    escritor = PdfWriter()
+    for _ in range(6):
+        escritor.add_blank_page(width=612, height=792)
+    saida = io.BytesIO()
+    escritor.write(saida)
+
+    em_andamento = set()
+
+    async def ocr_falso(conteudo, *args, cliente_http=None, **kwargs):
+        tarefa = asyncio.current_task()
+        em_andamento.add(tarefa)
+        try:
+            if len(em_andamento) == 1:
+                await asyncio.sleep(0.05)
+                raise OCRDocumentoFalhaAzureException("erro real da parte")
+            await asyncio.sleep(10)
+        finally:
+            em_andamento.discard(tarefa)
+
+    class ClienteFalso:
+        async def aclose(self):
+            assert not em_andamento
+
+    monkeypatch.setattr(azure_vision, "ocr_async", ocr_falso)
+    monkeypatch.setattr(azure_vision.httpx, "AsyncClient", ClienteFalso)
+
+    with pytest.raises(OCRDocumentoFalhaAzureException) as erro:
+        asyncio.run(
+            azure_vision._ocr_em_partes_async(
+                saida.getvalue(),
+                [1, 2, 3, 4, 5, 6],
+                azure_vision.TOLERANCIA_VERTICAL_PADRAO,
+                azure_vision.IDIOMA_PADRAO,
+            )
+        )
+    assert erro.value.mensagem == "erro real da parte"
+
+
+def test_obter_paginas_pdf_usa_o_texto_ja_montado_pelo_ocr(monkeypatch):
+    escritor = PdfWriter()
+    escritor.add_blank_page(width=612, height=792)
+    escritor.add_metadata({"/Title": "texto-do-ocr"})
+    saida = io.BytesIO()
+    escritor.write(saida)
+
+    def ocr_falso(conteudo, tolerancia_vertical, idioma, paginas=None):
+        pagina = SimpleNamespace(page=1, lines=[])
+        resultado = SimpleNamespace(
+            analyze_result=SimpleNamespace(read_results=[pagina])
+        )
+        return resultado, ["Experiência\nPython e SQL"]
+
+    def agrupar(*args):
+        raise AssertionError("as linhas não devem ser agrupadas de novo")
+
+    monkeypatch.setattr(azure_vision, "ocr", ocr_falso)
+    monkeypatch.setattr(azure_vision, "_obter_texto_da_pagina", agrupar)
+
+    paginas = azure_vision.obter_paginas_pdf(saida.getvalue())
+    assert paginas == ["Experiência\nPython e SQL"]
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+pytest.importorskip("linkedin_jobs_scraper")
+pytest.importorskip("jobspy")
+
+from tools.fontes_vagas import (  # noqa: E402
+    Deduplicador,
+    FonteGravada,
+    FonteJobspy,
+    _parecidos,
+    iterar_vagas_agregadas,
+)
+from tools.procurar_vagas import FonteLinkedin, build_query  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_parecidos_so_aceita_campo_vazio_dos_dois_lados():
+    assert _parecidos("", "", 0.85)
+    assert not _parecidos("", "acme", 0.85)
+    assert not _parecidos("acme", "", 0.85)
+
+
+def test_vagas_repetidas_entre_fontes_sao_descartadas():
+    fontes = [
+        FonteGravada(FonteLinkedin(), os.path.join(FIXTURES, "vagas_linkedin.json")),
+        FonteGravada(FonteJobspy(), os.path.join(FIXTURES, "vagas_jobspy.json")),
+    ]
+    deduplicador = Deduplicador()
+    entregues = dict(
+        iterar_vagas_agregadas(
+            "analista de dados",
+            build_query("analista de dados", ""),
+            fontes,
+            deduplicador,
+        )
+    )
+
+    assert set(entregues) == {"linkedin", "jobspy"}
+    assert sum(len(vagas) for vagas in entregues.values()) == len(deduplicador.vagas)
+    vistas = sorted((vaga["title"], vaga["company"]) for vaga in deduplicador.vagas)
+    # A mesma vaga da Acme veio do LinkedIn, do Indeed e do Glassdoor, e a da
+    # Globex duas vezes pelo mesmo link; a vaga sem empresa não é confundida
+    # com a da Initech
+    assert [titulo for titulo, _ in vistas] == [
+        "Analista de Dados",
+        "Desenvolvedor Python",
+        "Desenvolvedora Back-end",
+        "Estagiário de Dados",
+        "Estagiário de Dados",
+    ]
+    assert {empresa for titulo, empresa in vistas if "Estagiário" in titulo} == {
+        "",
+        "Initech",
+    }
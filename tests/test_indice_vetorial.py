@@ -0,0 +1,49 @@
+from service.indice_vetorial import EmbeddingsHash, IndiceVetorial
+
+
+def itens(*ids):
+    return [(id_item, f"vaga de {id_item}", {"id": id_item}) for id_item in ids]
+
+
+def test_dois_processos_gravando_o_mesmo_indice_nao_apagam_um_ao_outro(tmp_path):
+    caminho = str(tmp_path / "indice.sqlite3")
+    embeddings = EmbeddingsHash(dimensao=64)
+    # O app e o agendador de coletas abrem o índice ao mesmo tempo
+    app = IndiceVetorial(embeddings, caminho)
+    agendador = IndiceVetorial(embeddings, caminho)
+
+    app.adicionar(itens("python", "dados"))
+    app.salvar()
+    agendador.adicionar(itens("java"))
+    agendador.salvar()
+    app.remover(["dados"])
+    app.salvar()
+
+    assert "python" in agendador and "java" in app
+    agendador.sincronizar()
+    assert "dados" not in agendador
+    novo = IndiceVetorial(embeddings, caminho)
+    assert sorted(novo.exportar()[0]) == ["java", "python"]
+    assert novo.buscar("vaga de java", k=1)[0][0] == "java"
+
+
+def test_salvar_grava_so_os_itens_alterados(tmp_path):
+    caminho = str(tmp_path / "indice.sqlite3")
+    indice = IndiceVetorial(EmbeddingsHash(dimensao=64), caminho)
+    indice.adicionar(itens("a", "b", "c"))
+    indice.salvar()
+
+    indice.adicionar(itens("a", "b", "d"))
+    indice.salvar()
+
+    # Só "d" é novo; "a" e "b" não mudaram de texto
+    assert indice._versao == 4
+
+
+def test_indice_de_outros_embeddings_e_refeito(tmp_path):
+    caminho = str(tmp_path / "indice.sqlite3")
+    indice = IndiceVetorial(EmbeddingsHash(dimensao=64), caminho)
+    indice.adicionar(itens("a"))
+    indice.salvar()
+
+    assert len(IndiceVetorial(EmbeddingsHash(dimensao=32), caminho)) == 0
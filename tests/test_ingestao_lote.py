@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+from pypdf import PdfWriter
+
+import service.azure_vision as azure_vision
+import service.ingestao_lote as ingestao_lote
+from benchmarks.servidor_read_falso import ServidorReadFalso
+from service.ingestao_lote import ingerir_lote
+
+
+async def coletar(arquivos, saida, **opcoes):
+    return [registro async for registro in ingerir_lote(arquivos, saida, **opcoes)]
+
+
+def test_arquivo_ausente_vira_registro_de_erro(tmp_path):
+    saida = tmp_path / "resultados.jsonl"
+    ausentes = [str(tmp_path / "nao_existe.pdf"), str(tmp_path / "outro.pdf")]
+
+    registros = asyncio.run(coletar(ausentes, str(saida)))
+
+    assert sorted(registro["arquivo"] for registro in registros) == sorted(ausentes)
+    assert all(registro["status"] == "erro" for registro in registros)
+    gravados = [json.loads(linha) for linha in saida.read_text().splitlines()]
+    assert len(gravados) == 2
+
+
+def test_max_tentativas_menor_que_um_e_recusado(tmp_path):
+    with pytest.raises(ValueError):
+        asyncio.run(coletar([], str(tmp_path / "saida.jsonl"), max_tentativas=0))
+
+
+def test_parar_no_meio_encerra_as_tarefas_antes_de_fechar_o_cliente(
+    tmp_path, monkeypatch
+):
+    arquivos = []
+    for nome in ("rapido.pdf", "lento.pdf", "lento2.pdf"):
+        caminho = tmp_path / nome
+        caminho.write_bytes(nome.encode())
+        arquivos.append(str(caminho))
+    em_andamento = set()
+
+    async def ocr_falso(conteudo, **kwargs):
+        tarefa = asyncio.current_task()
+        em_andamento.add(tarefa)
+        try:
+            await asyncio.sleep(0 if conteudo == b"rapido.pdf" else 10)
+            return ["texto"]
+        finally:
+            em_andamento.discard(tarefa)
+
+    class ClienteFalso:
+        def __init__(self, **kwargs):
+            self.fechado = False
+
+        async def aclose(self):
+            assert not em_andamento
+            self.fechado = True
+
+    clientes = []
+
+    def criar_cliente(**kwargs):
+        clientes.append(ClienteFalso(**kwargs))
+        return clientes[-1]
+
+    monkeypatch.setattr(ingestao_lote, "obter_paginas_pdf_async", ocr_falso)
+    monkeypatch.setattr(ingestao_lote.httpx, "AsyncClient", criar_cliente)
+
+    async def primeiro():
+        # Sem espaçamento, para os três começarem juntos
+        lote = ingerir_lote(
+            arquivos, str(tmp_path / "saida.jsonl"), envios_por_segundo=0
+        )
+        registro = await lote.__anext__()
+        await lote.aclose()
+        return registro
+
+    registro = asyncio.run(primeiro())
+    assert registro["arquivo"] == arquivos[0]
+    assert clientes[0].fechado
+
+
+def test_429_em_uma_parte_repete_so_ela_e_cada_envio_passa_pelo_limitador(
+    tmp_path, monkeypatch
+):
+    # Seis páginas sem texto, enviadas ao Azure em três partes de duas
+    escritor = PdfWriter()
+    for _ in range(6):
+        escritor.add_blank_page(width=612, height=792)
+    escritor.add_metadata({"/Title": "partes-com-429"})
+    caminho = tmp_path / "longo.pdf"
+    with open(caminho, "wb") as arquivo:
+        escritor.write(arquivo)
+    monkeypatch.setattr(azure_vision, "OCR_PARALELO_HABILITADO", True)
+    monkeypatch.setattr(azure_vision, "OCR_PARALELO_LIMIAR_PAGINAS", 2)
+    monkeypatch.setattr(azure_vision, "OCR_PARALELO_PAGINAS_POR_PARTE", 2)
+
+    with ServidorReadFalso(atraso_por_pagina=0, recusas_429=1) as servidor:
+        monkeypatch.setattr(
+            azure_vision, "AZURE_COMPUTER_VISION_ENDPOINT", servidor.endpoint
+        )
+        [registro] = asyncio.run(
+            coletar(
+                [str(caminho)],
+                str(tmp_path / "saida.jsonl"),
+                envios_por_segundo=0,
+                max_tentativas=3,
+            )
+        )
+
+    assert registro["status"] == "ok"
+    assert len(registro["paginas"]) == 6
+    # Três partes mais a repetição da recusada, não o documento inteiro de novo
+    assert servidor.envios == 4
+    assert registro["envios"] == 4
@@ -0,0 +1,234 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+pytest.importorskip("linkedin_jobs_scraper")
+pytest.importorskip("jobspy")
+
+from linkedin_jobs_scraper.events import EventData  # noqa: E402
+from linkedin_jobs_scraper.filters import TimeFilters  # noqa: E402
+
+import tools.procurar_vagas as procurar_vagas  # noqa: E402
+from service.armazem_vagas import ArmazemVagas  # noqa: E402
+from service.cache import CacheDisco  # noqa: E402
+
+BUSCAS = 8
+VAGAS_POR_BUSCA = 5
+# Empresas distintas, para o deduplicador entre fontes não juntar as vagas
+EMPRESAS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli"]
+
+
+class PoolFalso:
+    """
+    Entrega as vagas de cada consulta aos poucos, intercaladas entre threads.
+
+    Args:
+        atrasos: segundos antes da primeira vaga, por termo
+        vazias: termos que não encontram nada
+        livres: resposta de `livres()`
+    """
+
+    def __init__(self, atrasos=None, vazias=(), livres=BUSCAS):
+        self.atrasos = atrasos or {}
+        self.vazias = set(vazias)
+        self._livres = livres
+        self.consultas = []
+        self.filtros_de_tempo = []
+        self.simultaneas = 0
+        self.maximo_simultaneas = 0
+        self._lock = threading.Lock()
+
+    def livres(self):
+        return self._livres
+
+    def buscar(self, query, ao_receber=None, timeout=None, cancelamento=None):
+        with self._lock:
+            self.consultas.append(query.query)
+            self.filtros_de_tempo.append(query.options.filters.time)
+            self.simultaneas += 1
+            self.maximo_simultaneas = max(self.maximo_simultaneas, self.simultaneas)
+        try:
+            espera = threading.Event() if cancelamento is None else cancelamento
+            if espera.wait(self.atrasos.get(query.query, 0)):
+                return []
+            if query.query in self.vazias:
+                return []
+            vagas = []
+            for numero in range(VAGAS_POR_BUSCA):
+                time.sleep(random.uniform(0, 0.01))
+                data = EventData(
+                    query=query.query,
+                    job_id=f"{query.query}-{numero}",
+                    link=f"https://vagas.exemplo/{query.query}/{numero}",
+                    title=f"Vaga {numero} de {query.query}",
+                    company=EMPRESAS[numero],
+                    place="Brasília/DF",
+                )
+                if ao_receber:
+                    ao_receber(data)
+                vagas.append(data)
+            return vagas
+        finally:
+            with self._lock:
+                self.simultaneas -= 1
+
+
+@pytest.fixture
+def usar_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        procurar_vagas, "armazem_vagas", ArmazemVagas(str(tmp_path / "vagas.sqlite3"))
+    )
+
+    def usar(pool):
+        monkeypatch.setattr(procurar_vagas, "obter_pool", lambda: pool)
+        return pool
+
+    return usar
+
+
+def variantes(*termos):
+    return [procurar_vagas.build_query(termo, "") for termo in termos]
+
+
+def test_buscas_simultaneas_nao_misturam_resultados(usar_pool):
+    pool = usar_pool(PoolFalso())
+    termos = [f"termo{numero}" for numero in range(BUSCAS)]
+    barreira = threading.Barrier(BUSCAS)
+
+    def buscar(termo):
+        coletor = procurar_vagas.ColetorVagas()
+        query = procurar_vagas.build_query(termo, "")
+        barreira.wait()
+        procurar_vagas.buscar_com_armazem(query, coletor)
+        return termo, coletor
+
+    with ThreadPoolExecutor(max_workers=BUSCAS) as executor:
+        resultados = list(executor.map(buscar, termos))
+
+    assert sorted(pool.consultas) == termos
+    for termo, coletor in resultados:
+        assert len(coletor) == VAGAS_POR_BUSCA
+        assert {vaga["query"] for vaga in coletor.vagas} == {termo}
+        assert all(vaga["job_id"].startswith(f"{termo}-") for vaga in coletor.vagas)
+
+
+def test_variantes_em_paralelo_preferem_a_mais_especifica(usar_pool):
+    usar_pool(PoolFalso(atrasos={"analista dados": 0.3}))
+    coletor = procurar_vagas._buscar_variantes_em_paralelo(
+        variantes("analista dados", "analista")
+    )
+    assert {vaga["query"] for vaga in coletor.vagas} == {"analista dados"}
+
+
+def test_variantes_em_paralelo_passam_para_a_seguinte_se_vazia(usar_pool):
+    usar_pool(PoolFalso(vazias={"analista dados"}))
+    coletor = procurar_vagas._buscar_variantes_em_paralelo(
+        variantes("analista dados", "analista")
+    )
+    assert {vaga["query"] for vaga in coletor.vagas} == {"analista"}
+
+
+def test_variantes_em_paralelo_esperam_a_especifica_ate_o_prazo(usar_pool, monkeypatch):
+    monkeypatch.setattr(procurar_vagas, "VAGAS_VARIANTES_PRAZO_SEGUNDOS", 0.2)
+    usar_pool(PoolFalso(atrasos={"analista dados": 10}))
+    inicio = time.monotonic()
+    coletor = procurar_vagas._buscar_variantes_em_paralelo(
+        variantes("analista dados", "analista")
+    )
+    assert {vaga["query"] for vaga in coletor.vagas} == {"analista"}
+    assert time.monotonic() - inicio < 2
+
+
+def test_variantes_em_paralelo_limitadas_aos_trabalhadores_livres(usar_pool):
+    pool = usar_pool(PoolFalso(vazias={"a", "b"}, atrasos={"a": 0.1}, livres=1))
+    coletor = procurar_vagas._buscar_variantes_em_paralelo(variantes("a", "b", "c"))
+    assert {vaga["query"] for vaga in coletor.vagas} == {"c"}
+    assert pool.consultas == ["a", "b", "c"]
+    assert pool.maximo_simultaneas == 1
+
+
+def test_atualizar_busca_coleta_mesmo_com_a_consulta_fresca_no_armazem(
+    usar_pool, monkeypatch, tmp_path
+):
+    pool = usar_pool(PoolFalso())
+    monkeypatch.setattr(procurar_vagas, "VAGAS_FONTES", "linkedin")
+    monkeypatch.setattr(procurar_vagas, "VAGAS_VARIANTES_PARALELAS", False)
+    monkeypatch.setattr(
+        procurar_vagas,
+        "cache_buscas",
+        CacheDisco(str(tmp_path / "buscas.sqlite3"), tamanho_maximo_bytes=2**20),
+    )
+    monkeypatch.setattr(procurar_vagas, "_indexar", lambda vagas: None)
+
+    procurar_vagas.atualizar_busca("analista", locations=["Brasília/DF"])
+    vagas = procurar_vagas.atualizar_busca("analista", locations=["Brasília/DF"])
+
+    assert pool.consultas == ["analista", "analista"]
+    # A segunda coleta pede só o que saiu desde a primeira
+    assert pool.filtros_de_tempo[1] == TimeFilters.DAY
+    assert len(vagas) == VAGAS_POR_BUSCA
+
+    # Uma busca comum continua respondida pelo armazém
+    coletor = procurar_vagas.ColetorVagas()
+    procurar_vagas.buscar_com_armazem(
+        procurar_vagas.build_query("analista", "", ["Brasília/DF"]), coletor
+    )
+    assert len(pool.consultas) == 2
+    assert len(coletor) == VAGAS_POR_BUSCA
+
+
+def test_busca_do_usuario_e_respondida_pelas_vagas_do_agendador(
+    usar_pool, monkeypatch, tmp_path
+):
+    pool = usar_pool(PoolFalso())
+    monkeypatch.setattr(procurar_vagas, "VAGAS_FONTES", "linkedin")
+    monkeypatch.setattr(procurar_vagas, "VAGAS_VARIANTES_PARALELAS", False)
+    monkeypatch.setattr(
+        procurar_vagas,
+        "cache_buscas",
+        CacheDisco(str(tmp_path / "buscas.sqlite3"), tamanho_maximo_bytes=2**20),
+    )
+    monkeypatch.setattr(procurar_vagas, "_indexar", lambda vagas: None)
+    # O índice de palavras é refeito a partir do armazém deste teste
+    monkeypatch.setattr(procurar_vagas, "_indice_palavras", None)
+
+    procurar_vagas.atualizar_busca("analista", locations=["Brasília/DF"])
+    # Outra chave: termo complementar e a localização padrão
+    vagas = procurar_vagas.buscar_vagas("analista", "vagas de analista em tecnologia")
+
+    assert pool.consultas == ["analista"]
+    assert len(vagas) == VAGAS_POR_BUSCA
+
+    # Em outra cidade as vagas armazenadas não servem
+    procurar_vagas.buscar_vagas("analista", "", ["São Paulo/SP"])
+    assert pool.consultas == ["analista", "analista"]
+
+
+def test_revalidacao_mantem_as_localizacoes_da_busca(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        procurar_vagas,
+        "cache_buscas",
+        CacheDisco(str(tmp_path / "buscas.sqlite3"), tamanho_maximo_bytes=2**20),
+    )
+    query = procurar_vagas.build_query("analista", "", ["Recife/PE"])
+    chave = procurar_vagas._chave_consulta(query)
+    procurar_vagas.cache_buscas.gravar(chave, [], ttl_segundos=3600)
+    monkeypatch.setattr(procurar_vagas, "VAGAS_FRESCOR_HORAS", -1)
+    revalidadas = []
+    monkeypatch.setattr(
+        procurar_vagas,
+        "_buscar_e_gravar",
+        lambda termo, query, chave: revalidadas.append(query.options.locations),
+    )
+
+    procurar_vagas.buscar_vagas("analista", "", ["Recife/PE"])
+
+    for _ in range(100):
+        if revalidadas:
+            break
+        time.sleep(0.01)
+    assert revalidadas == [["Recife/PE"]]
@@ -0,0 +1,67 @@
+import io
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+)
+
+from ocr.texto_local import extrair_lines_locais
+
+
+def gerar_pdf(conteudo: str, mediabox=(0, 0, 612, 792)) -> bytes:
+    escritor = PdfWriter()
+    pagina = escritor.add_blank_page(width=612, height=792)
+    pagina[NameObject("/MediaBox")] = ArrayObject(FloatObject(v) for v in mediabox)
+    fonte = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    pagina[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/Font"): DictionaryObject(
+                {NameObject("/F1"): escritor._add_object(fonte)}
+            )
+        }
+    )
+    fluxo = DecodedStreamObject()
+    fluxo.set_data(conteudo.encode("latin-1"))
+    pagina[NameObject("/Contents")] = escritor._add_object(fluxo)
+    saida = io.BytesIO()
+    escritor.write(saida)
+    return saida.getvalue()
+
+
+def test_trechos_da_mesma_palavra_sao_colados():
+    conteudo = (
+        "BT /F1 12 Tf 72 700 Td (Enge) Tj ET "
+        "BT /F1 12 Tf 96 700 Td (nharia) Tj ET "
+        "BT /F1 12 Tf 136 700 Td (de Software) Tj ET"
+    )
+    [lines] = extrair_lines_locais(gerar_pdf(conteudo))
+    assert [line.text for line in lines] == ["Engenharia de Software"]
+
+
+def test_trechos_separados_por_espaco_nao_sao_colados():
+    conteudo = (
+        "BT /F1 12 Tf 72 700 Td (Python ) Tj ET "
+        "BT /F1 12 Tf 114 700 Td (SQL) Tj ET "
+        "BT /F1 12 Tf 72 680 Td (Java) Tj ET"
+    )
+    [lines] = extrair_lines_locais(gerar_pdf(conteudo))
+    assert [line.text for line in lines] == ["Python SQL", "Java"]
+
+
+def test_coordenadas_relativas_a_origem_da_mediabox():
+    conteudo = "BT /F1 12 Tf 172 800 Td (Contato) Tj ET"
+    [lines] = extrair_lines_locais(gerar_pdf(conteudo, (100, 100, 712, 892)))
+    esquerda, topo, *_, base = lines[0].bounding_box
+    assert esquerda == 72
+    assert base == 92
+    assert topo == 80
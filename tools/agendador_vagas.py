@@ -0,0 +1,165 @@
+"""
+Coleta agendada de vagas.
+
+Roda periodicamente as buscas de `procurar_vagas` para os termos de cada
+área de interesse do cadastro (config/taxonomia.py) e as localizações
+configuradas, deixando o armazém de vagas e o cache de respostas aquecidos
+para as buscas dos usuários.
+
+Uso:
+    python -m tools.agendador_vagas --uma-vez
+    python -m tools.agendador_vagas --intervalo-minutos 120 --concorrencia 3
+"""
+
+import argparse
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from config.properties import (
+    VAGAS_COLETA_CONCORRENCIA,
+    VAGAS_COLETA_INTERVALO_MINUTOS,
+    VAGAS_COLETA_JITTER_SEGUNDOS,
+    VAGAS_COLETA_LOCALIZACOES,
+)
+from config.taxonomia import AREAS_INTERESSE, TERMOS_BUSCA_POR_AREA
+from service.metricas import incrementar, registrar_latencia
+from tools.procurar_vagas import atualizar_busca
+
+LOCALIZACOES_PADRAO = [
+    localizacao.strip()
+    for localizacao in VAGAS_COLETA_LOCALIZACOES.split(";")
+    if localizacao.strip()
+]
+
+
+def listar_buscas(
+    areas: Optional[list[str]] = None, localizacoes: Optional[list[str]] = None
+) -> list[tuple[str, str]]:
+    """Pares (termo, localização) a coletar, sem repetições."""
+    buscas = []
+    for area in areas or AREAS_INTERESSE:
+        for termo in TERMOS_BUSCA_POR_AREA.get(area, [area]):
+            for localizacao in localizacoes or LOCALIZACOES_PADRAO:
+                if (termo, localizacao) not in buscas:
+                    buscas.append((termo, localizacao))
+    return buscas
+
+
+def _coletar(termo, localizacao, jitter_segundos, parar):
+    # Espalha o início das buscas para não chegarem juntas ao LinkedIn
+    if parar.wait(random.uniform(0, jitter_segundos)):
+        return None
+    inicio = time.perf_counter()
+    vagas = atualizar_busca(termo, locations=[localizacao])
+    status = "ok" if vagas else "vazia"
+    registrar_latencia("coleta_vagas", time.perf_counter() - inicio, status=status)
+    return status
+
+
+def executar_ciclo(
+    buscas: list[tuple[str, str]],
+    concorrencia: int = VAGAS_COLETA_CONCORRENCIA,
+    jitter_segundos: float = VAGAS_COLETA_JITTER_SEGUNDOS,
+    parar: Optional[threading.Event] = None,
+) -> dict:
+    """
+    Roda cada busca uma vez, com no máximo `concorrencia` ao mesmo tempo.
+
+    Returns:
+        Contagem de buscas por resultado: ok, vazia e erro
+    """
+    parar = parar or threading.Event()
+    resumo = {"ok": 0, "vazia": 0, "erro": 0}
+    with ThreadPoolExecutor(
+        max_workers=concorrencia, thread_name_prefix="coleta-vagas"
+    ) as executor:
+        futuros = {
+            executor.submit(_coletar, termo, localizacao, jitter_segundos, parar): (
+                termo,
+                localizacao,
+            )
+            for termo, localizacao in buscas
+        }
+        for futuro in as_completed(futuros):
+            termo, localizacao = futuros[futuro]
+            try:
+                status = futuro.result()
+            except Exception as e:
+                print(f"[agendador_vagas] Erro em '{termo}' ({localizacao}): {e}")
+                status = "erro"
+            if status is None:
+                continue
+            resumo[status] += 1
+            incrementar("coleta_vagas", status=status)
+            print(f"[agendador_vagas] '{termo}' ({localizacao}): {status}")
+    return resumo
+
+
+def executar_continuamente(
+    buscas: list[tuple[str, str]],
+    intervalo_segundos: float,
+    concorrencia: int = VAGAS_COLETA_CONCORRENCIA,
+    jitter_segundos: float = VAGAS_COLETA_JITTER_SEGUNDOS,
+    parar: Optional[threading.Event] = None,
+):
+    """Repete o ciclo a cada `intervalo_segundos` (± jitter) até `parar`."""
+    parar = parar or threading.Event()
+    while not parar.is_set():
+        resumo = executar_ciclo(buscas, concorrencia, jitter_segundos, parar)
+        print(f"[agendador_vagas] Ciclo concluído: {resumo}")
+        espera = max(
+            intervalo_segundos + random.uniform(-jitter_segundos, jitter_segundos), 0
+        )
+        parar.wait(espera)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coleta agendada de vagas")
+    parser.add_argument(
+        "--uma-vez", action="store_true", help="Roda um único ciclo e termina"
+    )
+    parser.add_argument(
+        "--intervalo-minutos", type=float, default=VAGAS_COLETA_INTERVALO_MINUTOS
+    )
+    parser.add_argument(
+        "--jitter-segundos", type=float, default=VAGAS_COLETA_JITTER_SEGUNDOS
+    )
+    parser.add_argument("--concorrencia", type=int, default=VAGAS_COLETA_CONCORRENCIA)
+    parser.add_argument(
+        "--area",
+        action="append",
+        dest="areas",
+        help="Área a coletar (pode repetir; padrão: todas)",
+    )
+    parser.add_argument(
+        "--localizacao",
+        action="append",
+        dest="localizacoes",
+        help=f"Localização (pode repetir; padrão: {'; '.join(LOCALIZACOES_PADRAO)})",
+    )
+    args = parser.parse_args()
+
+    buscas = listar_buscas(args.areas, args.localizacoes)
+    parar = threading.Event()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sinal, lambda *_: parar.set())
+
+    if args.uma_vez:
+        resumo = executar_ciclo(buscas, args.concorrencia, args.jitter_segundos, parar)
+        print(f"Concluído: {resumo}")
+    else:
+        executar_continuamente(
+            buscas,
+            args.intervalo_minutos * 60,
+            args.concorrencia,
+            args.jitter_segundos,
+            parar,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+import json
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from typing import Iterator, Optional
+
+from jobspy import scrape_jobs
+from pydantic import BaseModel
+from linkedin_jobs_scraper.filters import TimeFilters
+from linkedin_jobs_scraper.query import Query
+
+from config.properties import JOBSPY_PAIS, JOBSPY_SITES
+from service.metricas import incrementar, registrar_latencia
+
+# Todas as fontes devolvem vagas com estas chaves, as mesmas do EventData do
+# linkedin_jobs_scraper usadas pelo armazém e pela formatação, mais "fonte".
+CAMPOS_VAGA = [
+    "fonte",
+    "job_id",
+    "title",
+    "company",
+    "place",
+    "date",
+    "date_text",
+    "link",
+    "apply_link",
+    "description",
+    "insights",
+]
+
+
+class Vaga(BaseModel):
+    """Vaga normalizada, como é entregue à interface."""
+
+    fonte: str = ""
+    job_id: str = ""
+    title: str = ""
+    company: str = ""
+    place: str = ""
+    date: str = ""
+    date_text: str = ""
+    link: str = ""
+    apply_link: str = ""
+    description: str = ""
+    insights: list[str] = []
+    # Preenchido pelo agente ao ordenar as vagas
+    comentario: str = ""
+
+    @classmethod
+    def de_registro(cls, registro: dict) -> "Vaga":
+        return cls(
+            **{
+                campo: registro.get(campo)
+                for campo in CAMPOS_VAGA
+                if registro.get(campo) is not None
+            }
+        )
+
+    def markdown(self) -> str:
+        """Detalhes da vaga para exibição e para o relatório de preparação."""
+        linhas = [
+            f"**Empresa:** {self.company}",
+            f"**Local:** {self.place}",
+        ]
+        if self.date_text or self.date:
+            linhas.append(f"**Publicada:** {self.date_text or self.date}")
+        if self.link:
+            linhas.append(f"**Link:** [Ver vaga]({self.link})")
+        if self.apply_link:
+            linhas.append(f"**Candidatura direta:** [Candidatar-se]({self.apply_link})")
+        if self.insights:
+            linhas.append("**Destaques:** " + ", ".join(self.insights))
+        if self.comentario:
+            linhas.append(f"**Por que combina com você:** {self.comentario}")
+        return "  \n".join(linhas) + "\n\n" + self.description
+
+
+HORAS_POR_FILTRO_DE_TEMPO = {
+    TimeFilters.DAY: 24,
+    TimeFilters.WEEK: 7 * 24,
+    TimeFilters.MONTH: 30 * 24,
+}
+
+_SUFIXOS_EMPRESA = re.compile(
+    r"\b(ltda|sa|s a|me|eireli|inc|llc|ltd|corp|group|grupo|brasil|brazil)\b"
+)
+
+
+class FonteVagas(ABC):
+    """
+    Origem de vagas consultada por `iterar_vagas_agregadas`.
+
+    A busca é separada em `obter_brutos`, que acessa a rede e devolve os
+    registros como vêm da origem (serializáveis em JSON), e `normalizar`,
+    que é pura. Assim cada fonte pode ser exercitada offline com registros
+    gravados por `gravar_fixture` e reproduzidos por `FonteGravada`.
+    """
+
+    nome: str
+
+    def buscar(self, search_term: str, query: Query) -> list[dict]:
+        return self.normalizar(self.obter_brutos(search_term, query))
+
+    @abstractmethod
+    def obter_brutos(self, search_term: str, query: Query) -> list[dict]: ...
+
+    @abstractmethod
+    def normalizar(self, brutos: list[dict]) -> list[dict]: ...
+
+
+class FonteJobspy(FonteVagas):
+    """
+    Vagas do Indeed, Glassdoor e demais sites suportados pelo python-jobspy.
+
+    Args:
+        sites: nomes dos sites no jobspy (padrão: JOBSPY_SITES)
+        pais: país usado pelo Indeed e Glassdoor
+    """
+
+    nome = "jobspy"
+
+    def __init__(self, sites: Optional[list[str]] = None, pais: str = JOBSPY_PAIS):
+        self.sites = sites or [s.strip() for s in JOBSPY_SITES.split(",") if s.strip()]
+        self.pais = pais
+
+    def obter_brutos(self, search_term: str, query: Query) -> list[dict]:
+        filtros = query.options.filters
+        tabela = scrape_jobs(
+            site_name=self.sites,
+            search_term=query.query,
+            location=(query.options.locations or [None])[0],
+            results_wanted=query.options.limit,
+            hours_old=HORAS_POR_FILTRO_DE_TEMPO.get(
+                filtros.time if filtros is not None else None
+            ),
+            country_indeed=self.pais,
+        )
+        # Passa por JSON para converter datas e NaN do pandas
+        return json.loads(tabela.to_json(orient="records", date_format="iso"))
+
+    def normalizar(self, brutos: list[dict]) -> list[dict]:
+        vagas = []
+        for bruto in brutos:
+            data = (bruto.get("date_posted") or "")[:10]
+            insights = [
+                valor
+                for valor in (
+                    bruto.get("job_type"),
+                    "Remoto" if bruto.get("is_remote") else None,
+                    bruto.get("company_industry"),
+                )
+                if valor
+            ]
+            vagas.append(
+                {
+                    "fonte": f"jobspy:{bruto.get('site')}",
+                    "job_id": bruto.get("id") or "",
+                    "title": bruto.get("title") or "",
+                    "company": bruto.get("company") or "",
+                    "place": bruto.get("location") or "",
+                    "date": data,
+                    "date_text": data,
+                    "link": bruto.get("job_url") or "",
+                    "apply_link": bruto.get("job_url_direct") or "",
+                    "description": bruto.get("description") or "",
+                    "insights": insights,
+                }
+            )
+        return vagas
+
+
+class FonteGravada(FonteVagas):
+    """Reproduz os registros brutos gravados de outra fonte, sem acessar a rede."""
+
+    def __init__(self, fonte: FonteVagas, caminho: str):
+        self.fonte = fonte
+        self.nome = fonte.nome
+        self.caminho = caminho
+
+    def obter_brutos(self, search_term: str, query: Query) -> list[dict]:
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+    def normalizar(self, brutos: list[dict]) -> list[dict]:
+        return self.fonte.normalizar(brutos)
+
+
+def gravar_fixture(fonte: FonteVagas, search_term: str, query: Query, caminho: str):
+    """Grava os registros brutos de uma busca real para uso com FonteGravada."""
+    brutos = fonte.obter_brutos(search_term, query)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(brutos, arquivo, ensure_ascii=False, indent=2)
+    return brutos
+
+
+def _normalizar_texto(texto: Optional[str]) -> str:
+    texto = unicodedata.normalize("NFKD", (texto or "").lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", texto))
+
+
+def _parecidos(a: str, b: str, limiar: float) -> bool:
+    if a == b:
+        return True
+    # Um campo vazio de um lado só não diz que as vagas são iguais
+    if not a or not b:
+        return False
+    comparador = SequenceMatcher(None, a, b)
+    return comparador.quick_ratio() >= limiar and comparador.ratio() >= limiar
+
+
+class Deduplicador:
+    """
+    Descarta vagas repetidas entre fontes: mesmo link, ou empresa, título e
+    local parecidos (a localização é mais tolerante, já que cada site a
+    escreve de um jeito).
+    """
+
+    def __init__(
+        self,
+        limiar_empresa: float = 0.85,
+        limiar_titulo: float = 0.85,
+        limiar_local: float = 0.5,
+    ):
+        self.limiar_empresa = limiar_empresa
+        self.limiar_titulo = limiar_titulo
+        self.limiar_local = limiar_local
+        self.vagas = []
+        self._links = set()
+        self._assinaturas = []
+        self._lock = threading.Lock()
+
+    def adicionar(self, vaga: dict) -> bool:
+        """Guarda a vaga e retorna True se ela ainda não tinha sido vista."""
+        empresa = _SUFIXOS_EMPRESA.sub("", _normalizar_texto(vaga.get("company")))
+        assinatura = (
+            " ".join(empresa.split()),
+            _normalizar_texto(vaga.get("title")),
+            _normalizar_texto(vaga.get("place")),
+        )
+        link = vaga.get("link")
+        with self._lock:
+            if link and link in self._links:
+                return False
+            for outra in self._assinaturas:
+                if (
+                    _parecidos(assinatura[0], outra[0], self.limiar_empresa)
+                    and _parecidos(assinatura[1], outra[1], self.limiar_titulo)
+                    and _parecidos(assinatura[2], outra[2], self.limiar_local)
+                ):
+                    return False
+            if link:
+                self._links.add(link)
+            self._assinaturas.append(assinatura)
+            self.vagas.append(vaga)
+            return True
+
+
+def iterar_vagas_agregadas(
+    search_term: str,
+    query: Query,
+    fontes: list[FonteVagas],
+    deduplicador: Optional[Deduplicador] = None,
+) -> Iterator[tuple[str, list[dict]]]:
+    """
+    Consulta as fontes ao mesmo tempo e entrega os resultados à medida que
+    cada uma termina.
+
+    A ordem das fontes define a prioridade só dentro do que já chegou: uma
+    vaga repetida é mantida na versão da fonte que respondeu primeiro. Uma
+    fonte que falha é registrada e ignorada.
+
+    Yields:
+        (nome da fonte, vagas dela que ainda não tinham aparecido)
+    """
+    deduplicador = deduplicador or Deduplicador()
+    if not fontes:
+        return
+    with ThreadPoolExecutor(
+        max_workers=len(fontes), thread_name_prefix="fonte-vagas"
+    ) as executor:
+        futuros = {
+            executor.submit(_buscar_medindo, fonte, search_term, query): fonte
+            for fonte in fontes
+        }
+        for futuro in as_completed(futuros):
+            fonte = futuros[futuro]
+            try:
+                vagas = futuro.result()
+            except Exception as e:
+                print(f"[fontes_vagas] Erro na fonte {fonte.nome}: {e}")
+                continue
+            novas = [vaga for vaga in vagas if deduplicador.adicionar(vaga)]
+            incrementar("vagas_duplicadas", len(vagas) - len(novas), fonte=fonte.nome)
+            yield fonte.nome, novas
+
+
+def _buscar_medindo(fonte, search_term, query):
+    inicio = time.perf_counter()
+    status = "erro"
+    try:
+        vagas = fonte.buscar(search_term, query)
+        status = "ok"
+        return vagas
+    finally:
+        registrar_latencia(
+            "fonte_vagas", time.perf_counter() - inicio, fonte=fonte.nome, status=status
+        )
@@ -0,0 +1,281 @@
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from typing import Callable, Optional
+
+from linkedin_jobs_scraper import LinkedinScraper
+from linkedin_jobs_scraper import linkedin_scraper as _modulo_scraper
+from linkedin_jobs_scraper.events import EventData, Events
+from linkedin_jobs_scraper.query import Query
+from linkedin_jobs_scraper.utils.chrome_driver import (
+    build_driver,
+    get_default_driver_options,
+)
+
+from config.properties import (
+    SCRAPER_CONSULTAS_POR_DRIVER,
+    SCRAPER_PAGE_LOAD_TIMEOUT,
+    SCRAPER_POOL_TAMANHO,
+    SCRAPER_SLOW_MO,
+)
+from service.metricas import incrementar, registrar_latencia
+
+# O LinkedinScraper abre um Chrome novo a cada consulta e o fecha no fim. Para
+# manter os navegadores aquecidos, o build_driver que ele usa é trocado por um
+# que empresta o driver do trabalhador dono das opções recebidas; cada
+# trabalhador tem sua própria instância de ChromeOptions.
+_trabalhadores_por_opcoes = {}
+
+
+def _build_driver_do_pool(*args, options=None, **kwargs):
+    trabalhador = _trabalhadores_por_opcoes.get(id(options))
+    if trabalhador is None:
+        return build_driver(*args, options=options, **kwargs)
+    return _DriverEmprestado(trabalhador.driver)
+
+
+_modulo_scraper.build_driver = _build_driver_do_pool
+
+
+class _DriverEmprestado:
+    """Repassa tudo ao driver real, mas ignora os pedidos para fechá-lo."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __getattr__(self, nome):
+        return getattr(self._driver, nome)
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+class _Trabalhador:
+    def __init__(self, indice, fila, consultas_por_driver, slow_mo, page_load_timeout):
+        self.fila = fila
+        self.consultas_por_driver = consultas_por_driver
+        self.page_load_timeout = page_load_timeout
+        self.opcoes = get_default_driver_options(headless=True)
+        self.scraper = LinkedinScraper(
+            chrome_options=self.opcoes,
+            headless=True,
+            max_workers=1,
+            slow_mo=slow_mo,
+            page_load_timeout=page_load_timeout,
+        )
+        self.driver = None
+        self.consultas = 0
+        self.ocupado = False
+        _trabalhadores_por_opcoes[id(self.opcoes)] = self
+        self.thread = threading.Thread(
+            target=self._executar, name=f"scraper-{indice}", daemon=True
+        )
+
+    def saudavel(self) -> bool:
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _aquecer(self):
+        self.driver = build_driver(
+            options=self.opcoes, headless=True, timeout=self.page_load_timeout
+        )
+        self.consultas = 0
+
+    def _reciclar(self, motivo):
+        print(f"[pool_scrapers] Reciclando {self.thread.name}: {motivo}")
+        incrementar("scraper_pool_reciclagens", motivo=motivo)
+        self._descartar_driver()
+        self._aquecer()
+
+    def _descartar_driver(self):
+        try:
+            if self.driver is not None:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+    def _garantir_driver(self):
+        if self.driver is None:
+            self._aquecer()
+        elif self.consultas >= self.consultas_por_driver:
+            self._reciclar("limite_consultas")
+        elif not self.saudavel():
+            self._reciclar("falha_saude")
+
+    def _limpar_sessao(self):
+        # Nada da busca anterior (cookies, página aberta) passa para a próxima
+        try:
+            self.driver.delete_all_cookies()
+            self.driver.get("about:blank")
+        except Exception:
+            pass
+
+    def _executar(self):
+        try:
+            self._aquecer()
+        except Exception as e:
+            print(f"[pool_scrapers] Falha ao aquecer {self.thread.name}: {e}")
+        while True:
+            tarefa = self.fila.get()
+            if tarefa is None:
+                break
+            self.ocupado = True
+            try:
+                self._processar(*tarefa)
+            finally:
+                self.ocupado = False
+        self._descartar_driver()
+
+    def _processar(self, query, ao_receber, cancelamento, futuro, enviado_em):
+        if cancelamento is not None and cancelamento.is_set():
+            futuro.cancel()
+        if not futuro.set_running_or_notify_cancel():
+            return
+        registrar_latencia("scraper_espera_fila", time.perf_counter() - enviado_em)
+
+        resultados = []
+        erros = []
+
+        # O LinkedinScraper só aceita funções simples como callback
+        def on_data(data: EventData):
+            # Uma exceção no callback é a única forma de parar o scraper no meio
+            if cancelamento is not None and cancelamento.is_set():
+                raise CancelledError()
+            resultados.append(data)
+            if ao_receber:
+                ao_receber(data)
+
+        def on_error(erro):
+            erros.append(erro)
+            print(f"[LinkedIn Scraper Error] {erro}")
+
+        inicio = time.perf_counter()
+        try:
+            self._garantir_driver()
+            self.scraper.on(Events.DATA, on_data)
+            self.scraper.on(Events.ERROR, on_error)
+            try:
+                self.scraper.run([query])
+            finally:
+                self.scraper.remove_listener(Events.DATA, on_data)
+                self.scraper.remove_listener(Events.ERROR, on_error)
+                self.consultas += 1
+                self._limpar_sessao()
+        except BaseException as e:
+            status = "erro"
+            if cancelamento is not None and cancelamento.is_set():
+                e, status = CancelledError(), "cancelada"
+            registrar_latencia(
+                "scraper_busca", time.perf_counter() - inicio, status=status
+            )
+            futuro.set_exception(e)
+            return
+
+        # Um erro durante a consulta pode ter sido o Chrome caindo
+        if erros and not self.saudavel():
+            try:
+                self._reciclar("erro_na_busca")
+            except Exception as e:
+                print(f"[pool_scrapers] Falha ao reciclar {self.thread.name}: {e}")
+        registrar_latencia("scraper_busca", time.perf_counter() - inicio, status="ok")
+        futuro.set_result(resultados)
+
+
+class PoolScrapers:
+    """
+    Conjunto de LinkedinScrapers, cada um com um Chrome headless mantido
+    aberto entre as buscas.
+
+    As consultas entram em uma fila única e são atendidas pelo primeiro
+    trabalhador livre, então buscas de usuários diferentes rodam em paralelo.
+    Antes de cada busca o driver passa por uma verificação de saúde e é
+    recriado se não responder ou se já atendeu `consultas_por_driver` buscas.
+
+    Args:
+        tamanho: número de trabalhadores (e de navegadores abertos)
+        consultas_por_driver: buscas atendidas antes de recriar o driver
+        slow_mo: atraso do LinkedinScraper entre ações, em segundos
+        page_load_timeout: prazo de carregamento de página, em segundos
+    """
+
+    def __init__(
+        self,
+        tamanho: int = SCRAPER_POOL_TAMANHO,
+        consultas_por_driver: int = SCRAPER_CONSULTAS_POR_DRIVER,
+        slow_mo: float = SCRAPER_SLOW_MO,
+        page_load_timeout: int = SCRAPER_PAGE_LOAD_TIMEOUT,
+    ):
+        self._fila = queue.Queue()
+        self._trabalhadores = [
+            _Trabalhador(
+                indice, self._fila, consultas_por_driver, slow_mo, page_load_timeout
+            )
+            for indice in range(tamanho)
+        ]
+        for trabalhador in self._trabalhadores:
+            trabalhador.thread.start()
+
+    def enviar(
+        self,
+        query: Query,
+        ao_receber: Optional[Callable[[EventData], None]] = None,
+        cancelamento: Optional[threading.Event] = None,
+    ) -> Future:
+        """
+        Coloca a consulta na fila.
+
+        Args:
+            query: consulta do linkedin_jobs_scraper
+            ao_receber: chamado, na thread do trabalhador, com cada vaga
+                encontrada por esta consulta
+            cancelamento: quando sinalizado, a consulta é descartada se ainda
+                estiver na fila, ou interrompida na próxima vaga recebida
+
+        Returns:
+            Future com a lista de EventData da consulta (CancelledError se
+            foi cancelada)
+        """
+        futuro = Future()
+        self._fila.put((query, ao_receber, cancelamento, futuro, time.perf_counter()))
+        return futuro
+
+    def buscar(
+        self,
+        query: Query,
+        ao_receber: Optional[Callable[[EventData], None]] = None,
+        timeout: Optional[float] = None,
+        cancelamento: Optional[threading.Event] = None,
+    ) -> list[EventData]:
+        return self.enviar(query, ao_receber, cancelamento).result(timeout=timeout)
+
+    def livres(self) -> int:
+        """Trabalhadores parados, descontadas as consultas que já esperam na fila."""
+        parados = sum(not trabalhador.ocupado for trabalhador in self._trabalhadores)
+        return max(parados - self._fila.qsize(), 0)
+
+    def encerrar(self):
+        for _ in self._trabalhadores:
+            self._fila.put(None)
+        for trabalhador in self._trabalhadores:
+            trabalhador.thread.join()
+            _trabalhadores_por_opcoes.pop(id(trabalhador.opcoes), None)
+
+
+_pool = None
+_lock_pool = threading.Lock()
+
+
+def obter_pool() -> PoolScrapers:
+    """Retorna o pool compartilhado, criando-o (e abrindo os navegadores) no primeiro uso."""
+    global _pool
+    with _lock_pool:
+        if _pool is None:
+            _pool = PoolScrapers()
+        return _pool
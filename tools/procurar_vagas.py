@@ -10,47 +10,220 @@ from linkedin_jobs_scraper.filters import (
     ExperienceLevelFilters,
     OnSiteOrRemoteFilters,
 )
+import copy
+import json
+import os
+import re
+import threading
+import time
 import types
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-
-# Global job results list to store jobs across function calls
-jobs_data = []
+import unicodedata
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+from config.properties import (
+    CACHE_DIR,
+    VAGAS_ARMAZENADAS_MINIMO,
+    VAGAS_CACHE_TAMANHO_MAXIMO_MB,
+    VAGAS_FONTES,
+    VAGAS_FRESCOR_HORAS,
+    VAGAS_VARIANTES_PARALELAS,
+    VAGAS_VARIANTES_PRAZO_SEGUNDOS,
+)
+from service.armazem_vagas import ArmazemVagas
+from service.cache import CacheDisco
+from service.indice_palavras import IndiceBM25, texto_vaga_para_busca
+from service.texto import termos
+from service.indice_vetorial import indexar_vagas, vagas_semelhantes_ao_perfil
+from service.metricas import incrementar
+from tools.fontes_vagas import (
+    CAMPOS_VAGA,
+    FonteJobspy,
+    FonteVagas,
+    Vaga,
+    iterar_vagas_agregadas,
+)
+from tools.pool_scrapers import obter_pool
 
 # Set up logging
 logging.getLogger("li:scraper").setLevel(logging.INFO)
 
 
-# Event handlers must be defined as standalone functions
-def on_data(data: EventData):
-    """Handle job data events from the scraper"""
-    global jobs_data
-    job_info = {
-        "title": data.title,
-        "company": data.company,
-        "location": data.place,
-        "date": data.date_text,
-        "link": data.link,
-        "apply_link": getattr(data, "apply_link", None),
+# Every job seen by a search is kept in the local store, with its full
+# description, so repeat searches can be answered without scraping
+armazem_vagas = ArmazemVagas(os.path.join(CACHE_DIR, "vagas.sqlite3"))
+
+# Characters of each description shown to the agent when ranking
+RESUMO_CARACTERES = 300
+
+# Job records found by each search, keyed like the store's queries
+cache_buscas = CacheDisco(
+    os.path.join(CACHE_DIR, "vagas_por_busca.sqlite3"),
+    tamanho_maximo_bytes=int(VAGAS_CACHE_TAMANHO_MAXIMO_MB * 1024**2),
+)
+_revalidando = set()
+_lock_revalidando = threading.Lock()
+
+# BM25 index over every stored job, built from the store on first use and
+# kept current as the scrapers deliver postings
+_indice_palavras: Optional[IndiceBM25] = None
+_lock_indice_palavras = threading.Lock()
+
+# Broadest first; used to narrow a stale search down to what was posted since
+# it last ran
+FILTROS_DE_TEMPO = [
+    (TimeFilters.DAY, 24 * 3600),
+    (TimeFilters.WEEK, 7 * 24 * 3600),
+    (TimeFilters.MONTH, 30 * 24 * 3600),
+]
+
+
+def job_info(vaga: dict) -> dict:
+    """Convert a stored job record into the job dict used for formatting"""
+    description = vaga.get("description") or ""
+    return {
+        "title": vaga.get("title"),
+        "company": vaga.get("company"),
+        "location": vaga.get("place"),
+        "date": vaga.get("date_text"),
+        "link": vaga.get("link"),
+        "apply_link": vaga.get("apply_link"),
         "description": (
-            data.description[:500] + "..."
-            if len(data.description) > 500
-            else data.description
+            description[:500] + "..." if len(description) > 500 else description
         ),
-        "insights": getattr(data, "insights", None),
+        "insights": vaga.get("insights"),
     }
-    jobs_data.append(job_info)
-    print(f"[Found job] {data.title} at {data.company}")
 
 
-def on_error(error):
-    """Handle error events from the scraper"""
-    print(f"[LinkedIn Scraper Error] {error}")
+class ColetorVagas:
+    """
+    Collects the jobs of a single search request.
+
+    Each call to procurar_vagas creates its own collector and hands its
+    on_data to the scraper pool, which only invokes it for that request's
+    query, so concurrent searches never see each other's results.
+    """
 
+    def __init__(self, id_busca: Optional[str] = None):
+        self.id_busca = id_busca or uuid.uuid4().hex[:8]
+        self.vagas = []
+        self._chaves = set()
+        self._lock = threading.Lock()
+
+    def on_data(self, data: EventData):
+        vaga = data._asdict()
+        self.adicionar(vaga)
+        _indexar_palavras(vaga)
+        print(f"[{self.id_busca}] [Found job] {data.title} at {data.company}")
+
+    def adicionar(self, vaga: dict):
+        chave = ArmazemVagas.chave_vaga(vaga)
+        with self._lock:
+            if chave and chave in self._chaves:
+                return
+            self._chaves.add(chave)
+            self.vagas.append(vaga)
+
+    def limpar(self):
+        with self._lock:
+            self.vagas = []
+            self._chaves = set()
+
+    @property
+    def jobs(self) -> list[dict]:
+        return [job_info(vaga) for vaga in self.vagas]
+
+    def __len__(self):
+        return len(self.vagas)
+
+
+def _normalizar_termo(termo: str) -> str:
+    """Lowercase, accent-free, punctuation-free words, in sorted order"""
+    termo = unicodedata.normalize("NFKD", termo.lower())
+    termo = "".join(c for c in termo if not unicodedata.combining(c))
+    return " ".join(sorted(set(re.findall(r"\w+", termo))))
+
+
+def _chave_consulta(query: Query) -> str:
+    filtros = query.options.filters
+    partes = [
+        _normalizar_termo(query.query),
+        sorted(query.options.locations or []),
+        query.options.limit,
+    ]
+    if filtros is not None:
+        partes += [
+            getattr(filtros.relevance, "value", None),
+            getattr(filtros.time, "value", None),
+            sorted(f.value for f in filtros.type),
+            sorted(f.value for f in filtros.experience),
+            sorted(f.value for f in filtros.on_site_or_remote or []),
+        ]
+    return json.dumps(partes, ensure_ascii=False)
+
+
+def _filtro_de_tempo_delta(idade_segundos: float, filtro_original):
+    """Narrowest time filter that still covers everything since the last run"""
+    for filtro, janela in FILTROS_DE_TEMPO:
+        if idade_segundos < janela:
+            if filtro_original == TimeFilters.ANY or filtro_original is None:
+                return filtro
+            limite_original = dict(FILTROS_DE_TEMPO)[filtro_original]
+            return filtro if janela < limite_original else filtro_original
+    return filtro_original
+
+
+def buscar_com_armazem(
+    query: Query,
+    coletor: ColetorVagas,
+    cancelamento: Optional[threading.Event] = None,
+    forcar_coleta: bool = False,
+):
+    """
+    Run a query, answering it from the job store when it ran recently.
 
-def on_end():
-    """Handle end events from the scraper"""
-    global jobs_data
-    print(f"[LinkedIn Scraper] Finished search with {len(jobs_data)} results")
+    A stale query is scraped again only for jobs posted since its last run,
+    and the result is merged with the jobs it returned before. With
+    forcar_coleta, a fresh query is treated as stale, so it is always scraped.
+    """
+    chave = _chave_consulta(query)
+    consulta = armazem_vagas.obter_consulta(chave)
+    if (
+        not forcar_coleta
+        and consulta is not None
+        and consulta[1] < VAGAS_FRESCOR_HORAS * 3600
+    ):
+        incrementar("vagas_armazem", resultado="acerto")
+        print(f"[{coletor.id_busca}] Answered from job store: {query.query}")
+        for vaga in armazem_vagas.obter_vagas(consulta[0]):
+            coletor.adicionar(vaga)
+        return
+    incrementar("vagas_armazem", resultado="falha")
+
+    filtros = query.options.filters
+    tempo_original = filtros.time if filtros is not None else None
+    if consulta is not None and filtros is not None:
+        filtros.time = _filtro_de_tempo_delta(consulta[1], tempo_original)
+        print(f"[{coletor.id_busca}] Scraping only jobs newer than {filtros.time}")
+    try:
+        novas = obter_pool().buscar(
+            query, ao_receber=coletor.on_data, cancelamento=cancelamento
+        )
+    finally:
+        if filtros is not None:
+            filtros.time = tempo_original
+
+    chaves = armazem_vagas.gravar_vagas([data._asdict() for data in novas])
+    if consulta is not None:
+        vistas = set(chaves)
+        anteriores = [c for c in consulta[0] if c not in vistas]
+        anteriores = anteriores[: max(query.options.limit - len(chaves), 0)]
+        for vaga in armazem_vagas.obter_vagas(anteriores):
+            coletor.adicionar(vaga)
+        chaves += anteriores
+    # Empty results are not recorded, they are often a temporary block
+    if chaves:
+        armazem_vagas.gravar_consulta(chave, chaves)
 
 
 def format_to_markdown(jobs):
@@ -77,46 +250,31 @@ def format_to_markdown(jobs):
     return markdown
 
 
-# Initialize scraper once at module level with more human-like behavior
-scraper = LinkedinScraper(
-    chrome_options=ChromeOptions(),  # Create a proper ChromeOptions instance
-    chrome_executable_path=None,  # Let the package detect Chrome path
-    headless=True,  # Run in headless mode
-    max_workers=1,  # Number of worker threads
-    slow_mo=1.5,  # Slow down the scraper to avoid detection
-    page_load_timeout=40,  # Page load timeout
-)
-
-# Register event handlers
-scraper.on(Events.DATA, on_data)
-scraper.on(Events.ERROR, on_error)
-scraper.on(Events.END, on_end)
+NO_RESULTS_MARKDOWN = """
+# Não encontramos vagas específicas para o seu perfil
 
+Infelizmente, nossa busca não retornou resultados específicos. Isso pode acontecer devido a:
 
-def procurar_vagas(
-    search_term: str,
-    google_search_term: str,
-) -> str:
-    """
-    Search for jobs matching the search terms using LinkedIn Jobs Scraper
+1. Termos de busca muito específicos
+2. Poucas vagas disponíveis no momento para sua área
+3. Limitações temporárias do LinkedIn
 
-    Args:
-        search_term: Primary job search term
-        google_search_term: Additional search context (used for query refinement)
+## Sugestões para sua busca:
 
-    Returns:
-        Markdown-formatted job listings
-    """
-    global jobs_data
-    # Reset jobs data
-    jobs_data = []
+- Tente usar termos mais gerais para sua área
+- Verifique diretamente no [LinkedIn Jobs](https://www.linkedin.com/jobs/)
+- Experimente outras plataformas como [Glassdoor](https://www.glassdoor.com.br/) ou [Indeed](https://br.indeed.com/)
 
-    print(f"Searching for jobs: {search_term}")
+Tente realizar uma nova busca com termos diferentes.
+"""
 
-    # Tenta algumas variações da consulta se os resultados iniciais são poucos
-    attempts = 0
-    max_attempts = 3
 
+def build_query(
+    search_term: str,
+    google_search_term: str,
+    locations: Optional[list[str]] = None,
+) -> Query:
+    """Build the first query tried for a search"""
     # Combine search terms for better results
     combined_term = search_term
     if google_search_term and google_search_term != search_term:
@@ -133,10 +291,11 @@ def procurar_vagas(
             combined_term = f"{search_term} {keywords}"
 
     # Build query with more relaxed parameters
-    query = Query(
+    return Query(
         query=combined_term,
         options=QueryOptions(
-            locations=["Brasília/DF"],  # Broader location for more results
+            # Broader location for more results
+            locations=locations or ["Brasília/DF"],
             apply_link=True,  # Try to extract apply links
             skip_promoted_jobs=False,  # Include promoted jobs too
             limit=10,  # Increased number of jobs to fetch
@@ -163,81 +322,547 @@ def procurar_vagas(
         ),
     )
 
-    # Execute query with retry logic
-    while attempts < max_attempts:
+
+GENERAL_TERMS = [
+    "desenvolvedor",
+    "analista",
+    "engenheiro",
+    "designer",
+    "gerente",
+]
+
+
+def _variantes_da_busca(search_term: str, query: Query) -> list[Query]:
+    """
+    Queries tried by the retry ladder, from most to least specific.
+
+    A step that does not apply repeats the previous query, which in the
+    sequential mode works as a plain retry.
+    """
+    variantes = [copy.deepcopy(query)]
+    atual = copy.deepcopy(query)
+
+    # On first retry, try to broaden or simplify the search term
+    words = atual.query.split()
+    if len(words) > 2:
+        atual.query = " ".join(words[:2])
+        atual.options.locations = ["Brasil"]
+    variantes.append(copy.deepcopy(atual))
+
+    # On second retry, try using just the main job category
+    for term in GENERAL_TERMS:
+        if term.lower() in search_term.lower():
+            atual.query = term
+            atual.options.limit = 15  # Try to get more results
+            break
+    variantes.append(atual)
+    return variantes
+
+
+def _buscar_variantes_em_sequencia(
+    variantes: list[Query], forcar_coleta: bool = False
+) -> ColetorVagas:
+    coletor = ColetorVagas()
+    for attempt, variante in enumerate(variantes):
         try:
             # Clear previous results if this is a retry
-            if attempts > 0:
-                jobs_data = []
-                print(f"Retry attempt {attempts}: modifying search term...")
-
-                # On first retry, try to broaden or simplify the search term
-                if attempts == 1:
-                    # Simplify search by using fewer words
-                    words = combined_term.split()
-                    if len(words) > 2:
-                        combined_term = " ".join(words[:2])
-                        query.query = combined_term
-                        query.options.locations = ["Brasil"]
-                        print(f"Simplified search term to: {combined_term}")
-
-                # On second retry, try using just the main job category
-                elif attempts == 2:
-                    # Try a very general term from the original search
-                    general_terms = [
-                        "desenvolvedor",
-                        "analista",
-                        "engenheiro",
-                        "designer",
-                        "gerente",
-                    ]
-                    for term in general_terms:
-                        if term.lower() in search_term.lower():
-                            combined_term = term
-                            query.query = combined_term
-                            query.options.limit = 15  # Try to get more results
-                            print(f"Using general term: {combined_term}")
-                            break
-
-            print(f"Running search with term: {query.query}")
-            scraper.run([query])
+            if attempt > 0:
+                coletor.limpar()
+                print(f"Retry attempt {attempt}: modifying search term...")
+
+            print(f"[{coletor.id_busca}] Running search with term: {variante.query}")
+            # Served from the job store when fresh, otherwise dispatched to
+            # the first free worker of the shared browser pool
+            buscar_com_armazem(variante, coletor, forcar_coleta=forcar_coleta)
 
             # If we got results, no need for more attempts
-            if len(jobs_data) > 0:
-                print(f"Found {len(jobs_data)} jobs. Search successful.")
+            if len(coletor) > 0:
+                print(f"Found {len(coletor)} jobs. Search successful.")
                 break
 
             # If no results, try again with a different strategy
-            print(f"No results found with term: {query.query}")
-            attempts += 1
+            print(f"No results found with term: {variante.query}")
 
         except Exception as e:
             print(f"Error during search: {str(e)}")
-            attempts += 1
+    return coletor
+
+
+def _buscar_variantes_em_paralelo(
+    variantes: list[Query], forcar_coleta: bool = False
+) -> ColetorVagas:
+    """
+    Run the distinct variants at the same time and keep, in ladder order, the
+    most specific one that finds jobs.
+
+    Only as many variants as there are free pool workers run at once; the
+    rest start as earlier ones come back empty. Once a broader variant has
+    jobs, the more specific ones still running get VAGAS_VARIANTES_PRAZO_SEGUNDOS
+    to finish before the broader answer is used. Variants not chosen are
+    dropped from the pool queue or stopped.
+    """
+    unicas = list({_chave_consulta(v): v for v in variantes}.values())
+    largura = max(min(len(unicas), obter_pool().livres()), 1)
+    id_busca = uuid.uuid4().hex[:8]
+    cancelamento = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=largura, thread_name_prefix=f"busca-{id_busca}"
+    )
+    enviadas = []
+
+    def enviar_pendentes():
+        rodando = sum(not futuro.done() for futuro, _ in enviadas)
+        while rodando < largura and len(enviadas) < len(unicas):
+            variante = unicas[len(enviadas)]
+            coletor = ColetorVagas(f"{id_busca}-{len(enviadas)}")
+            print(f"[{coletor.id_busca}] Running search with term: {variante.query}")
+            futuro = executor.submit(
+                buscar_com_armazem, variante, coletor, cancelamento, forcar_coleta
+            )
+            enviadas.append((futuro, coletor))
+            rodando += 1
+
+    def encontrou(futuro, coletor):
+        return futuro.done() and futuro.exception() is None and len(coletor) > 0
+
+    try:
+        prazo = None
+        for indice in range(len(unicas)):
+            enviar_pendentes()
+            futuro, coletor = enviadas[indice]
+            while not futuro.done():
+                enviar_pendentes()
+                if prazo is None and any(
+                    encontrou(*enviada) for enviada in enviadas[indice + 1 :]
+                ):
+                    prazo = time.monotonic() + VAGAS_VARIANTES_PRAZO_SEGUNDOS
+                restante = None if prazo is None else prazo - time.monotonic()
+                if restante is not None and restante <= 0:
+                    break
+                wait(
+                    [f for f, _ in enviadas if not f.done()],
+                    timeout=restante,
+                    return_when=FIRST_COMPLETED,
+                )
+            if not futuro.done():
+                print(f"[{coletor.id_busca}] Too slow, using a broader search.")
+                break
+            erro = futuro.exception()
+            if erro is not None:
+                print(f"[{coletor.id_busca}] Error during search: {str(erro)}")
+            elif len(coletor) > 0:
+                print(f"[{coletor.id_busca}] Found {len(coletor)} jobs.")
+                return coletor
+        for futuro, coletor in enviadas:
+            if encontrou(futuro, coletor):
+                print(f"[{coletor.id_busca}] Found {len(coletor)} jobs.")
+                return coletor
+        return ColetorVagas(id_busca)
+    finally:
+        cancelamento.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FonteLinkedin(FonteVagas):
+    """
+    LinkedIn jobs through the scraper pool, the job store and the retry ladder
+
+    Args:
+        forcar_coleta: scrape even queries the job store still has fresh
+    """
+
+    nome = "linkedin"
+
+    def __init__(self, forcar_coleta: bool = False):
+        self.forcar_coleta = forcar_coleta
+
+    def obter_brutos(self, search_term: str, query: Query) -> list[dict]:
+        variantes = _variantes_da_busca(search_term, query)
+        if VAGAS_VARIANTES_PARALELAS:
+            coletor = _buscar_variantes_em_paralelo(variantes, self.forcar_coleta)
+        else:
+            coletor = _buscar_variantes_em_sequencia(variantes, self.forcar_coleta)
+        return coletor.vagas
+
+    def normalizar(self, brutos: list[dict]) -> list[dict]:
+        return [
+            {**{campo: bruto.get(campo) for campo in CAMPOS_VAGA}, "fonte": self.nome}
+            for bruto in brutos
+        ]
+
+
+FONTES_DISPONIVEIS = {
+    "linkedin": FonteLinkedin,
+    "jobspy": FonteJobspy,
+}
+
+
+def fontes_configuradas(forcar_coleta: bool = False) -> list[FonteVagas]:
+    """
+    Job sources listed in VAGAS_FONTES, in priority order. With forcar_coleta
+    none of them answers from the job store.
+    """
+    nomes = [nome.strip() for nome in VAGAS_FONTES.split(",") if nome.strip()]
+    return [
+        (
+            FonteLinkedin(forcar_coleta)
+            if nome == "linkedin"
+            else FONTES_DISPONIVEIS[nome]()
+        )
+        for nome in nomes
+    ]
+
+
+def _executar_busca(
+    search_term: str, query: Query, forcar_coleta: bool = False
+) -> list[dict]:
+    """
+    Query every configured source, returning the merged job records.
+
+    Sources are merged as each one finishes, but the result waits for all of
+    them: it answers the agent's tool call, which replies only once, and it
+    is what gets cached for the search.
+    """
+    print(f"Searching for jobs: {search_term}")
+    vagas = []
+    for fonte, novas in iterar_vagas_agregadas(
+        search_term, query, fontes_configuradas(forcar_coleta)
+    ):
+        print(f"{len(novas)} new jobs from {fonte}")
+        vagas.extend(novas)
+    return vagas
+
+
+def _ttl_da_busca(query: Query) -> float:
+    """Cached results live as long as the TimeFilters window they searched"""
+    filtros = query.options.filters
+    janelas = dict(FILTROS_DE_TEMPO)
+    tempo = filtros.time if filtros is not None else None
+    return janelas.get(tempo, janelas[TimeFilters.MONTH])
+
+
+def obter_indice_palavras() -> IndiceBM25:
+    """The shared keyword index, built from the job store on first use"""
+    global _indice_palavras
+    with _lock_indice_palavras:
+        if _indice_palavras is None:
+            indice = IndiceBM25()
+            indice.adicionar_varios(
+                (chave, texto_vaga_para_busca(vaga))
+                for chave, vaga in armazem_vagas.iterar_vagas()
+            )
+            print(f"Keyword index built with {len(indice)} stored jobs")
+            _indice_palavras = indice
+        return _indice_palavras
+
+
+def _indexar_palavras(vaga: dict):
+    """Add a job to the keyword index, if it has been built already"""
+    chave = ArmazemVagas.chave_vaga(vaga)
+    if _indice_palavras is not None and chave:
+        _indice_palavras.adicionar(chave, texto_vaga_para_busca(vaga))
+
+
+def _indexar(vagas: list[dict]):
+    """Keep every job found in the store and in the semantic and keyword indexes"""
+    try:
+        armazem_vagas.gravar_vagas(vagas)
+        for vaga in vagas:
+            _indexar_palavras(vaga)
+        indexar_vagas(vagas, ArmazemVagas.chave_vaga)
+    except Exception as e:
+        print(f"Error indexing jobs: {str(e)}")
+
+
+def _buscar_e_gravar(
+    search_term: str, query: Query, chave: str, forcar_coleta: bool = False
+) -> list[dict]:
+    ttl = _ttl_da_busca(query)
+    vagas = _executar_busca(search_term, query, forcar_coleta)
+    if vagas:
+        cache_buscas.gravar(chave, vagas, ttl_segundos=ttl)
+        _indexar(vagas)
+    return vagas
+
+
+def _revalidar_em_segundo_plano(
+    search_term: str,
+    google_search_term: str,
+    chave: str,
+    locations: Optional[list[str]] = None,
+):
+    with _lock_revalidando:
+        if chave in _revalidando:
+            return
+        _revalidando.add(chave)
+
+    def revalidar():
+        try:
+            _buscar_e_gravar(
+                search_term,
+                build_query(search_term, google_search_term, locations),
+                chave,
+            )
+        except Exception as e:
+            print(f"Error refreshing cached search: {str(e)}")
+        finally:
+            with _lock_revalidando:
+                _revalidando.discard(chave)
+
+    threading.Thread(target=revalidar, name="revalidar-busca", daemon=True).start()
+
+
+def atualizar_busca(
+    search_term: str,
+    google_search_term: str = "",
+    locations: Optional[list[str]] = None,
+) -> list[Vaga]:
+    """
+    Run a search ignoring the cached answer and the job store and store the
+    fresh one, so a later search with the same parameters is answered from
+    cache. A query already in the store is scraped only for jobs posted since
+    its last run. Used by the job-harvesting scheduler.
+    """
+    query = build_query(search_term, google_search_term, locations)
+    vagas = _buscar_e_gravar(
+        search_term, query, _chave_consulta(query), forcar_coleta=True
+    )
+    return [Vaga.de_registro(vaga) for vaga in vagas]
+
+
+def _no_local(vaga: dict, locations: list[str]) -> bool:
+    """Whether the job's place names the city of one of the locations"""
+    lugar = set(_normalizar_termo(vaga.get("place") or "").split())
+    return any(
+        set(_normalizar_termo(re.split(r"[/,]", local)[0]).split()) <= lugar
+        for local in locations
+    )
+
+
+def _vagas_armazenadas_da_busca(
+    search_term: str, google_search_term: str, query: Query
+) -> list[dict]:
+    """
+    Stored jobs, such as the ones the harvesting scheduler collected, that
+    have every word of the primary term and are in one of the query's
+    locations, ranked by BM25 against both terms
+    """
+    obrigatorios = set(termos(search_term))
+    limite = query.options.limit
+    encontradas = obter_indice_palavras().buscar(
+        f"{search_term} {google_search_term}", limite * 5
+    )
+    vagas = []
+    for vaga in armazem_vagas.obter_vagas([chave for chave, _ in encontradas]):
+        if obrigatorios <= set(termos(texto_vaga_para_busca(vaga))) and _no_local(
+            vaga, query.options.locations or []
+        ):
+            vagas.append(vaga)
+    return vagas[:limite]
+
+
+def buscar_vagas(
+    search_term: str,
+    google_search_term: str,
+    locations: Optional[list[str]] = None,
+) -> list[Vaga]:
+    """
+    Search every configured source and return typed job records.
+
+    Searches are answered from the cached answer, then from the job store
+    when it already has enough matching jobs, and only then by scraping.
+    """
+    query = build_query(search_term, google_search_term, locations)
+    chave = _chave_consulta(query)
+
+    # Stale-while-revalidate: an old but unexpired answer is returned at once
+    # and refreshed in the background
+    entrada = cache_buscas.obter_com_idade(chave)
+    if entrada is not None:
+        vagas, idade = entrada
+        if idade > VAGAS_FRESCOR_HORAS * 3600:
+            incrementar("vagas_cache_buscas", resultado="obsoleto")
+            _revalidar_em_segundo_plano(
+                search_term, google_search_term, chave, locations
+            )
+        else:
+            incrementar("vagas_cache_buscas", resultado="acerto")
+        print(f"Search answered from cache: {query.query}")
+        return [Vaga.de_registro(vaga) for vaga in vagas]
+    incrementar("vagas_cache_buscas", resultado="falha")
+
+    # The scheduler harvests under its own terms and locations, so its jobs
+    # are found by content rather than by this search's key
+    vagas = _vagas_armazenadas_da_busca(search_term, google_search_term, query)
+    if len(vagas) >= VAGAS_ARMAZENADAS_MINIMO:
+        incrementar("vagas_armazenadas_busca", resultado="acerto")
+        print(f"Search answered from stored jobs: {query.query}")
+        # Cached as if just scraped; it is refreshed once it goes stale
+        cache_buscas.gravar(chave, vagas, ttl_segundos=_ttl_da_busca(query))
+    else:
+        incrementar("vagas_armazenadas_busca", resultado="falha")
+        vagas = _buscar_e_gravar(search_term, query, chave)
+        if not vagas:
+            # Sources often come back empty when rate limited; stored jobs
+            # matching the terms are better than nothing
+            print(f"No fresh results, searching stored jobs: {query.query}")
+            return buscar_vagas_armazenadas(
+                f"{search_term} {google_search_term}", query.options.limit
+            )
+    return [Vaga.de_registro(vaga) for vaga in vagas]
+
+
+def buscar_vagas_armazenadas(consulta: str, k: int = 10) -> list[Vaga]:
+    """Stored jobs ranked by BM25 against the query, without scraping"""
+    encontradas = obter_indice_palavras().buscar(consulta, k)
+    return [
+        Vaga.de_registro(registro)
+        for registro in armazem_vagas.obter_vagas([chave for chave, _ in encontradas])
+    ]
+
+
+def vagas_compativeis(perfil: dict, k: int = 10) -> list[Vaga]:
+    """
+    Jobs already collected that are closest to the candidate profile, found in
+    the semantic index in milliseconds, without scraping or calling the agent.
+    """
+    semelhantes = vagas_semelhantes_ao_perfil(perfil, k)
+    registros = {
+        ArmazemVagas.chave_vaga(registro): registro
+        for registro in armazem_vagas.obter_vagas(
+            [id_vaga for id_vaga, _ in semelhantes]
+        )
+    }
+    return [
+        Vaga.de_registro(registros[id_vaga]).model_copy(
+            update={"comentario": f"Similaridade com o seu perfil: {nota:.0%}"}
+        )
+        for id_vaga, nota in semelhantes
+        if id_vaga in registros
+    ]
+
+
+def procurar_vagas(
+    search_term: str,
+    google_search_term: str,
+) -> str:
+    """
+    Search for jobs matching the search terms using LinkedIn Jobs Scraper
+
+    Args:
+        search_term: Primary job search term
+        google_search_term: Additional search context (used for query refinement)
+
+    Returns:
+        Markdown-formatted job listings
+    """
+    vagas = buscar_vagas(search_term, google_search_term)
 
     # If still no results, provide a helpful message
-    if len(jobs_data) == 0:
-        return """
-# Não encontramos vagas específicas para o seu perfil
+    if not vagas:
+        return NO_RESULTS_MARKDOWN
 
-Infelizmente, nossa busca não retornou resultados específicos. Isso pode acontecer devido a:
+    # Format results to markdown
+    return format_to_markdown([job_info(vaga.model_dump()) for vaga in vagas])
 
-1. Termos de busca muito específicos
-2. Poucas vagas disponíveis no momento para sua área
-3. Limitações temporárias do LinkedIn
 
-## Sugestões para sua busca:
+def criar_tool_procurar_vagas() -> tuple[FunctionTool, dict[str, Vaga]]:
+    """
+    Create a job-search tool for a single agent run.
 
-- Tente usar termos mais gerais para sua área
-- Verifique diretamente no [LinkedIn Jobs](https://www.linkedin.com/jobs/)
-- Experimente outras plataformas como [Glassdoor](https://www.glassdoor.com.br/) ou [Indeed](https://br.indeed.com/)
+    The tool hands the agent a compact listing with short ids, while the full
+    typed records are kept in the returned dict, keyed by those ids. The agent
+    only has to answer with the ids it recommends (see interpretar_ranking),
+    so the postings are never rewritten by the LLM.
+    """
+    vagas_encontradas: dict[str, Vaga] = {}
+    ids_por_link: dict[str, str] = {}
+
+    def procurar_vagas_da_busca(search_term: str, google_search_term: str) -> str:
+        """
+        Search for jobs matching the search terms on LinkedIn and other job boards
+
+        Args:
+            search_term: Primary job search term
+            google_search_term: Additional search context (used for query refinement)
+
+        Returns:
+            One JSON object per line with the job id, title, company, location
+            and the start of the description
+        """
+        linhas = []
+        for vaga in buscar_vagas(search_term, google_search_term):
+            chave = vaga.link or f"{vaga.company}|{vaga.title}|{vaga.place}"
+            id_vaga = ids_por_link.get(chave)
+            if id_vaga is None:
+                id_vaga = f"v{len(vagas_encontradas) + 1}"
+                ids_por_link[chave] = id_vaga
+                vagas_encontradas[id_vaga] = vaga
+            linhas.append(
+                json.dumps(
+                    {
+                        "id": id_vaga,
+                        "titulo": vaga.title,
+                        "empresa": vaga.company,
+                        "local": vaga.place,
+                        "resumo": vaga.description[:RESUMO_CARACTERES],
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return "\n".join(linhas) or "Nenhuma vaga encontrada para estes termos."
+
+    tool = FunctionTool.from_defaults(
+        fn=procurar_vagas_da_busca,
+        name="ProcurarVagas",
+        description=(
+            "Buscar vagas de emprego alinhadas com perfil da pessoa no LinkedIn e "
+            "em outros sites. Retorna uma vaga por linha, com id, título, empresa, "
+            "local e o início da descrição."
+        ),
+    )
+    return tool, vagas_encontradas
 
-Tente realizar uma nova busca com termos diferentes.
+
+INSTRUCOES_RANKING = """
+Responda somente com um array JSON com as vagas mais adequadas ao perfil, da
+mais para a menos adequada, no formato:
+[{"id": "<id retornado pela ferramenta>", "comentario": "<uma frase sobre por que a vaga combina com o perfil>"}]
+Não repita os dados das vagas.
 """
 
-    # Format results to markdown
-    results_markdown = format_to_markdown(jobs_data)
-    return results_markdown
+
+def interpretar_ranking(
+    resposta: str, vagas_encontradas: dict[str, Vaga]
+) -> list[Vaga]:
+    """
+    Turn the agent's JSON ranking into the recommended job records, with the
+    agent's comment. If the answer cannot be read, every job found is
+    returned in the order it was found.
+    """
+    inicio, fim = resposta.find("["), resposta.rfind("]")
+    try:
+        ranking = json.loads(resposta[inicio : fim + 1]) if inicio >= 0 else []
+    except json.JSONDecodeError:
+        ranking = []
+
+    vagas = []
+    vistos = set()
+    for item in ranking:
+        if not isinstance(item, dict):
+            continue
+        id_vaga = str(item.get("id", "")).strip()
+        if id_vaga in vagas_encontradas and id_vaga not in vistos:
+            vistos.add(id_vaga)
+            vagas.append(
+                vagas_encontradas[id_vaga].model_copy(
+                    update={"comentario": str(item.get("comentario") or "")}
+                )
+            )
+    if not vagas:
+        print(f"Could not read a ranking from the agent answer: {resposta[:200]}")
+        return list(vagas_encontradas.values())
+    return vagas
 
 
 # Create function tool for the agent